@@ -0,0 +1,25 @@
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qsl, urlsplit
+from utils import core
+
+class handler(BaseHTTPRequestHandler):
+    def do_OPTIONS(self):
+        # Handle CORS preflight requests
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'If-None-Match')
+        self.end_headers()
+
+    def do_GET(self):
+        # vercel.json rewrites /api/text/<ref> to /api/text.py?ref=<ref>
+        args = dict(parse_qsl(urlsplit(self.path).query))
+        status, headers, body = core.get_text_by_ref(
+            args.pop('ref', ''), args, self.headers.get('If-None-Match'), self.headers.get('Accept-Encoding')
+        )
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
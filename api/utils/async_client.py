@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import os
+
+import httpx
+
+from .sefaria_client import (
+    BACKOFF_FACTOR, BACKOFF_MAX, CONNECT_TIMEOUT, MAX_RETRIES, READ_TIMEOUT, RETRY_STATUSES, SEFARIA_BASE_URL,
+    backoff_delay
+)
+
+logger = logging.getLogger(__name__)
+
+# Connections kept open to Sefaria by one event loop (override with an environment variable)
+ASYNC_MAX_CONNECTIONS = int(os.environ.get('SEFARIA_ASYNC_MAX_CONNECTIONS', 256))
+
+# Failures worth retrying, besides RETRY_STATUSES
+TRANSPORT_ERRORS = (httpx.TransportError,)
+
+class AsyncSefariaClient:
+    """Async counterpart of SefariaClient, for the ASGI entry point.
+
+    Wraps a pooled httpx.AsyncClient. Timeouts and the retry policy (429/5xx
+    and connection failures, exponential backoff with full jitter) are the
+    same as SefariaClient's. The connections belong to the event loop that
+    first uses the client.
+    """
+
+    def __init__(self, base_url=SEFARIA_BASE_URL, connect_timeout=CONNECT_TIMEOUT,
+                 read_timeout=READ_TIMEOUT, max_retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR,
+                 backoff_max=BACKOFF_MAX, max_connections=ASYNC_MAX_CONNECTIONS):
+        self.base_url = base_url
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.max_connections = max_connections
+        self._client = None
+
+    def _get_client(self):
+        """Create the httpx client on first use, inside the running loop."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections)
+            )
+        return self._client
+
+    async def get(self, path, params=None, headers=None):
+        """GET base_url + path, retrying transient failures.
+
+        Returns the final response, which may still carry an error status.
+        Raises one of TRANSPORT_ERRORS if the request never succeeded.
+        """
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self._get_client().get(url, params=params, headers=headers)
+            except TRANSPORT_ERRORS as e:
+                if attempt == self.max_retries:
+                    logger.error(
+                        "Sefaria request failed",
+                        extra={'url': url, 'attempts': attempt + 1, 'error': repr(e)}
+                    )
+                    raise
+                delay = backoff_delay(attempt, self.backoff_factor, self.backoff_max)
+                logger.warning(
+                    "Retrying Sefaria request",
+                    extra={'url': url, 'attempt': attempt + 1, 'error': repr(e), 'delay': delay}
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+
+            delay = backoff_delay(attempt, self.backoff_factor, self.backoff_max, response)
+            logger.warning(
+                "Retrying Sefaria request",
+                extra={'url': url, 'attempt': attempt + 1, 'status': response.status_code, 'delay': delay}
+            )
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        """Close every connection; the client reconnects if it is used again."""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+# Shared client used by the ASGI entry point
+async_sefaria_client = AsyncSefariaClient()
@@ -0,0 +1,148 @@
+"""Format many pages at once across a pool of worker processes.
+
+Usage:
+    python -m utils.bulk Berakhot Shabbat -o berakhot-shabbat.jsonl
+    python -m utils.bulk --all --workers 8 --terminology traditional -o shas.jsonl
+    python -m utils.bulk --input pages.jsonl --language en
+
+Reads raw Sefaria page payloads from the offline mirror (see utils/mirror.py)
+or from a JSON-lines file, and writes one JSON line per page with its
+formatted sections, in input order. Throughput is reported on stderr.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .corpus import CorpusStore, MIRROR_PATH
+from .pipeline import process_sefaria_data
+from .profiles import resolve_profile
+from .tractates import BAVLI_TRACTATES, page_refs, resolve_tractate
+
+# Pages sent to a worker at a time
+CHUNK_SIZE = int(os.environ.get('BULK_CHUNK_SIZE', 16))
+
+def _format_chunk(chunk, options):
+    """Format a list of payloads in a worker process."""
+    options = dict(options)
+    _, engine = resolve_profile(options.pop('terminology'))
+    return [process_sefaria_data(data, terminology=engine, **options) for data in chunk]
+
+def format_pages(pages, remove_nikud_marks=True, standardize_terms=True, split_sentences=True,
+                 language='all', terminology=None, workers=None, chunk_size=CHUNK_SIZE):
+    """Format an iterable of raw Sefaria payloads, yielding each page's sections in input order.
+
+    Payloads are sent to a pool of `workers` processes (default: one per
+    core) in chunks of `chunk_size`. Only a few chunks per worker are in
+    flight at a time, so `pages` can be a lazy iterable over a whole corpus.
+    `terminology` is a profile name or inline profile (see utils/profiles.py).
+    """
+    options = {
+        'remove_nikud_marks': remove_nikud_marks,
+        'standardize_terms': standardize_terms,
+        'split_sentences': split_sentences,
+        'language': language,
+        'terminology': terminology,
+    }
+    workers = workers or os.cpu_count() or 1
+    pages = iter(pages)
+    chunks = iter(lambda: list(itertools.islice(pages, chunk_size)), [])
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from _format_chunk(chunk, options)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_format_chunk, chunk, options))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def iter_mirrored_pages(tractates, store, language="all"):
+    """Yield (ref, payload) for every mirrored page of the given tractates."""
+    for tractate in tractates:
+        for ref in page_refs(tractate):
+            data = store.load(ref, language)
+            if data:
+                yield ref, data
+
+def iter_payload_file(path):
+    """Yield (ref, payload) from a file of JSON lines, each a Sefaria response."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                data = json.loads(line)
+                yield data.get('ref'), data
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Format many Talmud pages in parallel.")
+    parser.add_argument('tractates', nargs='*', help="mirrored tractates to format, e.g. Berakhot 'Bava Metzia'")
+    parser.add_argument('--all', action='store_true', help="format every mirrored tractate of the Bavli")
+    parser.add_argument('--input', help="JSON-lines file of Sefaria responses to format instead of the mirror")
+    parser.add_argument('--root', default=MIRROR_PATH, help="corpus directory (default: %(default)s)")
+    parser.add_argument('-o', '--output', help="output file (default: stdout)")
+    parser.add_argument('--language', default='all', choices=['all', 'en', 'he'])
+    parser.add_argument('--terminology', help="terminology profile name")
+    parser.add_argument('--keep-nikud', action='store_true', help="do not remove nikud")
+    parser.add_argument('--no-terms', action='store_true', help="do not standardize terminology")
+    parser.add_argument('--no-split', action='store_true', help="do not split sections into sentences")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="pages per task (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    try:
+        resolve_profile(args.terminology)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.input:
+        source = iter_payload_file(args.input)
+    else:
+        if args.all:
+            tractates = [name for name, _, _, _ in BAVLI_TRACTATES]
+        elif args.tractates:
+            tractates = []
+            for name in args.tractates:
+                tractate = resolve_tractate(name)
+                if not tractate:
+                    parser.error(f"unknown tractate: {name}")
+                tractates.append(tractate)
+        else:
+            parser.error("name at least one tractate, or pass --all or --input")
+        source = iter_mirrored_pages(tractates, CorpusStore(args.root), args.language)
+
+    # The refs stay in this process; only the payloads go to the workers
+    refs = deque()
+    def payloads():
+        for ref, data in source:
+            refs.append(ref)
+            yield data
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    start = time.monotonic()
+    count = 0
+    try:
+        for sections in format_pages(
+            payloads(), not args.keep_nikud, not args.no_terms, not args.no_split,
+            args.language, args.terminology, args.workers, args.chunk_size
+        ):
+            output.write(json.dumps({'ref': refs.popleft(), 'sections': sections}, ensure_ascii=False) + '\n')
+            count += 1
+    finally:
+        if args.output:
+            output.close()
+
+    elapsed = time.monotonic() - start
+    print(f"Formatted {count} pages in {elapsed:.1f}s ({count / elapsed if elapsed else 0:.1f} pages/s)",
+          file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""Request handling shared by every entry point.
+
+app.py (Flask), handler.py (Lambda), api/get_text.py and api/text.py
+(Vercel) and asgi.py only translate their own request and response objects; reading the
+/api/get_text parameters, building the formatter, fetching the pages and
+shaping and encoding the result happens here.
+
+Importing this module is cheap. The fetch, formatting and encoding modules,
+and with them requests, orjson and the compiled terminology, number and
+Hebrew tables, are imported by the first request that needs them, so a cold
+Lambda or serverless function starts without paying for them up front. Set
+CORE_PRELOAD=1 to import everything at load instead, where the init phase is
+not on a request's path (provisioned concurrency, a long-running server).
+"""
+import json
+import os
+from collections import namedtuple
+
+CORE_PRELOAD = os.environ.get('CORE_PRELOAD', '0') == '1'
+
+# The parameters of a /api/get_text request, with their defaults applied.
+# adjacent_pages is 0 unless include_adjacent is set.
+TextQuery = namedtuple('TextQuery', [
+    'reference', 'language', 'remove_nikud_marks', 'standardize_terms', 'split_sentences',
+    'terminology', 'adjacent_pages', 'stream', 'response_format'
+])
+
+# A response ready to send: `body` is encoded bytes, or for a streamed
+# response `body` is None and `lines` iterates over the chunks to send, one
+# NDJSON line each, gzipped if the headers say so (an async iterator for
+# get_text_async).
+TextReply = namedtuple('TextReply', ['headers', 'body', 'lines'])
+
+def read_body(raw):
+    """Decode a /api/get_text request body; returns None unless it is a JSON object."""
+    try:
+        data = json.loads(raw or '{}')
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+def invalid_body_reply(accept_encoding=None):
+    """The reply to a request body that is not a JSON object, sent with status 400."""
+    return json_reply({'success': False, 'message': "Invalid JSON body", 'content': []}, accept_encoding)
+
+def parse_text_query(data):
+    """Read the /api/get_text parameters from a decoded request body."""
+    return TextQuery(
+        reference=data.get('reference', ''),
+        language=data.get('language', 'all'),
+        remove_nikud_marks=data.get('remove_nikud', True),
+        standardize_terms=data.get('standardize_terms', True),
+        split_sentences=data.get('split_sentences', True),
+        terminology=data.get('terminology'),
+        adjacent_pages=data.get('adjacent_pages', 0) if data.get('include_adjacent', False) else 0,
+        stream=data.get('stream', False),
+        response_format=data.get('format'),
+    )
+
+def text_formatter(query):
+    """Return (process, options) for a query: its formatting function and page cache key."""
+    from .pipeline import process_sefaria_data
+    from .profiles import resolve_profile
+
+    profile_key, profile_engine = resolve_profile(query.terminology)
+    process = lambda data: process_sefaria_data(
+        data, query.remove_nikud_marks, query.standardize_terms, query.split_sentences,
+        query.language, profile_engine
+    )
+    options = (query.remove_nikud_marks, query.standardize_terms, query.split_sentences, profile_key)
+    return process, options
+
+def text_result(query, content):
+    """Return the /api/get_text result for the pages found (None if there were none)."""
+    from .encoding import format_result
+
+    if content is None:
+        return {'success': False, 'message': f"No data found for reference: {query.reference}", 'content': []}
+    return format_result({'success': True, 'message': '', 'content': content}, query.response_format)
+
+def error_result(error):
+    """Return the /api/get_text result for a request that failed."""
+    return {'success': False, 'message': f"Error: {str(error)}", 'content': []}
+
+def json_reply(result, accept_encoding=None):
+    """Encode a result, compressed if the client accepts gzip or brotli."""
+    from .encoding import encode_response
+
+    body, headers = encode_response(result, accept_encoding)
+    return TextReply(headers, body, None)
+
+def stream_reply(events, response_format=None, accept_encoding=None):
+    """Return a streamed reply sending events as NDJSON lines, gzipped if the client accepts it."""
+    from .content import NDJSON_MIMETYPE, ndjson_lines
+    from .encoding import FORMAT_COMPACT, compact_events, encode_lines, stream_headers
+
+    if response_format == FORMAT_COMPACT:
+        events = compact_events(events)
+    headers = stream_headers(accept_encoding, NDJSON_MIMETYPE)
+    return TextReply(headers, None, encode_lines(ndjson_lines(events), headers))
+
+def get_text(data, accept_encoding=None):
+    """Answer a /api/get_text request body with a TextReply.
+
+    With "stream": true the pages are sent as NDJSON events as soon as each
+    is ready, the current page first; otherwise the whole result is sent at
+    once. Errors are reported in the result (or as an 'error' event), never
+    raised.
+    """
+    query = parse_text_query(data)
+    try:
+        process, options = text_formatter(query)
+
+        if query.stream:
+            from .content import iter_page_events
+
+            events = iter_page_events(query.reference, query.language, process, options, query.adjacent_pages)
+            return stream_reply(events, query.response_format, accept_encoding)
+
+        # Fetch and process the page (or page range) and any adjacent pages concurrently
+        from .content import collect_pages
+
+        content = collect_pages(query.reference, query.language, process, options, query.adjacent_pages)
+        return json_reply(text_result(query, content), accept_encoding)
+
+    except Exception as e:
+        if query.stream:
+            return stream_reply([{'event': 'error', 'message': error_result(e)['message']}], None, accept_encoding)
+        return json_reply(error_result(e), accept_encoding)
+
+async def get_text_async(data, accept_encoding=None):
+    """get_text for the ASGI entry point: fetches with the async client, and `lines` is an async iterator."""
+    query = parse_text_query(data)
+    try:
+        process, options = text_formatter(query)
+
+        if query.stream:
+            from .async_api import iter_page_events_async
+            from .content import NDJSON_MIMETYPE
+            from .encoding import encode_lines_async, stream_headers
+
+            events = iter_page_events_async(query.reference, query.language, process, options, query.adjacent_pages)
+            headers = stream_headers(accept_encoding, NDJSON_MIMETYPE)
+            lines = encode_lines_async(_ndjson_lines_async(events, query.response_format), headers)
+            return TextReply(headers, None, lines)
+
+        from .async_api import collect_pages_async
+
+        content = await collect_pages_async(query.reference, query.language, process, options, query.adjacent_pages)
+        return json_reply(text_result(query, content), accept_encoding)
+
+    except Exception as e:
+        if query.stream:
+            reply = stream_reply([{'event': 'error', 'message': error_result(e)['message']}], None, accept_encoding)
+            return reply._replace(lines=_async_iter(reply.lines))
+        return json_reply(error_result(e), accept_encoding)
+
+async def _async_iter(items):
+    for item in items:
+        yield item
+
+async def _ndjson_lines_async(events, response_format):
+    from .content import ndjson_lines
+    from .encoding import FORMAT_COMPACT, compact_event
+
+    async for event in events:
+        if response_format == FORMAT_COMPACT:
+            event = compact_event(event)
+        for line in ndjson_lines([event]):
+            yield line
+
+def get_text_by_ref(ref, args, if_none_match=None, accept_encoding=None):
+    """Build the response to GET /api/text/<ref> as (status, headers, body bytes); see http_cache.text_response."""
+    from .http_cache import text_response
+
+    return text_response(ref, args, if_none_match, accept_encoding)
+
+def cache_stats():
+    """Hit/miss counters for the formatted and raw page caches and the terminology engines."""
+    from .page_cache import page_cache, raw_cache
+    from .profiles import engine_cache
+
+    return dict(page_cache.stats(), raw_pages=raw_cache.stats(), terminology_engines=engine_cache.stats())
+
+def preload():
+    """Import everything a request can use and open the Sefaria session, so no request pays for it."""
+    from . import content, encoding, http_cache  # noqa: F401
+    from .sefaria_api import SEFARIA_MODE
+    from .sefaria_client import sefaria_client
+
+    if SEFARIA_MODE != 'offline':
+        sefaria_client.session
+
+if CORE_PRELOAD:
+    preload()
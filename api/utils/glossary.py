@@ -0,0 +1,154 @@
+import csv
+import json
+import os
+
+# Optional glossary of preferred renderings, applied by standardize_terminology
+GLOSSARY_PATH = os.environ.get('TERMINOLOGY_GLOSSARY')
+
+def load_glossary(path):
+    """Load a glossary of {term: replacement} from a JSON or CSV file.
+
+    JSON files hold either an object mapping terms to replacements or a list
+    of {"term": ..., "replacement": ...} objects. CSV files have two columns,
+    term and replacement, with an optional "term,replacement" header.
+    """
+    with open(path, encoding='utf-8', newline='') as f:
+        if path.lower().endswith('.json'):
+            data = json.load(f)
+            if isinstance(data, list):
+                return {entry['term']: entry['replacement'] for entry in data}
+            return dict(data)
+
+        glossary = {}
+        for row in csv.reader(f):
+            if len(row) < 2 or not row[0].strip() or row[0].startswith('#'):
+                continue
+            if not glossary and row[0].strip().lower() == 'term' and row[1].strip().lower() == 'replacement':
+                continue
+            glossary[row[0].strip()] = row[1].strip()
+        return glossary
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+class GlossaryMatcher:
+    """Replaces literal terms using an Aho-Corasick automaton.
+
+    The text is scanned once, in time proportional to its length however
+    many terms there are. Matching is case-insensitive unless
+    `case_sensitive` is set; overlapping matches are resolved leftmost first,
+    then longest; and with `whole_word` a term only matches where it is not
+    part of a longer word (like \\b around the term in a regex).
+    """
+
+    def __init__(self, glossary, case_sensitive=False, whole_word=True):
+        self.case_sensitive = case_sensitive
+        self.whole_word = whole_word
+        self.replacements = []
+        self.lengths = []
+
+        # Trie of the terms: goto[state] maps a character to the next state
+        self.goto = [{}]
+        self.output = [-1]
+        for term, replacement in glossary.items():
+            key = term if case_sensitive else term.lower()
+            if not key:
+                continue
+            state = 0
+            for ch in key:
+                next_state = self.goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][ch] = next_state
+                    self.goto.append({})
+                    self.output.append(-1)
+                state = next_state
+            if self.output[state] == -1:
+                self.output[state] = len(self.replacements)
+                self.replacements.append(replacement)
+                self.lengths.append(len(key))
+            else:
+                # A later entry for the same term wins
+                self.replacements[self.output[state]] = replacement
+        self._build_links()
+
+    def _build_links(self):
+        """Compute failure links and, for each state, the nearest state ending a term."""
+        self.fail = [0] * len(self.goto)
+        self.dict_link = [-1] * len(self.goto)
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                link = self.fail[next_state]
+                self.dict_link[next_state] = link if self.output[link] != -1 else self.dict_link[link]
+
+    def _lower(self, text):
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return lowered
+        # Some characters lower-case to several; keep offsets aligned with the original
+        return ''.join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+
+    def find(self, text):
+        """Return the (start, end, replacement) of each match in text, in order."""
+        if not text or not self.replacements:
+            return []
+        haystack = text if self.case_sensitive else self._lower(text)
+        goto, fail, output, dict_link, lengths = self.goto, self.fail, self.output, self.dict_link, self.lengths
+        root = goto[0]
+        length = len(text)
+
+        candidates = []
+        state = 0
+        for end, ch in enumerate(haystack, 1):
+            if state == 0:
+                state = root.get(ch, 0)
+                if state == 0:
+                    continue
+            else:
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+
+            match = state if output[state] != -1 else dict_link[state]
+            while match != -1:
+                term = output[match]
+                start = end - lengths[term]
+                if not self.whole_word or (
+                    (start == 0 or not _is_word_char(text[start]) or not _is_word_char(text[start - 1])) and
+                    (end == length or not _is_word_char(text[end - 1]) or not _is_word_char(text[end]))
+                ):
+                    candidates.append((start, -lengths[term], term))
+                match = dict_link[match]
+
+        # Leftmost-longest, without overlaps
+        matches = []
+        position = 0
+        for start, negative_length, term in sorted(candidates):
+            if start >= position:
+                position = start - negative_length
+                matches.append((start, position, self.replacements[term]))
+        return matches
+
+    def apply(self, text):
+        """Return text with every glossary term replaced."""
+        matches = self.find(text)
+        if not matches:
+            return text
+        parts = []
+        position = 0
+        for start, end, replacement in matches:
+            parts.append(text[position:start])
+            parts.append(replacement)
+            position = end
+        parts.append(text[position:])
+        return ''.join(parts)
+
+# Loaded once when the module is imported, if TERMINOLOGY_GLOSSARY names a file
+glossary_matcher = GlossaryMatcher(load_glossary(GLOSSARY_PATH)) if GLOSSARY_PATH else None
@@ -0,0 +1,82 @@
+import os
+import re
+
+# Hebrew marks that can be stripped, by class. Each maps code points to their replacement.
+MARK_CLASSES = {
+    # Vowel points, meteg, rafe, shin/sin dots, upper/lower dots and qamats qatan
+    'nikud': dict.fromkeys([*range(0x05B0, 0x05BE), 0x05BF, 0x05C1, 0x05C2, 0x05C4, 0x05C5, 0x05C7]),
+    # Cantillation marks (te'amim)
+    'cantillation': dict.fromkeys(range(0x0591, 0x05B0)),
+    # Maqaf joins words, so it becomes a space
+    'maqaf': {0x05BE: ' '},
+    'sof_pasuq': dict.fromkeys([0x05C3]),
+}
+# Not a translate table: tags and entities are removed with a regex
+HTML_CLASS = 'html'
+STRIP_CLASSES = tuple(MARK_CLASSES) + (HTML_CLASS,)
+
+# Classes stripped by remove_nikud (override with a comma-separated list, e.g. "nikud,cantillation,maqaf")
+DEFAULT_STRIP = tuple(
+    name.strip() for name in os.environ.get('HEBREW_STRIP', 'nikud,cantillation').split(',') if name.strip()
+)
+
+HTML_TAG_PATTERN = re.compile(r'<[^>]*>')
+
+# Translate tables cover Latin text and the Hebrew block
+_TABLE_SIZE = 0x0600
+
+# Joins a page's segments so the whole page can be translated in one call
+_BATCH_SEPARATOR = '\x1f'
+
+class HebrewNormalizer:
+    """Strip classes of Hebrew marks with a single precomputed str.translate table.
+
+    `strip` names the classes to remove, any of STRIP_CLASSES. Use
+    normalize() for one segment and normalize_batch() for a page's segment
+    list at once.
+    """
+
+    def __init__(self, strip=DEFAULT_STRIP):
+        unknown = set(strip) - set(STRIP_CLASSES)
+        if unknown:
+            raise ValueError(f"Unknown Hebrew mark classes: {', '.join(sorted(unknown))}")
+        self.strip = tuple(strip)
+        # A list indexed by code point is faster for str.translate than a dict;
+        # characters past its end (above the Hebrew block) are left as they are
+        self.table = list(range(_TABLE_SIZE))
+        for name in self.strip:
+            for code, replacement in MARK_CLASSES.get(name, {}).items():
+                self.table[code] = replacement
+        self.strip_html = HTML_CLASS in self.strip
+
+    def _strip_html(self, text):
+        text = HTML_TAG_PATTERN.sub('', text)
+        if '&' not in text:
+            return text
+        # html pulls in the entity tables, so it is only imported when HTML is stripped
+        import html
+        return html.unescape(text)
+
+    def normalize(self, text):
+        """Return text with the configured classes of marks removed."""
+        if not text:
+            return text
+        if self.strip_html:
+            text = self._strip_html(text)
+        return text.translate(self.table)
+
+    def normalize_batch(self, segments):
+        """Normalize a list of segments, translating them together in one call."""
+        if not all(isinstance(segment, str) for segment in segments):
+            return [self.normalize(segment) for segment in segments]
+
+        if self.strip_html:
+            segments = [self._strip_html(segment) for segment in segments]
+        joined = _BATCH_SEPARATOR.join(segments)
+        if joined.count(_BATCH_SEPARATOR) != len(segments) - 1:
+            # Empty, or a segment contains the separator itself
+            return [segment.translate(self.table) for segment in segments]
+        return joined.translate(self.table).split(_BATCH_SEPARATOR)
+
+# Built once when the module is loaded
+hebrew_normalizer = HebrewNormalizer()
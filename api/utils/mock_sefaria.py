@@ -0,0 +1,181 @@
+"""Local stand-in for the Sefaria texts API, for testing and benchmarking.
+
+Usage:
+    python -m utils.mock_sefaria --fixtures fixtures --port 8001
+    python -m utils.mock_sefaria --fixtures fixtures --latency 0.2 --jitter 0.05 --error-rate 0.01
+    python -m utils.mock_sefaria --fixtures fixtures --record
+
+Serves GET /api/texts/<ref> from recorded fixtures (stored in the same
+format as the offline mirror, so a mirrored corpus can be replayed
+directly). In record mode, references without a fixture are fetched from
+the real Sefaria and saved. Point the app at the stand-in with
+SEFARIA_BASE_URL=http://localhost:8001.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .corpus import CorpusStore, content_hash
+from .sefaria_api import expand_range, parse_range_ref
+from .sefaria_client import SefariaClient
+
+TEXTS_PATH = '/api/texts/'
+
+class MockSefariaServer(ThreadingHTTPServer):
+    """HTTP server replaying recorded Sefaria responses.
+
+    `latency` and `jitter` (seconds) delay every response by a uniformly
+    distributed amount; `error_rate` is the fraction of requests answered
+    with a 503. With `record` set, missing fixtures are fetched from
+    `upstream` and stored.
+    """
+
+    daemon_threads = True
+    # Accept bursts of concurrent connections, as from the async client
+    request_queue_size = 256
+
+    def __init__(self, address, fixtures, latency=0.0, jitter=0.0, error_rate=0.0,
+                 record=False, upstream='https://www.sefaria.org'):
+        super().__init__(address, MockSefariaHandler)
+        self.store = CorpusStore(fixtures)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.record = record
+        self.upstream = SefariaClient(base_url=upstream) if record else None
+        self.requests_served = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def lookup(self, ref, language):
+        """Return the recorded record for ref, recording it first if enabled.
+
+        Page ranges are answered like Sefaria does, with one nested text
+        array per page, assembled from the single-page fixtures.
+        """
+        page_range = parse_range_ref(ref)
+        if page_range:
+            try:
+                refs = expand_range(*page_range)
+            except ValueError:
+                return None
+            records = [self.lookup(page_ref, language) for page_ref in refs]
+            if any(record is None for record in records):
+                return None
+            data = {
+                'ref': ref,
+                'isSpanning': True,
+                'spanningRefs': [record['data'].get('ref', page_ref) for page_ref, record in zip(refs, records)],
+                'text': [record['data'].get('text', []) for record in records],
+                'he': [record['data'].get('he', []) for record in records],
+            }
+            return {'data': data, 'hash': content_hash(data)}
+
+        record = self.store.read(ref, language) or self.store.read(ref, 'all')
+        if record is None and self.record:
+            response = self.upstream.get(f"{TEXTS_PATH}{ref}", params={'context': 0, 'language': language})
+            if response.status_code == 200:
+                data = response.json()
+                if 'error' not in data:
+                    self.store.write(
+                        ref, language, data,
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified')
+                    )
+                    record = self.store.read(ref, language)
+        return record
+
+class MockSefariaHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if not url.path.startswith(TEXTS_PATH):
+            self._send_json(404, {'error': f"Unknown endpoint: {url.path}"})
+            return
+
+        server = self.server
+        with server._lock:
+            server.requests_served += 1
+
+        delay = server.latency + random.uniform(-server.jitter, server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        if server.error_rate and random.random() < server.error_rate:
+            self._send_json(503, {'error': "Simulated upstream failure"})
+            return
+
+        ref = unquote(url.path[len(TEXTS_PATH):])
+        language = parse_qs(url.query).get('language', ['all'])[0]
+        record = server.lookup(ref, language)
+        if record is None:
+            self._send_json(404, {'error': f"No fixture for {ref}"})
+            return
+
+        etag = f'"{record["hash"]}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self._send_json(200, record['data'], etag=etag)
+
+    def _send_json(self, status, data, etag=None):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output quiet
+        pass
+
+def start_server(fixtures, host='127.0.0.1', port=0, **options):
+    """Start a stand-in server in a background thread and return it.
+
+    Port 0 picks a free port; use `server.base_url` to point clients at it
+    and `server.shutdown()` to stop it.
+    """
+    server = MockSefariaServer((host, port), fixtures, **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve recorded Sefaria responses locally.")
+    parser.add_argument('--fixtures', default='fixtures', help="fixture directory (default: %(default)s)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', type=float, default=0.0, help="mean response delay in seconds")
+    parser.add_argument('--jitter', type=float, default=0.0, help="maximum random deviation from the latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument('--record', action='store_true', help="fetch and save responses that have no fixture")
+    parser.add_argument('--upstream', default='https://www.sefaria.org', help="server used in record mode")
+    args = parser.parse_args(argv)
+
+    server = MockSefariaServer(
+        (args.host, args.port), args.fixtures,
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        record=args.record, upstream=args.upstream
+    )
+    print(f"Serving Sefaria stand-in on {server.base_url} (fixtures: {args.fixtures})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
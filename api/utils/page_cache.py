@@ -0,0 +1,89 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+# Cache limits (override with environment variables)
+PAGE_CACHE_MAX_ENTRIES = int(os.environ.get('PAGE_CACHE_MAX_ENTRIES', 1024))
+PAGE_CACHE_MAX_BYTES = int(os.environ.get('PAGE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+RAW_CACHE_MAX_ENTRIES = int(os.environ.get('RAW_CACHE_MAX_ENTRIES', 512))
+RAW_CACHE_MAX_BYTES = int(os.environ.get('RAW_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+def estimate_size(value):
+    """Roughly estimate the memory used by a cached page, in bytes."""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+class PageCache:
+    """Thread-safe in-memory LRU of pages.
+
+    Used for both layers of page caching: formatted sections keyed by
+    (ref, language, remove_nikud, standardize_terms, split_sentences,
+    terminology), and raw Sefaria payloads keyed by (ref, language) so that
+    a page can be reformatted with other options without fetching it again.
+    The cache is bounded both by entry count and by the estimated memory of
+    the stored values.
+    """
+
+    def __init__(self, max_entries=PAGE_CACHE_MAX_ENTRIES, max_bytes=PAGE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the value cached under key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Store the value for key, evicting least recently used pages."""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return hit/miss counters and current usage."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+            }
+
+# Shared caches used by fetch_pages and fetch_range: formatted sections, and
+# the raw payloads they were formatted from
+page_cache = PageCache()
+raw_cache = PageCache(RAW_CACHE_MAX_ENTRIES, RAW_CACHE_MAX_BYTES)
@@ -0,0 +1,156 @@
+from collections import namedtuple
+from functools import partial
+
+from .formatter import remove_nikud_batch, standardize_terminology
+from .sentences import iter_sentence_spans
+
+# A formatting step. `language` is 'he' or 'en'; `option` names the request
+# option that enables it; `build(options)` returns the function to run.
+# 'page' stages map a language's whole list of segments to a new list and run
+# first, so work such as a translate table is done in one call per page;
+# 'transform' stages map a segment to a segment; a 'split' stage maps the
+# transformed segment to its list of lines (at most one per language).
+Stage = namedtuple('Stage', ['name', 'language', 'option', 'build', 'kind'])
+
+FIELDS = {'he': 'hebrew', 'en': 'english'}
+DATA_KEYS = {'he': 'he', 'en': 'text'}
+
+def _chain(functions):
+    """Compose segment transforms into one function, or None if there are none."""
+    if not functions:
+        return None
+    if len(functions) == 1:
+        return functions[0]
+
+    def chained(text):
+        for function in functions:
+            text = function(text)
+        return text
+    return chained
+
+class CompiledPipeline:
+    """The enabled stages of a FormatPipeline for one set of options."""
+
+    def __init__(self, stages, options):
+        self.page_transforms = {}
+        self.transforms = {}
+        self.splitters = {}
+        for language in FIELDS:
+            enabled = [stage for stage in stages if stage.language == language and options.get(stage.option)]
+            self.page_transforms[language] = _chain([stage.build(options) for stage in enabled if stage.kind == 'page'])
+            self.transforms[language] = _chain([stage.build(options) for stage in enabled if stage.kind == 'transform'])
+            splitters = [stage.build(options) for stage in enabled if stage.kind == 'split']
+            self.splitters[language] = splitters[-1] if splitters else None
+
+    def _page(self, segments, language):
+        """Run a language's list of segments through its page stages."""
+        page_transform = self.page_transforms[language]
+        return page_transform(segments) if page_transform else segments
+
+    def _lines(self, segment, language):
+        """Run one segment through the language's transforms and splitter."""
+        transform = self.transforms[language]
+        if transform:
+            segment = transform(segment)
+        splitter = self.splitters[language]
+        return splitter(segment) if splitter else [segment]
+
+    def format(self, data, language='all'):
+        """Format a Sefaria response into sections in a single pass over its segments."""
+        if language in FIELDS:
+            return self._format_single(data, language)
+
+        hebrew, english = data.get('he'), data.get('text')
+        if not hebrew or not english:
+            return []
+        if not isinstance(hebrew, list) or not isinstance(english, list):
+            if isinstance(hebrew, list) or isinstance(english, list):
+                return []
+            hebrew, english = [hebrew], [english]
+        hebrew, english = self._page(hebrew, 'he'), self._page(english, 'en')
+
+        return [
+            {'number': number, 'hebrew': self._lines(heb, 'he'), 'english': self._lines(eng, 'en')}
+            for number, (heb, eng) in enumerate(zip(hebrew, english), 1)
+        ]
+
+    def _format_single(self, data, language):
+        segments = data.get(DATA_KEYS[language])
+        if not segments:
+            return []
+        if not isinstance(segments, list):
+            segments = [segments]
+        segments = self._page(segments, language)
+        field = FIELDS[language]
+        return [
+            {'number': number, field: self._lines(segment, language)}
+            for number, segment in enumerate(segments, 1)
+        ]
+
+class FormatPipeline:
+    """Registry of formatting stages, compiled once per set of options.
+
+    New transforms are added with register(); they run in registration order
+    within their language. compile() picks the stages enabled by an options
+    dict and fuses them: page stages run once over each language's segment
+    list, then each (hebrew, english) segment pair is visited once and goes
+    through every segment stage before the next pair.
+    """
+
+    # Compiled pipelines kept per options set
+    MAX_COMPILED = 64
+
+    def __init__(self):
+        self.stages = []
+        self._compiled = {}
+
+    def register(self, name, language, option, build, kind='transform'):
+        """Add a stage; see Stage for the arguments."""
+        if language not in FIELDS:
+            raise ValueError(f"Unknown stage language: {language}")
+        if kind not in ('page', 'transform', 'split'):
+            raise ValueError(f"Unknown stage kind: {kind}")
+        self.stages.append(Stage(name, language, option, build, kind))
+        self._compiled.clear()
+
+    def compile(self, options):
+        """Return the CompiledPipeline for an options dict (values must be hashable)."""
+        key = tuple(sorted(options.items(), key=lambda item: item[0]))
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            if len(self._compiled) >= self.MAX_COMPILED:
+                self._compiled.clear()
+            compiled = self._compiled[key] = CompiledPipeline(self.stages, options)
+        return compiled
+
+    def run(self, data, options, language='all'):
+        """Format a Sefaria response with the stages enabled by options."""
+        return self.compile(options).format(data, language)
+
+def _splitter(language):
+    return lambda options: lambda text: [text[start:end] for start, end in iter_sentence_spans(text, language)]
+
+# The standard pipeline used by every entry point
+format_pipeline = FormatPipeline()
+format_pipeline.register('nikud', 'he', 'remove_nikud_marks', lambda options: remove_nikud_batch, kind='page')
+format_pipeline.register(
+    'terminology', 'en', 'standardize_terms',
+    lambda options: partial(standardize_terminology, engine=options.get('terminology'))
+)
+format_pipeline.register('split', 'he', 'split_sentences', _splitter('he'), kind='split')
+format_pipeline.register('split', 'en', 'split_sentences', _splitter('en'), kind='split')
+
+def process_sefaria_data(data, remove_nikud_marks, standardize_terms, split_sentences, language='all', terminology=None):
+    """Process the Sefaria API data and return formatted sections.
+
+    For single-language requests ('en' or 'he') only that language is
+    processed, and each section carries just that language's lines.
+    `terminology` is a compiled terminology profile (see utils/profiles.py).
+    """
+    options = {
+        'remove_nikud_marks': remove_nikud_marks,
+        'standardize_terms': standardize_terms,
+        'split_sentences': split_sentences,
+        'terminology': terminology,
+    }
+    return format_pipeline.run(data, options, language)
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from .formatter import TERMINOLOGY_PREFERENCES, TerminologyEngine
+from .glossary import GlossaryMatcher
+
+# Named terminology profiles. Each is a complete set of regex preferences used
+# instead of TERMINOLOGY_PREFERENCES; 'default' is the built-in set.
+TERMINOLOGY_PROFILES = {
+    'default': TERMINOLOGY_PREFERENCES,
+    # Keeps "Rabbi" spelled out and renders the divine name as "God"
+    'traditional': {
+        **{pattern: replacement for pattern, replacement in TERMINOLOGY_PREFERENCES.items()
+           if pattern not in (r'\bRabbi\b', r'\bthe Lord\b')},
+        r'\bthe Lord\b': 'God',
+    },
+    # Leaves the translation's terminology as it is
+    'none': {},
+}
+
+# Limits for inline profiles sent with a request
+MAX_INLINE_TERMS = int(os.environ.get('TERMINOLOGY_MAX_INLINE_TERMS', 2000))
+# Number of compiled profiles kept in memory
+ENGINE_CACHE_SIZE = int(os.environ.get('TERMINOLOGY_ENGINE_CACHE_SIZE', 32))
+
+def profile_hash(kind, terms):
+    """Return a stable hash of a profile's kind and content."""
+    payload = json.dumps([kind, sorted(terms.items())], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+class EngineCache:
+    """Thread-safe LRU of compiled terminology engines, keyed by profile hash."""
+
+    def __init__(self, max_entries=ENGINE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._engines = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        """Return the engine cached under key, compiling it with build() on a miss."""
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is not None:
+                self._engines.move_to_end(key)
+                self.hits += 1
+                return engine
+            self.misses += 1
+
+        # Compile outside the lock; a concurrent miss on the same key just compiles twice
+        engine = build()
+        with self._lock:
+            self._engines[key] = engine
+            self._engines.move_to_end(key)
+            while len(self._engines) > self.max_entries:
+                self._engines.popitem(last=False)
+        return engine
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entries': len(self._engines), 'max_entries': self.max_entries}
+
+# Shared by all requests handled by this process
+engine_cache = EngineCache()
+
+def resolve_profile(profile):
+    """Return (key, engine) for a terminology profile.
+
+    `profile` is None for the default terminology, the name of one of
+    TERMINOLOGY_PROFILES, or an inline {term: replacement} object whose terms
+    are matched literally as whole words. The key identifies the profile's
+    content (for cache keys); the engine is None for the default. Raises
+    ValueError for unknown names and malformed inline profiles.
+    """
+    if profile is None or profile == 'default':
+        return 'default', None
+
+    if isinstance(profile, str):
+        preferences = TERMINOLOGY_PROFILES.get(profile)
+        if preferences is None:
+            raise ValueError(
+                f"Unknown terminology profile: {profile} (available: {', '.join(TERMINOLOGY_PROFILES)})"
+            )
+        key = profile_hash('named', preferences)
+        return key, engine_cache.get(key, lambda: TerminologyEngine(preferences))
+
+    if not isinstance(profile, dict):
+        raise ValueError("terminology must be a profile name or an object mapping terms to replacements")
+    if len(profile) > MAX_INLINE_TERMS:
+        raise ValueError(f"Inline terminology profiles are limited to {MAX_INLINE_TERMS} terms")
+    if not all(isinstance(term, str) and isinstance(replacement, str) for term, replacement in profile.items()):
+        raise ValueError("Inline terminology profiles must map strings to strings")
+
+    key = profile_hash('inline', profile)
+    return key, engine_cache.get(key, lambda: GlossaryMatcher(profile))
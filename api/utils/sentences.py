@@ -0,0 +1,70 @@
+import re
+
+# Sentence-ending punctuation and abbreviations that do not end a sentence, per language.
+# The Hebrew rules also cover the Aramaic of the Talmud, which Sefaria punctuates the same way.
+SENTENCE_RULES = {
+    'en': {
+        'punctuation': '.?:',
+        'abbreviations': ['R.', 'i.e.', 'e.g.', 'cf.', 'vs.', 'viz.'],
+    },
+    'he': {
+        # Includes sof pasuq, which ends verses quoted with their cantillation
+        'punctuation': '.?:׃',
+        'abbreviations': [],
+    },
+}
+
+def _compile(punctuation):
+    """Match leading whitespace, then a sentence up to punctuation followed by whitespace or the end."""
+    return re.compile(rf'\s*(.*?[{re.escape(punctuation)}])(?=\s|$)', flags=re.DOTALL)
+
+# Compiled once when the module is loaded
+SENTENCE_PATTERNS = {language: _compile(rules['punctuation']) for language, rules in SENTENCE_RULES.items()}
+ABBREVIATIONS = {language: tuple(rules['abbreviations']) for language, rules in SENTENCE_RULES.items()}
+
+# Text after the last sentence-ending punctuation, without surrounding whitespace
+TAIL_PATTERN = re.compile(r'\s*(\S(?:.*\S)?)\s*$', flags=re.DOTALL)
+
+def _ends_with_abbreviation(text, start, end, abbreviations):
+    """Whether text[start:end] ends with a whole-word abbreviation."""
+    if not text.endswith(abbreviations, start, end):
+        return False
+    for abbreviation in abbreviations:
+        begin = end - len(abbreviation)
+        if begin >= start and text.startswith(abbreviation, begin):
+            return begin == 0 or not text[begin - 1].isalnum()
+    return False
+
+def iter_sentence_spans(text, language='en'):
+    """Yield the (start, end) offsets of each sentence in text, without surrounding whitespace.
+
+    Nothing is copied, so this can run over whole tractates; slice text with
+    the offsets (or use iter_sentences) to get the sentences themselves.
+    """
+    if not text:
+        return
+    if language not in SENTENCE_PATTERNS:
+        language = 'en'
+    abbreviations = ABBREVIATIONS[language]
+
+    start = None
+    position = 0
+    for match in SENTENCE_PATTERNS[language].finditer(text):
+        sentence_start, end = match.span(1)
+        if start is None:
+            start = sentence_start
+        if abbreviations and _ends_with_abbreviation(text, sentence_start, end, abbreviations):
+            # "R." or "i.e." does not end the sentence
+            continue
+        yield start, end
+        start = None
+        position = end
+
+    tail = TAIL_PATTERN.match(text, position)
+    if tail:
+        yield start if start is not None else tail.start(1), tail.end(1)
+
+def iter_sentences(text, language='en'):
+    """Yield the sentences of text one at a time."""
+    for start, end in iter_sentence_spans(text, language):
+        yield text[start:end]
@@ -0,0 +1,84 @@
+"""ASGI entry point: serves the /api/get_text contract on an event loop.
+
+Run it with any ASGI server, e.g.:
+    uvicorn asgi:app --host 0.0.0.0 --port 8080
+
+Upstream requests go through the async Sefaria client, so one process can
+wait on hundreds of Sefaria round-trips at once instead of one per sync
+worker. Formatting, the caches and the response format are the same as
+app.py's; only POST /api/get_text (including "stream": true) and
+GET /api/cache_stats are served here.
+"""
+import json
+
+from utils import async_api, core  # noqa: F401 -- a long-running server loads the fetch modules up front
+from utils.async_client import async_sefaria_client
+
+async def get_text(data, send, accept_encoding=None):
+    """Retrieve and format text from Sefaria, answering like app.get_text."""
+    reply = await core.get_text_async(data, accept_encoding)
+    headers = dict(reply.headers)
+    await _start(send, 200, headers.pop('Content-Type'), headers)
+    if reply.lines is None:
+        await send({'type': 'http.response.body', 'body': reply.body})
+        return
+
+    # Send each page as a line of JSON as soon as it is ready, current page first
+    async for line in reply.lines:
+        await send({'type': 'http.response.body', 'body': line, 'more_body': True})
+    await send({'type': 'http.response.body', 'body': b''})
+
+async def _start(send, status, content_type, headers=None):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', content_type.encode())] + [
+            (name.lower().encode(), value.encode()) for name, value in (headers or {}).items()
+        ],
+    })
+
+async def _send_body(send, status, content_type, body):
+    await _start(send, status, content_type)
+    await send({'type': 'http.response.body', 'body': body.encode()})
+
+async def _read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await async_sefaria_client.aclose()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    path, method = scope['path'], scope['method']
+    if path == '/api/get_text' and method == 'POST':
+        headers = dict(scope.get('headers') or [])
+        accept_encoding = headers.get(b'accept-encoding', b'').decode('latin-1')
+        data = core.read_body(await _read_body(receive))
+        if data is None:
+            reply = core.invalid_body_reply(accept_encoding)
+            headers = dict(reply.headers)
+            await _start(send, 400, headers.pop('Content-Type'), headers)
+            await send({'type': 'http.response.body', 'body': reply.body})
+            return
+        await get_text(data, send, accept_encoding)
+    elif path == '/api/cache_stats' and method == 'GET':
+        await _send_body(send, 200, 'application/json', json.dumps(core.cache_stats()))
+    else:
+        await _send_body(send, 404, 'application/json', json.dumps({'error': f"Not found: {method} {path}"}))
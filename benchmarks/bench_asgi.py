@@ -0,0 +1,157 @@
+"""Benchmark: ASGI entry point vs. the Flask app under sync workers.
+
+Usage:
+    python -m benchmarks.bench_asgi [requests] [latency] [--cache]
+
+Serves sample pages from a local Sefaria stand-in that waits `latency`
+seconds (default 0.2) before each response, then sends `requests` (default
+200) POST /api/get_text requests for distinct pages, all at once:
+
+- to app.py through Flask's test client from 1 and 4 threads, each handling
+  one request at a time like a gunicorn sync worker (the Dockerfile runs one);
+- to asgi.app on a single event loop.
+
+Caches are cleared between runs so every request waits on the stand-in.
+With --cache the persistent response cache is enabled (in a temporary
+file), so every request also looks its page up in SQLite and stores it.
+Reports requests per second and median / 99th percentile latency.
+"""
+import asyncio
+import json
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+
+# Every request should reach the stand-in; the persistent response cache is
+# only used with --cache, and then starts empty
+if '--cache' in sys.argv:
+    os.environ['SEFARIA_CACHE'] = '1'
+    os.environ['SEFARIA_CACHE_PATH'] = os.path.join(tempfile.mkdtemp(), 'sefaria_cache.sqlite3')
+else:
+    os.environ['SEFARIA_CACHE'] = '0'
+
+import asgi
+from app import app as flask_app
+from utils.async_client import async_sefaria_client
+from utils.corpus import CorpusStore
+from utils.mock_sefaria import start_server
+from utils.page_cache import page_cache, raw_cache
+from utils.response_cache import response_cache
+from utils.sefaria_client import sefaria_client
+from utils.tractates import BAVLI_TRACTATES, page_refs
+
+from .samples import ENGLISH_SEGMENTS, HEBREW_SEGMENTS
+
+def write_fixtures(root, count):
+    """Store `count` distinct pages in a fixture directory and return their refs."""
+    store = CorpusStore(root)
+    refs = []
+    for name, _, _, _ in BAVLI_TRACTATES:
+        for ref in page_refs(name):
+            if len(refs) == count:
+                return refs
+            store.write(ref, 'all', {'ref': ref, 'he': HEBREW_SEGMENTS, 'text': ENGLISH_SEGMENTS})
+            refs.append(ref)
+    return refs
+
+def clear_caches():
+    page_cache.clear()
+    raw_cache.clear()
+    if response_cache:
+        response_cache.clear()
+
+def summarize(label, latencies, elapsed):
+    latencies = sorted(latencies)
+    median = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{label:<22} {len(latencies) / elapsed:>8.1f} req/s {median * 1000:>8.0f} ms p50 {p99 * 1000:>8.0f} ms p99")
+
+def run_sync(refs, workers):
+    """Send every request through Flask, `workers` requests at a time."""
+    pending = queue.Queue()
+    for ref in refs:
+        pending.put(ref)
+    results = {}
+    latencies = []
+    start = time.perf_counter()
+
+    def worker():
+        client = flask_app.test_client()
+        while True:
+            try:
+                ref = pending.get_nowait()
+            except queue.Empty:
+                return
+            response = client.post('/api/get_text', json={'reference': ref})
+            results[ref] = response.get_json()
+            latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, latencies, time.perf_counter() - start
+
+async def asgi_request(body):
+    """Call asgi.app in process and return the decoded JSON response."""
+    messages = [{'type': 'http.request', 'body': json.dumps(body).encode(), 'more_body': False}]
+    chunks = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        if message['type'] == 'http.response.body':
+            chunks.append(message['body'])
+
+    scope = {'type': 'http', 'method': 'POST', 'path': '/api/get_text', 'headers': []}
+    await asgi.app(scope, receive, send)
+    return json.loads(b''.join(chunks))
+
+async def run_async(refs):
+    latencies = []
+    start = time.perf_counter()
+
+    async def timed(ref):
+        result = await asgi_request({'reference': ref})
+        latencies.append(time.perf_counter() - start)
+        return result
+
+    results = await asyncio.gather(*(timed(ref) for ref in refs))
+    elapsed = time.perf_counter() - start
+    await async_sefaria_client.aclose()
+    return dict(zip(refs, results)), latencies, elapsed
+
+def main(argv=None):
+    argv = [arg for arg in (argv if argv is not None else sys.argv[1:]) if arg != '--cache']
+    count = int(argv[0]) if argv else 200
+    latency = float(argv[1]) if len(argv) > 1 else 0.2
+
+    with tempfile.TemporaryDirectory() as fixtures:
+        refs = write_fixtures(fixtures, count)
+        server = start_server(fixtures, latency=latency)
+        sefaria_client.base_url = server.base_url
+        async_sefaria_client.base_url = server.base_url
+        print(f"{len(refs)} requests, {latency * 1000:.0f} ms upstream latency, "
+              f"response cache {'on' if response_cache else 'off'}")
+
+        expected = None
+        for workers in (1, 4):
+            clear_caches()
+            results, latencies, elapsed = run_sync(refs, workers)
+            expected = expected or results
+            assert results == expected
+            summarize(f"flask, {workers} sync worker{'s' if workers > 1 else ''}", latencies, elapsed)
+
+        clear_caches()
+        results, latencies, elapsed = asyncio.run(run_async(refs))
+        assert results == expected
+        summarize("asgi, 1 event loop", latencies, elapsed)
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""Benchmark: bulk formatting throughput by number of worker processes.
+
+Usage:
+    python -m benchmarks.bench_bulk [pages]
+
+Formats copies of the sample daf with utils.bulk.format_pages and reports
+pages per second for 1, 2, 4, ... workers up to the number of cores.
+"""
+import os
+import sys
+import time
+
+from utils.bulk import format_pages
+
+from .samples import ENGLISH_SEGMENTS, HEBREW_SEGMENTS
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    count = int(argv[0]) if argv else 400
+    # Roughly the size of a real daf
+    page = {'he': HEBREW_SEGMENTS * 4, 'text': ENGLISH_SEGMENTS * 4}
+    pages = [page] * count
+
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, cores} | {n for n in (2, 4, 8, 16, 32) if n < cores})
+    expected = None
+    baseline = None
+    print(f"{count} pages, {cores} cores")
+    for workers in worker_counts:
+        start = time.perf_counter()
+        results = list(format_pages(pages, workers=workers))
+        elapsed = time.perf_counter() - start
+        expected = expected or results
+        assert results == expected
+        rate = count / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>3} workers {rate:>9.1f} pages/s {rate / baseline:>6.2f}x")
+
+if __name__ == '__main__':
+    main()
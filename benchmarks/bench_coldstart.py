@@ -0,0 +1,116 @@
+"""Benchmark: cold start of the Lambda handler.
+
+Usage:
+    python -m benchmarks.bench_coldstart [runs] [latency]
+
+Each run starts a fresh interpreter, as a new Lambda execution environment
+would, and times:
+
+- init: `import handler` (what Lambda runs before the first invocation);
+- first: the first get_text invocation, for a page not cached anywhere;
+- warm: a second invocation, for another page.
+
+Pages come from a local Sefaria stand-in that waits `latency` seconds
+(default 0) before each response, so the times are the handler's own, or
+from the same pages as a local mirror (SEFARIA_MODE=offline). Runs are
+repeated `runs` times (default 5) and the median is reported, with the
+modules lazy-loaded by utils.core (the default) and with CORE_PRELOAD=1.
+The `python -X importtime` tree of `import handler` is summarized as well.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from utils.mock_sefaria import start_server
+
+from .bench_asgi import write_fixtures
+
+# Runs in the child interpreter; prints its timings as JSON
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import handler
+init = time.perf_counter() - start
+
+def invoke(ref):
+    start = time.perf_counter()
+    response = handler.get_text({'body': json.dumps({'reference': ref})}, None)
+    assert json.loads(response['body'])['success'], response
+    return time.perf_counter() - start
+
+first = invoke(sys.argv[1])
+warm = invoke(sys.argv[2])
+print(json.dumps({'init': init, 'first': first, 'warm': warm, 'modules': len(sys.modules)}))
+"""
+
+MODES = [
+    ('lazy (default)', {}),
+    ('CORE_PRELOAD=1', {'CORE_PRELOAD': '1'}),
+    # Served from the local mirror: requests is never needed
+    ('lazy, offline', {'SEFARIA_MODE': 'offline'}),
+    ('CORE_PRELOAD=1, offline', {'CORE_PRELOAD': '1', 'SEFARIA_MODE': 'offline'}),
+]
+
+def child_env(base_url, fixtures, **extra):
+    # Every request should reach the stand-in (or the mirror), not the persistent response cache
+    return dict(os.environ, SEFARIA_BASE_URL=base_url, SEFARIA_MIRROR_PATH=fixtures, SEFARIA_CACHE='0', **extra)
+
+def run_child(env, refs):
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD, *refs], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output)
+
+def import_tree(env, limit=8):
+    """Return (total microseconds, [(module, cumulative microseconds)]) for `import handler`."""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import handler'],
+        env=env, check=True, capture_output=True, text=True
+    ).stderr
+    total, direct, children = None, [], []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name[1:].rstrip()
+        # Modules are listed after their own imports, each level indented by two spaces
+        if not name.startswith(' '):
+            if name == 'handler':
+                total, direct = int(cumulative), children
+            children = []
+        elif not name.startswith('   '):
+            children.append((name.strip(), int(cumulative)))
+    return total, sorted(direct, key=lambda item: -item[1])[:limit]
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    runs = int(argv[0]) if argv else 5
+    latency = float(argv[1]) if len(argv) > 1 else 0.0
+
+    with tempfile.TemporaryDirectory() as fixtures:
+        refs = write_fixtures(fixtures, 2)
+        server = start_server(fixtures, latency=latency)
+        print(f"{runs} cold starts each, {latency * 1000:.0f} ms upstream latency (median ms)")
+        print(f"{'mode':<26} {'init':>8} {'first':>8} {'init+first':>11} {'warm':>8} {'modules':>8}")
+
+        for label, extra in MODES:
+            env = child_env(server.base_url, fixtures, **extra)
+            results = [run_child(env, refs) for _ in range(runs)]
+            init, first, warm = (statistics.median(result[key] for result in results)
+                                 for key in ('init', 'first', 'warm'))
+            modules = results[0]['modules']
+            print(f"{label:<26} {init * 1000:>8.1f} {first * 1000:>8.1f} {(init + first) * 1000:>11.1f} "
+                  f"{warm * 1000:>8.1f} {modules:>8}")
+
+        for label, extra in MODES[:2]:
+            total, direct = import_tree(child_env(server.base_url, fixtures, **extra))
+            print(f"\npython -X importtime -c 'import handler', {label}: {total / 1000:.1f} ms")
+            for name, cumulative in direct:
+                print(f"  {name:<28} {cumulative / 1000:>8.1f} ms")
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark: response size and serialization time of /api/get_text payloads.
+
+Usage:
+    python -m benchmarks.bench_encoding [adjacent_pages]
+
+Builds the response for a page with `adjacent_pages` (default 5) pages
+each way, formatted with the default options. Each page is a different
+daf-sized text drawn at random from the vocabulary of the samples, so that
+compression cannot simply reuse repeated pages. The stock
+encoders (Flask's jsonify and the Lambda handler's json.dumps) are then
+compared with utils.encoding: the orjson or stdlib UTF-8 fast path, the
+compact columnar schema, and gzip / brotli compression.
+"""
+import gzip
+import json
+import random
+import sys
+import timeit
+
+from utils.encoding import BROTLI_QUALITY, GZIP_LEVEL, brotli, dumps, format_result, orjson
+from utils.pipeline import process_sefaria_data
+
+from .samples import ENGLISH_SEGMENTS, HEBREW_SEGMENTS
+
+def synthetic_segments(segments, rng, count=24):
+    """Return `count` segments of words drawn from the samples, with their punctuation."""
+    words = ' '.join(segments).split()
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(20, 70))) + '.' for _ in range(count)]
+
+def build_result(adjacent_pages, seed=0):
+    rng = random.Random(seed)
+    content = []
+    for offset in range(-adjacent_pages, adjacent_pages + 1):
+        kind = 'Current' if offset == 0 else 'Previous' if offset < 0 else 'Next'
+        ref = f"Berakhot.{10 + offset}a"
+        # Roughly the size of a real daf
+        data = {'he': synthetic_segments(HEBREW_SEGMENTS, rng), 'text': synthetic_segments(ENGLISH_SEGMENTS, rng)}
+        sections = process_sefaria_data(data, True, True, True)
+        page = {'title': f"{kind} Page ({ref})", 'sections': sections, 'reference': ref, 'source': 'upstream'}
+        content.append(page)
+    return {'success': True, 'message': '', 'content': content}
+
+def measure(encode, number=20):
+    seconds = min(timeit.repeat(encode, number=number, repeat=5)) / number
+    return encode(), seconds
+
+def main(argv=None):
+    argv = argv if argv is not None else sys.argv[1:]
+    adjacent_pages = int(argv[0]) if argv else 5
+    result = build_result(adjacent_pages)
+    compact = format_result(result, 'compact')
+    print(f"{2 * adjacent_pages + 1} pages, fast path: {'orjson' if orjson else 'json (UTF-8)'}")
+
+    cases = [
+        ('jsonify (Flask)', lambda: json.dumps(result, ensure_ascii=True, sort_keys=True,
+                                               separators=(',', ':')).encode()),
+        ('json.dumps (Lambda)', lambda: json.dumps(result).encode()),
+        ('fast path', lambda: dumps(result)),
+        ('fast path, compact', lambda: dumps(format_result(result, 'compact'))),
+        ('fast path + gzip', lambda: gzip.compress(dumps(result), compresslevel=GZIP_LEVEL)),
+        ('compact + gzip', lambda: gzip.compress(dumps(format_result(result, 'compact')),
+                                                 compresslevel=GZIP_LEVEL)),
+    ]
+    if brotli is not None:
+        cases += [
+            ('fast path + br', lambda: brotli.compress(dumps(result), quality=BROTLI_QUALITY)),
+            ('compact + br', lambda: brotli.compress(dumps(format_result(result, 'compact')),
+                                                     quality=BROTLI_QUALITY)),
+        ]
+
+    # The encodings must round-trip to the same data
+    assert json.loads(dumps(result)) == result
+    assert json.loads(dumps(compact)) == compact
+
+    baseline_size = baseline_time = None
+    print(f"{'encoding':<22} {'bytes':>10} {'size':>7} {'ms':>8} {'time':>7}")
+    for label, encode in cases:
+        body, seconds = measure(encode)
+        baseline_size = baseline_size or len(body)
+        baseline_time = baseline_time or seconds
+        print(f"{label:<22} {len(body):>10} {len(body) / baseline_size:>6.0%} "
+              f"{seconds * 1000:>8.2f} {seconds / baseline_time:>6.0%}")
+
+if __name__ == '__main__':
+    main()
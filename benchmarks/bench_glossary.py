@@ -0,0 +1,75 @@
+"""Micro-benchmark: Aho-Corasick glossary matcher vs. the regex approaches.
+
+Usage:
+    python -m benchmarks.bench_glossary
+
+Builds synthetic glossaries of up to 10k whole-word terms (names, places,
+multi-word phrases) and times standardizing a page of English segments
+with one re.sub per term, the compiled TerminologyEngine regex and the
+GlossaryMatcher.
+"""
+import random
+import re
+import timeit
+
+from utils.formatter import TerminologyEngine
+from utils.glossary import GlossaryMatcher
+
+from .samples import ENGLISH_SEGMENTS
+
+SYLLABLES = ['ba', 'ra', 'yo', 'cha', 'nan', 'me', 'ir', 'she', 'mu', 'el', 'ak', 'iva', 'ta', 'ri', 'fon', 'zar']
+
+def synthetic_glossary(size, seed=0):
+    """Return {term: replacement} with size distinct terms of one to three words."""
+    rng = random.Random(seed)
+    glossary = {}
+    while len(glossary) < size:
+        words = [''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(1, 3))]
+        glossary[' '.join(words).capitalize()] = f"term{len(glossary)}"
+    return glossary
+
+def sample_page(glossary, seed=0):
+    """Sprinkle some glossary terms through the sample segments."""
+    rng = random.Random(seed)
+    terms = list(glossary)
+    page = []
+    for segment in ENGLISH_SEGMENTS * 10:
+        words = segment.split(' ')
+        for _ in range(5):
+            words.insert(rng.randrange(len(words)), rng.choice(terms))
+        page.append(' '.join(words))
+    return page
+
+def apply_loop(patterns, text):
+    """One re.sub scan per glossary term."""
+    for pattern, replacement in patterns:
+        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+    return text
+
+def main():
+    print(f"{'terms':>6} {'build':>10} {'re.sub loop':>14} {'regex engine':>14} {'Aho-Corasick':>14}")
+    for size in (15, 100, 1000, 10000):
+        glossary = synthetic_glossary(size)
+        page = sample_page(glossary)
+        patterns = [(rf'\b{re.escape(term)}\b', replacement) for term, replacement in glossary.items()]
+
+        start = timeit.default_timer()
+        matcher = GlossaryMatcher(glossary)
+        build_time = timeit.default_timer() - start
+        # Longest terms first, so the regex also prefers the longest match
+        engine = TerminologyEngine(dict(sorted(patterns, key=lambda entry: -len(entry[0]))))
+        for segment in page[:5]:
+            assert matcher.apply(segment) == engine.apply(segment)
+
+        # The loop grows with the glossary; time fewer segments at large sizes
+        loop_page = page[:max(1, len(page) * 15 // size)]
+        loop_time = timeit.timeit(lambda: [apply_loop(patterns, s) for s in loop_page], number=1)
+        loop_time *= len(page) / len(loop_page)
+        repeat = 3 if size < 1000 else 1
+        engine_time = timeit.timeit(lambda: [engine.apply(s) for s in page], number=repeat) / repeat
+        matcher_time = timeit.timeit(lambda: [matcher.apply(s) for s in page], number=3) / 3
+        print(f"{size:>6} {build_time * 1000:>7.1f} ms {loop_time * 1000:>11.1f} ms "
+              f"{engine_time * 1000:>11.1f} ms {matcher_time * 1000:>11.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Micro-benchmark: translate-table Hebrew normalizer vs. one re.sub per segment.
+
+Usage:
+    python -m benchmarks.bench_hebrew [Berakhot.2a ...]
+
+Uses the named pages from the offline mirror (see utils/mirror.py) when they
+have been downloaded, and the Berakhot 2a sample text otherwise.
+"""
+import re
+import sys
+import timeit
+
+from utils.corpus import corpus_store
+from utils.hebrew import HebrewNormalizer
+
+from .samples import HEBREW_SEGMENTS
+
+NIKUD_PATTERN = r'[\u0591-\u05BD\u05BF\u05C1\u05C2\u05C4\u05C5\u05C7]'
+
+def remove_nikud_regex(text):
+    """The previous implementation of remove_nikud."""
+    if not text:
+        return text
+    return re.sub(NIKUD_PATTERN, '', text)
+
+def load_pages(refs):
+    """Return the Hebrew segments of each mirrored page, or the sample page."""
+    pages = []
+    for ref in refs:
+        data = corpus_store.load(ref, 'all')
+        if data and isinstance(data.get('he'), list):
+            pages.append([segment for segment in data['he'] if isinstance(segment, str)])
+    if not pages:
+        print("No mirrored pages found; using the Berakhot 2a sample")
+        pages = [HEBREW_SEGMENTS * 4]
+    return pages
+
+def main(argv=None):
+    refs = argv if argv is not None else sys.argv[1:]
+    pages = load_pages(refs or ['Berakhot.2a', 'Berakhot.2b', 'Shabbat.31a'])
+    normalizer = HebrewNormalizer(('nikud', 'cantillation'))
+    for page in pages:
+        assert normalizer.normalize_batch(page) == [remove_nikud_regex(segment) for segment in page]
+
+    segments = sum(len(page) for page in pages)
+    chars = sum(len(segment) for page in pages for segment in page)
+    print(f"{len(pages)} page(s), {segments} segments, {chars} characters")
+
+    repeat = 200
+    timings = {
+        're.sub per segment': lambda: [[remove_nikud_regex(s) for s in page] for page in pages],
+        'translate per segment': lambda: [[normalizer.normalize(s) for s in page] for page in pages],
+        'translate per page': lambda: [normalizer.normalize_batch(page) for page in pages],
+    }
+    baseline = None
+    for name, run in timings.items():
+        elapsed = timeit.timeit(run, number=repeat) / repeat
+        baseline = baseline or elapsed
+        print(f"{name:>22} {elapsed * 1000:>8.3f} ms {baseline / elapsed:>6.1f}x")
+
+if __name__ == '__main__':
+    main()
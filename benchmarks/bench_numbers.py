@@ -0,0 +1,101 @@
+"""Micro-benchmark: number-word parser vs. the old word2number-based converter.
+
+Usage:
+    python -m benchmarks.bench_numbers
+
+Checks utils.numbers against the conformance corpus in number_cases, then
+times it against the exception-driven w2n converter the Lambda handler used
+to run. The w2n comparison is skipped if word2number is not installed.
+"""
+import re
+import sys
+import timeit
+
+from utils.numbers import convert_number_words, ordinal_suffix
+
+from .number_cases import NUMBER_CASES
+from .samples import ENGLISH_SEGMENTS
+
+ORDINAL_WORDS = {
+    'first', 'second', 'third', 'fourth', 'fifth', 'sixth', 'seventh', 'eighth', 'ninth', 'tenth',
+    'eleventh', 'twelfth', 'thirteenth', 'fourteenth', 'fifteenth', 'sixteenth', 'seventeenth',
+    'eighteenth', 'nineteenth', 'twentieth', 'thirtieth', 'fortieth', 'fiftieth', 'sixtieth',
+    'seventieth', 'eightieth', 'ninetieth', 'hundredth', 'thousandth',
+}
+
+def w2n_converter():
+    """Return the previous handler.py converter, or None without word2number."""
+    try:
+        from word2number import w2n
+    except ImportError:
+        return None
+
+    def convert_phrase(match):
+        phrase = match.group(0)
+        try:
+            if any(word in phrase.lower().split() for word in ORDINAL_WORDS):
+                text_with_hyphens = phrase.lower().replace(' ', '-')
+                for ordinal in ORDINAL_WORDS:
+                    if text_with_hyphens.endswith(f"-{ordinal}"):
+                        try:
+                            num = w2n.word_to_num(text_with_hyphens[:-(len(ordinal) + 1)].replace('-', ' '))
+                            return f"{num}{ordinal_suffix(num)}"
+                        except ValueError:
+                            return phrase
+                if phrase.lower() in ORDINAL_WORDS:
+                    word = phrase.lower()
+                    if word in ('first', 'second', 'third'):
+                        return {'first': '1st', 'second': '2nd', 'third': '3rd'}[word]
+                    try:
+                        num = w2n.word_to_num(word[:-2] if word.endswith('th') else word)
+                        return f"{num}{ordinal_suffix(num)}"
+                    except ValueError:
+                        return phrase
+            else:
+                try:
+                    return str(w2n.word_to_num(phrase))
+                except ValueError:
+                    return phrase
+        except (ValueError, AttributeError):
+            return phrase
+
+    words = ('a|one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|thirteen|fourteen|'
+             'fifteen|sixteen|seventeen|eighteen|nineteen|twenty|thirty|forty|fifty|sixty|seventy|'
+             'eighty|ninety|hundred|thousand|million|billion|trillion|' + '|'.join(sorted(ORDINAL_WORDS)))
+    phrase_pattern = re.compile(
+        rf'\b(?:{words}|millionth|billionth|trillionth)(?:-[a-zA-Z]+)?(?:\s+(?:{words})(?:-[a-zA-Z]+)?)*\b',
+        flags=re.IGNORECASE
+    )
+
+    def convert(text):
+        text = phrase_pattern.sub(convert_phrase, text)
+        text = re.sub(r'the (\d+) day', lambda m: f"the {m.group(1)}{ordinal_suffix(int(m.group(1)))} day", text)
+        return re.sub(r'(\d+) century', lambda m: f"{m.group(1)}{ordinal_suffix(int(m.group(1)))} century", text)
+
+    return convert
+
+def main():
+    failures = [(text, expected, convert_number_words(text)) for text, expected in NUMBER_CASES
+                if convert_number_words(text) != expected]
+    for text, expected, actual in failures:
+        print(f"FAIL {text!r}: expected {expected!r}, got {actual!r}")
+    print(f"conformance: {len(NUMBER_CASES) - len(failures)}/{len(NUMBER_CASES)} cases pass")
+    if failures:
+        sys.exit(1)
+
+    legacy = w2n_converter()
+    if legacy is None:
+        print("word2number is not installed; skipping the w2n comparison")
+        return
+    disagreements = sum(legacy(text) != expected for text, expected in NUMBER_CASES)
+    print(f"w2n converter disagrees with the corpus on {disagreements} cases")
+
+    page = ENGLISH_SEGMENTS * 10
+    repeat = 50
+    w2n_time = timeit.timeit(lambda: [legacy(s) for s in page], number=repeat) / repeat
+    parser_time = timeit.timeit(lambda: [convert_number_words(s) for s in page], number=repeat) / repeat
+    print(f"{'w2n':>8} {w2n_time * 1000:>8.2f} ms/page")
+    print(f"{'parser':>8} {parser_time * 1000:>8.2f} ms/page ({w2n_time / parser_time:.1f}x)")
+
+if __name__ == '__main__':
+    main()
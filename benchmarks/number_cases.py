@@ -0,0 +1,96 @@
+"""Conformance corpus for utils.numbers.convert_number_words.
+
+Each case is (input, expected output). tests/test_numbers.py runs every case
+under pytest, and `python -m benchmarks.bench_numbers` checks them again
+before timing anything.
+"""
+
+NUMBER_CASES = [
+    # Cardinals
+    ("four", "4"),
+    ("Five", "5"),
+    ("twelve", "12"),
+    ("forty-two", "42"),
+    ("ninety nine", "99"),
+    ("twelve hundred", "1200"),
+    ("three hundred", "300"),
+    ("a hundred and twenty", "120"),
+    ("one hundred blessings", "100 blessings"),
+    ("two hundred and fifty", "250"),
+    ("a hundred and fifty-three fish", "153 fish"),
+    ("a thousand years", "1000 years"),
+    ("two thousand and twenty", "2020"),
+    ("Two Thousand Three Hundred Forty-Five", "2345"),
+    ("three million", "3000000"),
+    ("thousand", "1000"),
+
+    # "one", "two", "three" and "a" only count as part of a larger number
+    ("a", "a"),
+    ("one of them", "one of them"),
+    ("two of the Sages", "two of the Sages"),
+    ("three watches", "three watches"),
+    ("one two three", "one two three"),
+    ("twenty-three", "23"),
+    ("thirty three", "33"),
+
+    # Ordinals
+    ("first", "1st"),
+    ("second", "2nd"),
+    ("third", "3rd"),
+    ("eleventh", "11th"),
+    ("twelfth", "12th"),
+    ("twenty-first", "21st"),
+    ("twenty-second", "22nd"),
+    ("ninety-third", "93rd"),
+    ("hundredth", "100th"),
+    ("three hundredth", "300th"),
+    ("one hundred and first", "101st"),
+    ("one thousand and first", "1001st"),
+    ("a first", "a 1st"),
+    ("a second time", "a 2nd time"),
+
+    # Words that end a number are kept as they are
+    ("five and six", "5 and 6"),
+    ("five a day", "5 a day"),
+    ("a hundred and", "100 and"),
+    ("seven and a half", "7 and a half"),
+    ("twenty and", "20 and"),
+    ("bread and butter", "bread and butter"),
+    ("first-born", "first-born"),
+    ("the first-born", "the first-born"),
+    ("one-third", "one-third"),
+    ("another", "another"),
+    ("often", "often"),
+    ("seventeen", "17"),
+    ("someone", "someone"),
+
+    # "the N day" and "N century" take an ordinal suffix
+    ("the seventh day", "the 7th day"),
+    ("the twenty day", "the 20th day"),
+    ("the 5 day", "the 5th day"),
+    ("the 11 day", "the 11th day"),
+    ("the 12 day", "the 12th day"),
+    ("the 13 day", "the 13th day"),
+    ("the 112 day", "the 112th day"),
+    ("the hundred and twentieth day", "the 120th day"),
+    ("bathe 5 day", "bathe 5th day"),
+    ("twenty day", "20 day"),
+    ("The seventh day", "The 7th day"),
+    ("the 1 Day", "the 1 Day"),
+    ("the five a day", "the 5 a day"),
+    ("5 century", "5th century"),
+    ("twenty century", "20th century"),
+    ("twenty-first century", "21st century"),
+    ("a twenty century", "a 20th century"),
+    ("the 21 century", "the 21st century"),
+
+    # Whole sentences
+    ("Rav said: A hundred and twenty elders instituted the eighteen blessings.",
+     "Rav said: 120 elders instituted the 18 blessings."),
+    ("Forty days and forty nights you shall remain on the mountain.",
+     "40 days and 40 nights you shall remain on the mountain."),
+    ("On the third day of the week one of the Sages went out.",
+     "On the 3rd day of the week one of the Sages went out."),
+    ("In the fifth century of the sixth millennium.",
+     "In the 5th century of the 6th millennium."),
+]
@@ -0,0 +1,24 @@
+"""Sample daf text used by the benchmarks.
+
+The segments follow the shape of Sefaria's William Davidson edition of
+Berakhot 2a: vocalized Hebrew/Aramaic, and an English translation with
+interpolated explanation.
+"""
+
+HEBREW_SEGMENTS = [
+    "מֵאֵימָתַי קוֹרִין אֶת שְׁמַע בְּעַרְבִין? מִשָּׁעָה שֶׁהַכֹּהֲנִים נִכְנָסִים לֶאֱכוֹל בִּתְרוּמָתָן, עַד סוֹף הָאַשְׁמוּרָה הָרִאשׁוֹנָה, דִּבְרֵי רַבִּי אֱלִיעֶזֶר. וַחֲכָמִים אוֹמְרִים: עַד חֲצוֹת. רַבָּן גַּמְלִיאֵל אוֹמֵר: עַד שֶׁיַּעֲלֶה עַמּוּד הַשַּׁחַר.",
+    "מַעֲשֶׂה וּבָאוּ בָנָיו מִבֵּית הַמִּשְׁתֶּה, אָמְרוּ לוֹ: לֹא קָרִינוּ אֶת שְׁמַע. אָמַר לָהֶם: אִם לֹא עָלָה עַמּוּד הַשַּׁחַר — חַיָּיבִין אַתֶּם לִקְרוֹת.",
+    "גְּמָ׳ תַּנָּא הֵיכָא קָאֵי דְּקָתָנֵי ״מֵאֵימָתַי״? וְתוּ, מַאי שְׁנָא דְּתָנֵי בְּעַרְבִית בְּרֵישָׁא? לִתְנֵי דְשַׁחֲרִית בְּרֵישָׁא!",
+    "תַּנָּא אַקְּרָא קָאֵי, דִּכְתִיב: ״בְּשׇׁכְבְּךָ וּבְקוּמֶךָ״, וְהָכִי קָתָנֵי: זְמַן קְרִיאַת שְׁמַע דִּשְׁכִיבָה אֵימַת — מִשָּׁעָה שֶׁהַכֹּהֲנִים נִכְנָסִין לֶאֱכוֹל בִּתְרוּמָתָן.",
+    "וְאִי בָּעֵית אֵימָא: יָלֵיף מִבְּרִיָּיתוֹ שֶׁל עוֹלָם, דִּכְתִיב: ״וַיְהִי עֶרֶב וַיְהִי בֹקֶר יוֹם אֶחָד״. אִי הָכִי, סֵיפָא דְּקָתָנֵי: ״בַּשַּׁחַר מְבָרֵךְ שְׁתַּיִם לְפָנֶיהָ וְאַחַת לְאַחֲרֶיהָ״.",
+    "אָמַר רַבִּי יְהוֹשֻׁעַ בֶּן לֵוִי: שְׁלֹשָׁה מִשְׁמָרוֹת הָוֵי הַלַּיְלָה, וְעַל כׇּל מִשְׁמָר וּמִשְׁמָר יוֹשֵׁב הַקָּדוֹשׁ בָּרוּךְ הוּא וְשׁוֹאֵג כַּאֲרִי.",
+]
+
+ENGLISH_SEGMENTS = [
+    "MISHNA: From when may one recite Shema in the evening? From the time when the priests enter to partake of their teruma. Until when does the time for the recitation of the evening Shema extend? Until the end of the first watch. This is the statement of Rabbi Eliezer. And the Rabbis say: The time for the recitation of the evening Shema is until midnight. Rabban Gamliel says: Until dawn.",
+    "There was an incident where Rabban Gamliel's sons returned very late from a wedding hall. They said to him: We did not recite Shema. He said to them: If the dawn has not yet arrived, you are obligated to recite Shema. And not only with regard to the recitation of Shema did the Rabbis say until midnight, but the mitzva of burning fats and limbs may be performed until dawn.",
+    "GEMARA: The Gemara begins by clarifying the tanna's basis: On what basis does the tanna stand when he teaches: From when? It seems that the obligation to recite Shema was already established, and the tanna seeks only to clarify the details. The Sages taught in a baraita that a gentile who studies Torah is compared to a High Priest.",
+    "Rabbi Yehoshua ben Levi said: The night consists of three watches, and over each and every watch the Holy One, Blessed be He, sits and roars like a lion. The Divine Voice went forth and said: Woe to the children, due to whose sins I destroyed My house. The Lord said to Moses on the seventh day: Forty days and forty nights you shall remain on the mountain.",
+    "Rabbi Eliezer says: The night consists of three watches. Rav said: A hundred and twenty elders, and among them several prophets, instituted the eighteen blessings. The twenty-first generation was compared to the first generation, and the leper who enters a house renders it impure. A maidservant brought a barrel of wine, and an ignoramus asked about the phylacteries.",
+    "The Gemara asks: And in the fifth century of the sixth millennium, did the Divine Presence rest upon the Second Temple? It was taught in a baraita: Rabbi Meir says that one hundred blessings must be recited each day, and the Sages say two hundred and fifty. On the third day of the week the ignorant were sent out to gather divine inspiration.",
+]
@@ -94,6 +94,7 @@ document.addEventListener('DOMContentLoaded', function() {
         const splitSentences = document.getElementById('splitSentences').checked;
         const includeAdjacent = document.getElementById('includeAdjacent').checked;
         const adjacentPages = includeAdjacent ? parseInt(document.getElementById('adjacentPages').value, 10) : 0;
+        const pages = [];
 
         // Make API request
         fetch('/api/get_text', {
@@ -108,25 +109,33 @@ document.addEventListener('DOMContentLoaded', function() {
                 standardize_terms: standardizeTerms,
                 split_sentences: splitSentences,
                 include_adjacent: includeAdjacent,
-                adjacent_pages: adjacentPages
+                adjacent_pages: adjacentPages,
+                stream: true
             }),
         })
-        .then(response => response.json())
-        .then(data => {
-            // Reset loading state
-            submitBtn.disabled = false;
-            submitSpinner.classList.add('d-none');
-
-            // Display results or error
-            if (data.success) {
-                displayResults(data.content);
-            } else {
-                resultsContent.innerHTML = `
+        .then(response => readEvents(response, event => {
+            if (event.event === 'page') {
+                // Pages arrive as they are ready, current page first; keep them in display order
+                pages.push(event.page);
+                pages.sort((a, b) => a.position - b.position);
+                displayResults(pages);
+            } else if (event.event === 'error') {
+                const alertHtml = `
                     <div class="alert alert-danger">
-                        Error: ${data.message || 'Failed to retrieve text from Sefaria.'}
+                        Error: ${event.message || 'Failed to retrieve text from Sefaria.'}
                     </div>
                 `;
+                if (pages.length > 0) {
+                    resultsContent.insertAdjacentHTML('beforeend', alertHtml);
+                } else {
+                    resultsContent.innerHTML = alertHtml;
+                }
             }
+        }))
+        .then(() => {
+            // Reset loading state once every page has arrived
+            submitBtn.disabled = false;
+            submitSpinner.classList.add('d-none');
         })
         .catch(error => {
             console.error('Error:', error);
@@ -140,6 +149,24 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
+    // Read a newline-delimited JSON response, calling onEvent for each line as soon as it arrives
+    function readEvents(response, onEvent) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        function read() {
+            return reader.read().then(({ done, value }) => {
+                buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+                const lines = buffer.split('\n');
+                buffer = done ? '' : lines.pop();
+                lines.filter(line => line.trim()).forEach(line => onEvent(JSON.parse(line)));
+                return done ? undefined : read();
+            });
+        }
+        return read();
+    }
+
     function displayResults(content) {
         if (!content || content.length === 0) {
             resultsContent.innerHTML = `
@@ -0,0 +1,66 @@
+import os
+import sys
+
+import pytest
+
+# Tests never touch the persistent response cache or the network
+os.environ.setdefault('SEFARIA_CACHE', '0')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.samples import ENGLISH_SEGMENTS, HEBREW_SEGMENTS  # noqa: E402
+
+def sefaria_page(ref):
+    """A Sefaria texts response for one page, in the shape of the William Davidson edition."""
+    return {
+        'ref': ref,
+        'he': HEBREW_SEGMENTS[:2],
+        'text': [f"{ref}: {segment}" for segment in ENGLISH_SEGMENTS[:2]],
+    }
+
+class FakeSefaria:
+    """Answers Sefaria lookups from sefaria_page; `requested` records each reference asked for.
+
+    lookup stands in for _query_sefaria, so it returns (data, source) and
+    reports every page as fetched upstream.
+    """
+
+    page = staticmethod(sefaria_page)
+
+    def __init__(self):
+        self.requested = []
+        self.missing = set()
+
+    def lookup(self, ref, language):
+        from utils.sefaria_api import SOURCE_UPSTREAM, expand_range, parse_range_ref
+
+        self.requested.append(ref)
+        page_range = parse_range_ref(ref)
+        refs = expand_range(*page_range) if page_range else [ref]
+        if all(page_ref in self.missing for page_ref in refs):
+            return None, SOURCE_UPSTREAM
+        if not page_range:
+            return sefaria_page(ref), SOURCE_UPSTREAM
+        pages = [{'he': [], 'text': []} if page_ref in self.missing else sefaria_page(page_ref) for page_ref in refs]
+        return {'ref': ref, 'isSpanning': True,
+                'he': [page['he'] for page in pages], 'text': [page['text'] for page in pages]}, SOURCE_UPSTREAM
+
+    async def lookup_async(self, ref, language):
+        return self.lookup(ref, language)
+
+@pytest.fixture
+def sefaria(monkeypatch):
+    """Serve every page from fixtures (sync and async paths), with empty page caches."""
+    from utils import async_api, sefaria_api
+    from utils.page_cache import page_cache, raw_cache
+
+    fake = FakeSefaria()
+    page_cache.clear()
+    raw_cache.clear()
+    for module in (sefaria_api, async_api):
+        monkeypatch.setattr(module, 'SEFARIA_MODE', 'online')
+    monkeypatch.setattr(sefaria_api, '_query_sefaria', fake.lookup)
+    monkeypatch.setattr(async_api, '_query_sefaria_async', fake.lookup_async)
+    yield fake
+    page_cache.clear()
+    raw_cache.clear()
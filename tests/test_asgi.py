@@ -0,0 +1,169 @@
+import asyncio
+import gzip
+import json
+import threading
+
+import pytest
+
+import asgi
+from utils import async_api
+from utils.async_api import collect_pages_async, iter_page_events_async
+
+def call(method, path, body=b'', headers=()):
+    """Run one request through asgi.app; returns (status, headers, body chunks)."""
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': method, 'path': path, 'headers': list(headers)}
+    asyncio.run(asgi.app(scope, receive, send))
+    start, chunks = sent[0], [message['body'] for message in sent[1:]]
+    assert not sent[-1].get('more_body')
+    return start['status'], dict(start['headers']), chunks
+
+def post(data, headers=()):
+    return call('POST', '/api/get_text', json.dumps(data).encode(), headers)
+
+def test_get_text(sefaria):
+    status, headers, chunks = post({'reference': 'Berakhot 2a', 'include_adjacent': True, 'adjacent_pages': 1})
+    assert status == 200 and headers[b'content-type'] == b'application/json'
+    result = json.loads(b''.join(chunks))
+    assert [entry['title'] for entry in result['content']] == [
+        'Current Page (Berakhot.2a)', 'Next Page (Berakhot.2b)'
+    ]
+
+def test_matches_the_threaded_core(sefaria):
+    from utils import core
+
+    data = {'reference': 'Berakhot 3a-3b', 'include_adjacent': True, 'adjacent_pages': 1, 'terminology': 'traditional'}
+    expected = json.loads(core.get_text(data).body)
+    # The second request is served from the page cache, so only compare the text
+    for entry in expected['content']:
+        del entry['source']
+    result = json.loads(b''.join(post(data)[2]))
+    for entry in result['content']:
+        del entry['source']
+    assert result == expected
+
+def test_stream(sefaria):
+    status, headers, chunks = post({'reference': 'Berakhot 2a', 'stream': True, 'include_adjacent': True,
+                                    'adjacent_pages': 1})
+    assert headers[b'content-type'] == b'application/x-ndjson'
+    events = [json.loads(chunk) for chunk in chunks if chunk]
+    assert [event['event'] for event in events] == ['page', 'page', 'done']
+    assert events[0]['page']['title'] == 'Current Page (Berakhot.2a)'
+
+def test_stream_gzip(sefaria):
+    _, headers, chunks = post({'reference': 'Berakhot 2a', 'stream': True}, [(b'accept-encoding', b'gzip')])
+    assert headers[b'content-encoding'] == b'gzip'
+    assert [json.loads(line)['event'] for line in gzip.decompress(b''.join(chunks)).splitlines()] == ['page', 'done']
+
+def test_stream_error(sefaria):
+    _, _, chunks = post({'reference': 'Berakhot 70a', 'stream': True})
+    [event] = [json.loads(chunk) for chunk in chunks if chunk]
+    assert event['event'] == 'error' and 'does not exist' in event['message']
+
+@pytest.mark.parametrize('body', [b'{', b'[1, 2]', b'"x"', b'null'])
+def test_invalid_body(body):
+    status, headers, chunks = call('POST', '/api/get_text', body)
+    assert status == 400 and headers[b'content-type'] == b'application/json'
+    assert json.loads(b''.join(chunks)) == {'success': False, 'message': 'Invalid JSON body', 'content': []}
+
+def test_routes():
+    assert call('GET', '/api/cache_stats')[0] == 200
+    assert call('GET', '/api/get_text')[0] == 404
+
+def test_lifespan():
+    messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message['type'])
+
+    asyncio.run(asgi.app({'type': 'lifespan'}, receive, send))
+    assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+
+def test_async_fetches_are_coalesced(sefaria):
+    async def main():
+        return await asyncio.gather(*(collect_pages_async('Berakhot 5a') for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert all(result == results[0] for result in results)
+    assert sefaria.requested == ['Berakhot.5a']
+
+def test_async_range_reuses_cached_pages(sefaria):
+    process = lambda data: data['text']
+    asyncio.run(collect_pages_async('Berakhot 3a-4a', process=process, options=('text',)))
+    sefaria.requested.clear()
+
+    entries = asyncio.run(collect_pages_async('Berakhot 3a-4a', process=lambda data: data['he'], options=('he',)))
+    assert [entry['source'] for entry in entries] == ['raw-cache'] * 3
+    assert sefaria.requested == []
+
+def test_async_range_formats_cached_pages_off_the_loop(sefaria, monkeypatch):
+    threads = []
+    cached_range_pages = async_api.cached_range_pages
+
+    def recording(*args):
+        threads.append(threading.current_thread())
+        return cached_range_pages(*args)
+    monkeypatch.setattr(async_api, 'cached_range_pages', recording)
+
+    asyncio.run(collect_pages_async('Berakhot 3a-4a', process=lambda data: data['text'], options=('text',)))
+    assert threads and threading.main_thread() not in threads
+
+@pytest.mark.parametrize('reference, last', [('Berakhot 2a', 'done'), ('Berakhot 70a', 'error')])
+def test_async_events(sefaria, reference, last):
+    async def main():
+        return [event async for event in iter_page_events_async(reference)]
+
+    assert asyncio.run(main())[-1]['event'] == last
+
+def test_async_stale_entry_served_on_error_status(monkeypatch, tmp_path):
+    from utils.response_cache import ResponseCache, cache_key
+
+    cache = ResponseCache(str(tmp_path / 'responses.db'), ttl=0)
+    cache.put(cache_key('Berakhot.2a', 'all'), {'he': ['א'], 'text': ['a']}, etag='"v1"')
+    monkeypatch.setattr(async_api, 'SEFARIA_MODE', 'online')
+    monkeypatch.setattr(async_api, 'response_cache', cache)
+
+    async def fetch_text_async(ref, language, etag=None, last_modified=None):
+        assert etag == '"v1"'
+        return 503, None, None, None
+    monkeypatch.setattr(async_api, 'fetch_text_async', fetch_text_async)
+
+    assert asyncio.run(async_api._query_sefaria_async('Berakhot.2a', 'all')) == (
+        {'he': ['א'], 'text': ['a']}, 'response-cache'
+    )
+
+def test_async_client_retries_transient_errors():
+    import httpx
+
+    from utils.async_client import AsyncSefariaClient
+
+    statuses = [503, 429, 200]
+    requested = []
+
+    def respond(request):
+        requested.append(str(request.url))
+        return httpx.Response(statuses.pop(0), json={'ref': 'Berakhot.2a'})
+
+    async def main():
+        client = AsyncSefariaClient('https://sefaria.test', backoff_factor=0)
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+        try:
+            return await client.get('/api/texts/Berakhot.2a', params={'context': 0})
+        finally:
+            await client.aclose()
+
+    response = asyncio.run(main())
+    assert response.status_code == 200
+    assert requested == ['https://sefaria.test/api/texts/Berakhot.2a?context=0'] * 3
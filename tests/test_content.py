@@ -0,0 +1,101 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils import content
+from utils.content import collect_pages, iter_page_events, iter_pages, ndjson_lines, plan_pages
+from utils.encoding import dumps
+
+def titles(entries):
+    return [entry['title'] for entry in entries]
+
+def test_plan_pages_orders_slots():
+    page_range, slots = plan_pages('Berakhot 3a-3b', 1)
+    assert page_range == ('Berakhot.3a', 'Berakhot.3b')
+    assert [(slot.ref, slot.current) for slot in slots] == [
+        ('Berakhot.2b', False), ('Berakhot.3a', True), ('Berakhot.3b', True), ('Berakhot.4a', False)
+    ]
+
+def test_requested_page_comes_first(sefaria):
+    entries = list(iter_pages('Berakhot 3a', adjacent_pages=2))
+    assert entries[0]['title'] == 'Current Page (Berakhot.3a)'
+    assert 'reference' not in entries[0]
+    assert sorted(entry['position'] for entry in entries) == [0, 1, 2, 3, 4]
+
+def test_collect_pages_in_display_order(sefaria):
+    entries = collect_pages('Berakhot 3a', adjacent_pages=2)
+    assert titles(entries) == [
+        'Previous Page (Berakhot.2a)', 'Previous Page (Berakhot.2b)', 'Current Page (Berakhot.3a)',
+        'Next Page (Berakhot.3b)', 'Next Page (Berakhot.4a)',
+    ]
+    assert entries[0]['reference'] == 'Berakhot.2a'
+    assert all('position' not in entry and entry['source'] == 'upstream' for entry in entries)
+
+def test_range_with_adjacent_pages(sefaria):
+    entries = collect_pages('Berakhot 3a-3b', adjacent_pages=1)
+    assert [entry['reference'] for entry in entries] == ['Berakhot.2b', 'Berakhot.3a', 'Berakhot.3b', 'Berakhot.4a']
+    assert 'Berakhot.3a-3b' in sefaria.requested
+
+def test_missing_pages(sefaria):
+    sefaria.missing.update({'Berakhot.2b', 'Berakhot.5a'})
+    assert collect_pages('Berakhot 5a', adjacent_pages=1) is None
+    assert titles(collect_pages('Berakhot 3a', adjacent_pages=1)) == [
+        'Current Page (Berakhot.3a)', 'Next Page (Berakhot.3b)'
+    ]
+
+def test_closing_the_stream_cancels_pending_pages(sefaria, monkeypatch):
+    # One worker, blocked on the first adjacent page: the others stay queued
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(content, 'fetch_executor', executor)
+    release = threading.Event()
+    lookup = sefaria.lookup
+
+    def slow_lookup(ref, language):
+        if ref != 'Berakhot.10a':
+            release.wait(5)
+        return lookup(ref, language)
+    monkeypatch.setattr('utils.sefaria_api._query_sefaria', slow_lookup)
+
+    pages = iter_pages('Berakhot 10a', adjacent_pages=3)
+    assert next(pages)['title'] == 'Current Page (Berakhot.10a)'
+    pages.close()
+    release.set()
+    executor.shutdown(wait=True)
+    # The current page and at most the adjacent page already running
+    assert len(sefaria.requested) <= 2
+
+def test_stream_events(sefaria):
+    events = list(iter_page_events('Berakhot 3a', adjacent_pages=1))
+    assert [event['event'] for event in events] == ['page', 'page', 'page', 'done']
+    assert events[0]['page']['title'] == 'Current Page (Berakhot.3a)'
+    assert events[-1] == {'event': 'done', 'pages': 3}
+
+@pytest.mark.parametrize('reference, message', [
+    ('Berakhot 70a', 'Error: Berakhot 70a does not exist'),
+    ('Nowhere 2a', 'No data found for reference: Nowhere 2a'),
+])
+def test_stream_errors(sefaria, reference, message):
+    sefaria.missing.add('Nowhere 2a')
+    events = list(iter_page_events(reference))
+    assert len(events) == 1 and events[0]['event'] == 'error'
+    assert events[0]['message'].startswith(message)
+
+def test_ndjson_lines():
+    lines = list(ndjson_lines([{'event': 'page', 'page': {'title': 'א'}}, {'event': 'done', 'pages': 1}]))
+    assert all(line.endswith(b'\n') and line.count(b'\n') == 1 for line in lines)
+    assert json.loads(lines[0]) == {'event': 'page', 'page': {'title': 'א'}}
+    assert lines[1] == dumps({'event': 'done', 'pages': 1}) + b'\n'
+
+def test_adjacent_pages_are_clamped(sefaria, monkeypatch):
+    monkeypatch.setattr(content, 'MAX_ADJACENT_PAGES', 2)
+    _, slots = plan_pages('Berakhot 10a', 1000)
+    assert [slot.ref for slot in slots] == ['Berakhot.9a', 'Berakhot.9b', 'Berakhot.10a', 'Berakhot.10b', 'Berakhot.11a']
+
+    collect_pages('Berakhot 10a', adjacent_pages=1000)
+    assert len(sefaria.requested) == 5
+
+def test_adjacent_pages_stop_at_the_tractate_bounds():
+    _, slots = plan_pages('Berakhot 2b', 5)
+    assert [slot.ref for slot in slots][:2] == ['Berakhot.2a', 'Berakhot.2b']
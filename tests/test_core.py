@@ -0,0 +1,133 @@
+import contextlib
+import gzip
+import http.server
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import handler
+from utils import core
+from utils.pipeline import process_sefaria_data
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@contextlib.contextmanager
+def vercel_server(name):
+    """Serve the handler class of api/<name>.py on a local port; yields its URL."""
+    spec = importlib.util.spec_from_file_location(f'vercel_{name}', os.path.join(ROOT, 'api', f'{name}.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    server = http.server.HTTPServer(('127.0.0.1', 0), module.handler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}/api/{name}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_parse_text_query_defaults():
+    query = core.parse_text_query({'reference': 'Berakhot 2a', 'adjacent_pages': 3})
+    assert query == core.TextQuery('Berakhot 2a', 'all', True, True, True, None, 0, False, None)
+    assert core.parse_text_query({'include_adjacent': True, 'adjacent_pages': 3}).adjacent_pages == 3
+
+def test_get_text(sefaria):
+    reply = core.get_text({'reference': 'Berakhot 2a'})
+    assert reply.lines is None
+    assert reply.headers['Content-Type'] == 'application/json'
+    result = json.loads(reply.body)
+    assert result['success'] and result['message'] == ''
+    assert result['content'][0]['sections'] == process_sefaria_data(sefaria.page('Berakhot.2a'), True, True, True)
+    assert result['content'][0]['source'] == 'upstream'
+
+def test_get_text_gzip(sefaria):
+    reply = core.get_text({'reference': 'Berakhot 2a', 'include_adjacent': True, 'adjacent_pages': 1},
+                          accept_encoding='gzip')
+    assert reply.headers['Content-Encoding'] == 'gzip'
+    assert reply.headers['Vary'] == 'Accept-Encoding'
+    assert len(json.loads(gzip.decompress(reply.body))['content']) == 2
+
+def test_get_text_compact(sefaria):
+    result = json.loads(core.get_text({'reference': 'Berakhot 2a', 'format': 'compact'}).body)
+    assert result['format'] == 'compact'
+    assert result['content'][0]['sections']['number'] == [1, 2]
+
+def test_get_text_stream(sefaria):
+    reply = core.get_text({'reference': 'Berakhot 2a', 'stream': True, 'include_adjacent': True, 'adjacent_pages': 1})
+    assert reply.body is None and reply.headers['Content-Type'] == 'application/x-ndjson'
+    events = [json.loads(line) for line in reply.lines]
+    assert [event['event'] for event in events] == ['page', 'page', 'done']
+
+def test_get_text_stream_gzip(sefaria):
+    reply = core.get_text({'reference': 'Berakhot 2a', 'stream': True}, accept_encoding='gzip')
+    assert reply.headers['Content-Encoding'] == 'gzip'
+    lines = gzip.decompress(b''.join(reply.lines)).splitlines()
+    assert [json.loads(line)['event'] for line in lines] == ['page', 'done']
+
+@pytest.mark.parametrize('data, message', [
+    ({'reference': 'Berakhot 70a'}, 'Error: Berakhot 70a does not exist'),
+    ({'reference': 'Berakhot 2a', 'terminology': 'modern'}, 'Error: Unknown terminology profile: modern'),
+    ({'reference': 'Nowhere 2a'}, 'No data found for reference: Nowhere 2a'),
+])
+def test_get_text_errors(sefaria, data, message):
+    sefaria.missing.add('Nowhere 2a')
+    result = json.loads(core.get_text(data).body)
+    assert not result['success'] and result['content'] == []
+    assert result['message'].startswith(message)
+
+    events = [json.loads(line) for line in core.get_text(dict(data, stream=True)).lines]
+    assert events[-1]['event'] == 'error' and events[-1]['message'].startswith(message)
+
+def test_lambda_handler(sefaria):
+    response = handler.get_text({'body': json.dumps({'reference': 'Berakhot 2a'})}, None)
+    assert response['statusCode'] == 200 and not response['isBase64Encoded']
+    assert response['headers']['Access-Control-Allow-Origin'] == '*'
+    assert json.loads(response['body'])['success']
+
+    response = handler.get_text({'body': json.dumps({'reference': 'Berakhot 2a', 'stream': True}),
+                                 'headers': {'Accept-Encoding': 'gzip'}}, None)
+    assert response['isBase64Encoded'] and response['headers']['Content-Encoding'] == 'gzip'
+
+@pytest.mark.parametrize('body', ['{', '[1, 2]', '"x"', 'null'])
+def test_adapters_reject_bodies_that_are_not_objects(body):
+    expected = {'success': False, 'message': 'Invalid JSON body', 'content': []}
+    response = handler.get_text({'body': body}, None)
+    assert response['statusCode'] == 400 and json.loads(response['body']) == expected
+
+    from app import app
+    response = app.test_client().post('/api/get_text', data=body, content_type='application/json')
+    assert response.status_code == 400 and response.json == expected
+
+    with vercel_server('get_text') as url:
+        request = urllib.request.Request(url, data=body.encode(), method='POST')
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(request)
+        assert error.value.code == 400 and json.loads(error.value.read()) == expected
+
+def test_flask_app(sefaria):
+    from app import app
+
+    client = app.test_client()
+    response = client.post('/api/get_text', json={'reference': 'Berakhot 2a', 'stream': True})
+    assert response.status_code == 200
+    assert [json.loads(line)['event'] for line in response.data.splitlines()] == ['page', 'done']
+    assert client.get('/api/cache_stats').json['misses'] >= 1
+
+@pytest.mark.parametrize('directory, module', [('.', 'handler'), ('api', 'get_text'), ('api', 'text')])
+def test_importing_an_entry_point_loads_no_fetch_or_formatting_modules(directory, module):
+    code = (
+        f"import sys, {module}\n"
+        "heavy = ['requests', 'orjson', 'utils.sefaria_api', 'utils.http_cache', 'utils.pipeline', 'utils.formatter']\n"
+        "print([name for name in heavy if name in sys.modules])\n"
+    )
+    env = dict(os.environ, CORE_PRELOAD='0')
+    output = subprocess.run([sys.executable, '-c', code], cwd=os.path.join(ROOT, directory), env=env,
+                            capture_output=True, text=True, check=True).stdout
+    assert output.strip() == '[]'
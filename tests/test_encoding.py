@@ -0,0 +1,89 @@
+import base64
+import gzip
+import json
+import zlib
+
+import pytest
+
+from utils import encoding
+from utils.encoding import (
+    LineCompressor, compact_page, dumps, encode_lines, encode_response, format_result, lambda_body,
+    negotiate_encoding, stream_headers
+)
+
+RESULT = {'success': True, 'message': '', 'content': [{
+    'title': 'Current Page (Berakhot.2a)',
+    'sections': [
+        {'number': 1, 'hebrew': ['מאימתי קורין את שמע'], 'english': ['From when may one recite Shema?']},
+        {'number': 2, 'hebrew': ['ומעשה'], 'english': ['There was an incident.']},
+    ],
+}]}
+
+def test_dumps_with_and_without_orjson(monkeypatch):
+    body = dumps(RESULT)
+    assert json.loads(body) == RESULT
+    assert 'מאימתי'.encode('utf-8') in body
+    monkeypatch.setattr(encoding, 'orjson', None)
+    assert dumps(RESULT) == body
+
+def test_compact_page():
+    page = compact_page(RESULT['content'][0])
+    assert page['sections'] == {
+        'number': [1, 2],
+        'hebrew': [['מאימתי קורין את שמע'], ['ומעשה']],
+        'english': [['From when may one recite Shema?'], ['There was an incident.']],
+    }
+    hebrew_only = compact_page({'sections': [{'number': 1, 'hebrew': ['א']}]})
+    assert hebrew_only['sections'] == {'number': [1], 'hebrew': [['א']]}
+
+def test_format_result():
+    assert format_result(RESULT) is RESULT
+    assert format_result(RESULT, 'compact')['format'] == 'compact'
+    empty = {'success': False, 'message': 'No data', 'content': []}
+    assert format_result(empty, 'compact') is empty
+
+@pytest.mark.parametrize('accept_encoding, expected', [
+    (None, None),
+    ('', None),
+    ('gzip', 'gzip'),
+    ('deflate, gzip;q=0.5', 'gzip'),
+    ('gzip;q=0', None),
+    ('identity', None),
+    ('*', 'gzip'),
+    ('*, gzip;q=0', None),
+])
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding, offers=('gzip',)) == expected
+
+def test_encode_response(monkeypatch):
+    monkeypatch.setattr(encoding, 'COMPRESS_MIN_BYTES', 10)
+    body, headers = encode_response(RESULT, 'gzip')
+    assert headers == {'Content-Type': 'application/json', 'Vary': 'Accept-Encoding', 'Content-Encoding': 'gzip'}
+    assert json.loads(gzip.decompress(body)) == RESULT
+
+    body, headers = encode_response(RESULT, None)
+    assert 'Content-Encoding' not in headers and json.loads(body) == RESULT
+
+    monkeypatch.setattr(encoding, 'COMPRESS_MIN_BYTES', 10 ** 6)
+    assert 'Content-Encoding' not in encode_response(RESULT, 'gzip')[1]
+
+def test_each_line_decodes_as_soon_as_it_is_sent():
+    compressor = LineCompressor()
+    decompressor = zlib.decompressobj(31)
+    lines = [b'{"event": "page"}\n', b'{"event": "done"}\n']
+    for line in lines:
+        assert decompressor.decompress(compressor.compress(line)) == line
+
+def test_encode_lines():
+    lines = [b'one\n', b'two\n']
+    assert list(encode_lines(iter(lines), stream_headers(None))) == lines
+    headers = stream_headers('gzip, br')
+    assert headers['Content-Encoding'] == 'gzip' and headers['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(b''.join(encode_lines(iter(lines), headers))) == b''.join(lines)
+
+def test_lambda_body():
+    assert lambda_body('א'.encode('utf-8'), {}) == {'body': 'א', 'isBase64Encoded': False}
+    compressed = gzip.compress(b'{}')
+    assert lambda_body(compressed, {'Content-Encoding': 'gzip'}) == {
+        'body': base64.b64encode(compressed).decode('ascii'), 'isBase64Encoded': True
+    }
@@ -0,0 +1,29 @@
+from utils.glossary import GlossaryMatcher, load_glossary
+
+def test_whole_words_only():
+    matcher = GlossaryMatcher({'Rav': 'Rabbi'})
+    assert matcher.apply('Rav said to Ravina') == 'Rabbi said to Ravina'
+
+def test_case_insensitive_by_default():
+    assert GlossaryMatcher({'mishna': 'Mishnah'}).apply('The MISHNA teaches') == 'The Mishnah teaches'
+    assert GlossaryMatcher({'mishna': 'Mishnah'}, case_sensitive=True).apply('The MISHNA teaches') == 'The MISHNA teaches'
+
+def test_longest_match_wins():
+    matcher = GlossaryMatcher({'Rabbi': 'R.', 'Rabbi Yehuda': 'R. Judah'})
+    assert matcher.find('Rabbi Yehuda says') == [(0, 12, 'R. Judah')]
+    assert matcher.apply('Rabbi Yehuda and Rabbi Meir') == 'R. Judah and R. Meir'
+
+def test_substrings_when_not_whole_word():
+    assert GlossaryMatcher({'ab': 'X'}, whole_word=False).apply('cabab') == 'cXX'
+
+def test_no_terms():
+    assert GlossaryMatcher({}).apply('unchanged') == 'unchanged'
+
+def test_load_glossary_csv_and_json(tmp_path):
+    csv_path = tmp_path / 'glossary.csv'
+    csv_path.write_text('term,replacement\n# comment\nGemara,Talmud\n', encoding='utf-8')
+    assert load_glossary(str(csv_path)) == {'Gemara': 'Talmud'}
+
+    json_path = tmp_path / 'glossary.json'
+    json_path.write_text('[{"term": "Gemara", "replacement": "Talmud"}]', encoding='utf-8')
+    assert load_glossary(str(json_path)) == {'Gemara': 'Talmud'}
@@ -0,0 +1,45 @@
+import re
+
+import pytest
+
+from benchmarks.samples import HEBREW_SEGMENTS
+from utils.hebrew import HebrewNormalizer
+
+# The regex remove_nikud used before the translate table
+NIKUD_PATTERN = re.compile(r'[\u0591-\u05BD\u05BF\u05C1\u05C2\u05C4\u05C5\u05C7]')
+
+@pytest.mark.parametrize('segment', HEBREW_SEGMENTS)
+def test_default_matches_the_previous_regex(segment):
+    assert HebrewNormalizer(('nikud', 'cantillation')).normalize(segment) == NIKUD_PATTERN.sub('', segment)
+
+def test_batch_matches_each_segment():
+    normalizer = HebrewNormalizer(('nikud', 'cantillation'))
+    assert normalizer.normalize_batch(HEBREW_SEGMENTS) == [normalizer.normalize(s) for s in HEBREW_SEGMENTS]
+
+def test_batch_edge_cases():
+    normalizer = HebrewNormalizer(('nikud',))
+    assert normalizer.normalize_batch([]) == []
+    assert normalizer.normalize_batch(['', 'שָׁלוֹם']) == ['', 'שלום']
+    # A segment holding the batch separator, and one that is not a string
+    assert normalizer.normalize_batch(['אָ\x1fבּ', 'גִ']) == ['א\x1fב', 'ג']
+    assert normalizer.normalize_batch(['אָ', None]) == ['א', None]
+
+def test_classes():
+    text = 'בְּרֵאשִׁ֖ית בָּרָ֣א אֱלֹהִ֑ים אֵ֥ת הַשָּׁמַ֖יִם וְאֵ֥ת הָאָֽרֶץ׃ כׇּל־עַם'
+    assert HebrewNormalizer(('nikud', 'cantillation')).normalize(text) == 'בראשית ברא אלהים את השמים ואת הארץ׃ כל־עם'
+    assert HebrewNormalizer(('nikud', 'cantillation', 'maqaf', 'sof_pasuq')).normalize(text) == \
+        'בראשית ברא אלהים את השמים ואת הארץ כל עם'
+    # Cantillation is kept unless asked for
+    assert '֖' in HebrewNormalizer(('nikud',)).normalize(text)
+
+def test_html():
+    normalizer = HebrewNormalizer(('nikud', 'html'))
+    assert normalizer.normalize('<b>שָׁלוֹם</b> &amp; <i>בְּרָכָה</i>') == 'שלום & ברכה'
+    assert HebrewNormalizer(('nikud',)).normalize('<b>שָׁלוֹם</b>') == '<b>שלום</b>'
+
+def test_text_outside_the_hebrew_block_is_kept():
+    assert HebrewNormalizer().normalize('Rabbi אֱלִיעֶזֶר — “quoted” 😀') == 'Rabbi אליעזר — “quoted” 😀'
+
+def test_unknown_class():
+    with pytest.raises(ValueError, match='Unknown Hebrew mark classes: vowels'):
+        HebrewNormalizer(('vowels',))
@@ -0,0 +1,126 @@
+import base64
+import gzip
+import json
+
+import pytest
+
+from utils import http_cache
+from utils.pipeline import process_sefaria_data
+
+def test_formats_the_page(sefaria):
+    status, headers, body = http_cache.text_response('Berakhot 2a', {})
+    assert status == 200
+    assert headers['Content-Type'] == 'application/json'
+    assert headers['Cache-Control'] == http_cache.TEXT_CACHE_CONTROL
+    assert headers['X-Text-Source'] == 'upstream'
+
+    result = json.loads(body)
+    assert result['success']
+    [entry] = result['content']
+    assert entry == {
+        'title': 'Current Page (Berakhot.2a)',
+        'sections': process_sefaria_data(sefaria.page('Berakhot.2a'), True, True, True),
+    }
+    assert entry['sections'][0]['english'][0] == 'Berakhot.2a:'
+    assert '\u05b8' not in ''.join(entry['sections'][0]['hebrew'])
+
+@pytest.mark.parametrize('args, options', [
+    ({'lang': 'he'}, dict(remove_nikud_marks=True, standardize_terms=True, split_sentences=True, language='he')),
+    ({'nikud': '1', 'split': 'no'}, dict(remove_nikud_marks=False, standardize_terms=True, split_sentences=False)),
+    ({'terms': '0'}, dict(remove_nikud_marks=True, standardize_terms=False, split_sentences=True)),
+])
+def test_query_options(sefaria, args, options):
+    _, _, body = http_cache.text_response('Berakhot 2a', args)
+    assert json.loads(body)['content'][0]['sections'] == process_sefaria_data(sefaria.page('Berakhot.2a'), **options)
+
+def test_terminology_profile(sefaria):
+    _, _, body = http_cache.text_response('Berakhot 2a', {'terms': 'traditional'})
+    _, _, default = http_cache.text_response('Berakhot 2a', {})
+    assert 'Rabbi Eliezer' in body.decode() and "R' Eliezer" in default.decode()
+
+def test_range(sefaria):
+    status, headers, body = http_cache.text_response('Berakhot 2a-2b', {})
+    assert status == 200
+    assert [entry['reference'] for entry in json.loads(body)['content']] == ['Berakhot.2a', 'Berakhot.2b']
+    assert headers['X-Text-Source'] == 'upstream, upstream'
+
+def test_not_modified(sefaria):
+    _, headers, body = http_cache.text_response('Berakhot 2a', {})
+    etag = headers['ETag']
+    assert etag.startswith('"') and etag.endswith('"')
+    for if_none_match in (etag, f'W/{etag}', f'"other", {etag}', '*'):
+        status, not_modified_headers, not_modified_body = http_cache.text_response('Berakhot 2a', {}, if_none_match)
+        assert (status, not_modified_body) == (304, b'')
+        assert not_modified_headers['ETag'] == etag
+
+    # Served from the page cache the second time, with the same ETag
+    status, cached_headers, cached_body = http_cache.text_response('Berakhot 2a', {}, '"other"')
+    assert status == 200 and cached_body == body
+    assert cached_headers['ETag'] == etag and cached_headers['X-Text-Source'] == 'formatted-cache'
+
+def test_etag_depends_on_options(sefaria):
+    _, headers, _ = http_cache.text_response('Berakhot 2a', {})
+    status, other_headers, _ = http_cache.text_response('Berakhot 2a', {'split': '0'}, headers['ETag'])
+    assert status == 200 and other_headers['ETag'] != headers['ETag']
+
+def test_missing_page(sefaria):
+    status, headers, body = http_cache.text_response('Berakhot 1a', {})
+    assert status == 404
+    assert headers['Cache-Control'] == http_cache.NOT_FOUND_CACHE_CONTROL
+    assert 'does not exist' in json.loads(body)['message']
+
+    sefaria.missing.add('Berakhot.3a')
+    status, _, body = http_cache.text_response('Berakhot 3a', {})
+    assert status == 404 and json.loads(body)['message'] == 'No data found for reference: Berakhot 3a'
+
+@pytest.mark.parametrize('args', [{'lang': 'fr'}, {'nikud': 'maybe'}, {'terms': 'modern'}])
+def test_invalid_options(sefaria, args):
+    status, headers, body = http_cache.text_response('Berakhot 2a', args)
+    assert status == 400
+    assert headers['Cache-Control'] == 'no-store'
+    assert not json.loads(body)['success']
+    assert sefaria.requested == []
+
+def test_upstream_failure(sefaria, monkeypatch):
+    def fail(ref, language):
+        raise ConnectionError('Sefaria is down')
+    monkeypatch.setattr('utils.sefaria_api._query_sefaria', fail)
+    status, headers, body = http_cache.text_response('Berakhot 2a', {})
+    assert status == 502 and headers['Cache-Control'] == 'no-store'
+    assert json.loads(body)['message'] == 'Error: Sefaria is down'
+
+def test_gzip(sefaria):
+    _, plain_headers, plain = http_cache.text_response('Berakhot 2a', {})
+    status, headers, body = http_cache.text_response('Berakhot 2a', {}, accept_encoding='gzip, deflate')
+    assert status == 200
+    assert headers['Content-Encoding'] == 'gzip' and headers['Vary'] == 'Accept-Encoding'
+    assert plain_headers['Vary'] == 'Accept-Encoding' and 'Content-Encoding' not in plain_headers
+    assert gzip.decompress(body) == plain
+
+    # Each encoding has its own ETag, and only matches requests for that encoding
+    assert headers['ETag'] == plain_headers['ETag'][:-1] + '-gzip"'
+    assert http_cache.text_response('Berakhot 2a', {}, headers['ETag'], 'gzip')[0] == 304
+    assert http_cache.text_response('Berakhot 2a', {}, headers['ETag'])[0] == 200
+    assert http_cache.text_response('Berakhot 2a', {}, plain_headers['ETag'], 'gzip')[0] == 200
+
+def test_small_and_error_bodies_are_not_compressed(sefaria):
+    status, headers, body = http_cache.text_response('Berakhot 2a', {'lang': 'fr'}, accept_encoding='gzip')
+    assert status == 400 and 'Content-Encoding' not in headers
+    assert headers['Vary'] == 'Accept-Encoding'
+    assert not json.loads(body)['success']
+
+def test_adapters_send_compressed_bodies(sefaria):
+    import handler
+    from app import app
+
+    response = handler.get_text_by_ref({'pathParameters': {'ref': 'Berakhot.2a'},
+                                        'headers': {'Accept-Encoding': 'gzip'}}, None)
+    assert response['statusCode'] == 200 and response['isBase64Encoded']
+    assert json.loads(gzip.decompress(base64.b64decode(response['body'])))['success']
+
+    response = handler.get_text_by_ref({'pathParameters': {'ref': 'Berakhot.2a'}}, None)
+    assert not response['isBase64Encoded'] and json.loads(response['body'])['success']
+
+    response = app.test_client().get('/api/text/Berakhot.2a', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(response.data))['success']
@@ -0,0 +1,51 @@
+import requests
+
+from utils import mirror
+from utils.corpus import CorpusStore
+
+from conftest import sefaria_page
+
+REFS = ['Berakhot.2a', 'Berakhot.2b', 'Berakhot.3a']
+
+def fake_fetch(failing):
+    """Return a fetch_text stand-in that raises for the refs in failing."""
+    def fetch_text(ref, language="all", etag=None, last_modified=None):
+        if ref in failing:
+            raise requests.ConnectionError(f"connection reset while fetching {ref}")
+        return 200, sefaria_page(ref), '"v1"', None
+    return fetch_text
+
+def test_failed_page_does_not_abort_the_tractate(tmp_path, monkeypatch):
+    store = CorpusStore(str(tmp_path))
+    monkeypatch.setattr(mirror, 'page_refs', lambda tractate: REFS)
+    monkeypatch.setattr(mirror, 'fetch_text', fake_fetch({'Berakhot.2b'}))
+
+    counts = mirror.mirror_tractate('Berakhot', store, workers=2)
+
+    assert counts['fetched'] == 2
+    assert counts['failed'] == 1
+    assert store.read('Berakhot.2a') is not None
+    assert store.read('Berakhot.2b') is None
+
+def test_failed_page_is_fetched_on_the_next_run(tmp_path, monkeypatch):
+    store = CorpusStore(str(tmp_path))
+    monkeypatch.setattr(mirror, 'page_refs', lambda tractate: REFS)
+    monkeypatch.setattr(mirror, 'fetch_text', fake_fetch({'Berakhot.3a'}))
+    mirror.mirror_tractate('Berakhot', store)
+
+    monkeypatch.setattr(mirror, 'fetch_text', fake_fetch(set()))
+    counts = mirror.mirror_tractate('Berakhot', store)
+
+    assert counts['skipped'] == 2
+    assert counts['fetched'] == 1
+    assert counts['failed'] == 0
+    assert store.read('Berakhot.3a')['data']['ref'] == 'Berakhot.3a'
+
+def test_refresh_keeps_the_stored_page_when_the_fetch_fails(tmp_path, monkeypatch):
+    store = CorpusStore(str(tmp_path))
+    monkeypatch.setattr(mirror, 'fetch_text', fake_fetch(set()))
+    assert mirror.mirror_page('Berakhot.2a', store) == 'fetched'
+
+    monkeypatch.setattr(mirror, 'fetch_text', fake_fetch({'Berakhot.2a'}))
+    assert mirror.mirror_page('Berakhot.2a', store, refresh=True) == 'failed'
+    assert store.read('Berakhot.2a')['etag'] == '"v1"'
@@ -0,0 +1,57 @@
+import random
+import re
+
+import pytest
+
+from utils.numbers import _PHRASE_PATTERN, convert_number_words, ordinal_suffix, parse_number_phrase
+
+PHRASE = re.compile(_PHRASE_PATTERN, flags=re.IGNORECASE)
+
+def convert_in_passes(text):
+    """The conversion as standardize_terminology ran it before the fused scan: phrases, then each ordinal context."""
+    text = PHRASE.sub(lambda match: parse_number_phrase(match.group()), text)
+    add_suffix = lambda match: f"{match.group(1)}{ordinal_suffix(int(match.group(1)))}"
+    text = re.sub(r'the (\d+) day', lambda match: f"the {add_suffix(match)} day", text)
+    return re.sub(r'(\d+) century', lambda match: f"{add_suffix(match)} century", text)
+
+WORDS = [
+    'a', 'A', 'and', 'one', 'two', 'three', 'four', 'Five', 'seven', 'ten', 'eleven', 'twelve', 'nineteen',
+    'twenty', 'forty', 'ninety', 'hundred', 'thousand', 'million', 'first', 'second', 'third', 'fifth',
+    'twelfth', 'twentieth', 'hundredth', 'thousandth', 'twenty-five', 'forty-second', 'first-born',
+    'the', 'The', 'day', 'days', 'century', 'Century', 'of', 'years', 'Rav', 'said', '3', '14', '2000',
+]
+SEPARATORS = [' ', ' ', ' ', '  ', ', ', '. ', '-', '\n']
+
+def generated_phrases(count, seed=12):
+    rng = random.Random(seed)
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(1, 8))]
+        text = words[0]
+        for word in words[1:]:
+            text += rng.choice(SEPARATORS) + word
+        yield text
+
+def test_fused_scan_matches_separate_passes():
+    mismatches = []
+    for text in generated_phrases(20000):
+        expected = convert_in_passes(text)
+        if convert_number_words(text) != expected:
+            mismatches.append((text, expected))
+    assert mismatches[:5] == []
+
+def test_memoized_phrases_convert_the_same():
+    parse_number_phrase.cache_clear()
+    first = [convert_number_words(text) for text in generated_phrases(500)]
+    assert parse_number_phrase.cache_info().hits > 0
+    assert [convert_number_words(text) for text in generated_phrases(500)] == first
+
+@pytest.mark.parametrize('text, expected', [
+    ('on the seventh day', 'on the 7th day'),
+    ('on the 7 day', 'on the 7th day'),
+    ('in the fifth century', 'in the 5th century'),
+    ('in the twenty one century', 'in the 21st century'),
+    ('a day and a night', 'a day and a night'),
+    ('', ''),
+])
+def test_ordinal_contexts(text, expected):
+    assert convert_number_words(text) == expected
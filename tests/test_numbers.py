@@ -0,0 +1,8 @@
+import pytest
+
+from benchmarks.number_cases import NUMBER_CASES
+from utils.numbers import convert_number_words
+
+@pytest.mark.parametrize('text, expected', NUMBER_CASES)
+def test_convert_number_words(text, expected):
+    assert convert_number_words(text) == expected
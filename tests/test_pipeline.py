@@ -0,0 +1,99 @@
+import itertools
+
+import pytest
+
+from benchmarks.samples import ENGLISH_SEGMENTS, HEBREW_SEGMENTS
+from utils.formatter import remove_nikud, remove_nikud_batch, split_by_punctuation, standardize_terminology
+from utils.pipeline import FormatPipeline, process_sefaria_data
+from utils.profiles import resolve_profile
+
+def process_in_passes(data, remove_nikud_marks, standardize_terms, split_sentences, language='all', terminology=None):
+    """process_sefaria_data as it was before the pipeline: one list pass per step."""
+    if language in ('en', 'he'):
+        key, field = ('he', 'hebrew') if language == 'he' else ('text', 'english')
+        segments = data.get(key)
+        if not segments:
+            return []
+        if not isinstance(segments, list):
+            segments = [segments]
+        if language == 'he' and remove_nikud_marks:
+            segments = remove_nikud_batch(segments)
+        if language == 'en' and standardize_terms:
+            segments = [standardize_terminology(line, terminology) for line in segments]
+        return [{'number': i + 1, field: split_by_punctuation(segment, language) if split_sentences else [segment]}
+                for i, segment in enumerate(segments)]
+
+    hebrew_text = data.get('he') or None
+    if hebrew_text and remove_nikud_marks:
+        hebrew_text = remove_nikud_batch(hebrew_text) if isinstance(hebrew_text, list) else remove_nikud(hebrew_text)
+    english_text = data.get('text') or None
+    if english_text and standardize_terms:
+        english_text = ([standardize_terminology(line, terminology) for line in english_text]
+                        if isinstance(english_text, list) else standardize_terminology(english_text, terminology))
+
+    def lines(heb, eng):
+        if split_sentences:
+            return split_by_punctuation(heb, 'he'), split_by_punctuation(eng, 'en')
+        return [heb], [eng]
+
+    if isinstance(english_text, list) and isinstance(hebrew_text, list):
+        pairs = zip(hebrew_text, english_text)
+    elif english_text and hebrew_text:
+        pairs = [(hebrew_text, english_text)]
+    else:
+        pairs = []
+    sections = []
+    for i, (heb, eng) in enumerate(pairs):
+        heb_lines, eng_lines = lines(heb, eng)
+        sections.append({'number': i + 1, 'hebrew': heb_lines, 'english': eng_lines})
+    return sections
+
+PAGES = [
+    {'he': HEBREW_SEGMENTS, 'text': ENGLISH_SEGMENTS},
+    {'he': HEBREW_SEGMENTS[:3], 'text': ENGLISH_SEGMENTS},
+    {'he': HEBREW_SEGMENTS[0], 'text': ENGLISH_SEGMENTS[0]},
+    {'he': HEBREW_SEGMENTS, 'text': []},
+    {'he': ['', HEBREW_SEGMENTS[1]], 'text': [ENGLISH_SEGMENTS[1], '']},
+    {},
+]
+PROFILES = [None, 'traditional', 'none', {'Rabbi': 'Rebbe', 'Shema': 'Shma'}]
+
+@pytest.mark.parametrize('page', PAGES)
+@pytest.mark.parametrize('language', ['all', 'en', 'he'])
+@pytest.mark.parametrize('profile', PROFILES)
+def test_matches_the_previous_implementation(page, language, profile):
+    _, terminology = resolve_profile(profile)
+    for flags in itertools.product([True, False], repeat=3):
+        assert process_sefaria_data(page, *flags, language=language, terminology=terminology) == \
+            process_in_passes(page, *flags, language=language, terminology=terminology)
+
+def test_stages_run_in_registration_order():
+    pipeline = FormatPipeline()
+    pipeline.register('upper', 'en', 'upper', lambda options: str.upper)
+    pipeline.register('suffix', 'en', 'suffix', lambda options: lambda text: text + options['suffix'])
+    pipeline.register('words', 'en', 'split', lambda options: str.split, kind='split')
+    pipeline.register('reverse', 'he', 'reverse', lambda options: lambda segments: segments[::-1], kind='page')
+
+    data = {'he': ['א', 'ב'], 'text': ['one two', 'three']}
+    options = {'upper': True, 'suffix': '!', 'split': True, 'reverse': True}
+    assert pipeline.run(data, options) == [
+        {'number': 1, 'hebrew': ['ב'], 'english': ['ONE', 'TWO!']},
+        {'number': 2, 'hebrew': ['א'], 'english': ['THREE!']},
+    ]
+    assert pipeline.run(data, dict(options, upper=False, split=False), language='en') == [
+        {'number': 1, 'english': ['one two!']},
+        {'number': 2, 'english': ['three!']},
+    ]
+
+def test_compiled_pipelines_are_reused():
+    pipeline = FormatPipeline()
+    pipeline.register('upper', 'en', 'upper', lambda options: str.upper)
+    compiled = pipeline.compile({'upper': True})
+    assert pipeline.compile({'upper': True}) is compiled
+    pipeline.register('lower', 'en', 'lower', lambda options: str.lower)
+    assert pipeline.compile({'upper': True}) is not compiled
+
+@pytest.mark.parametrize('language, kind', [('fr', 'transform'), ('en', 'sentence')])
+def test_invalid_stages(language, kind):
+    with pytest.raises(ValueError):
+        FormatPipeline().register('stage', language, 'option', lambda options: str, kind=kind)
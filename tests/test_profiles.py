@@ -0,0 +1,53 @@
+import pytest
+
+from utils.formatter import standardize_terminology
+from utils.profiles import EngineCache, profile_hash, resolve_profile
+
+def test_default_profile():
+    assert resolve_profile(None) == ('default', None)
+    assert resolve_profile('default') == ('default', None)
+
+def test_named_profiles():
+    key, engine = resolve_profile('traditional')
+    text = 'Rabbi Meir said that the Lord spoke to the Sages; the Gemara asks.'
+    assert standardize_terminology(text, engine) == 'Rabbi Meir said that God spoke to the Sages; the Talmud asks.'
+    assert standardize_terminology(text, resolve_profile('none')[1]) == text
+    assert key != resolve_profile('none')[0]
+
+def test_inline_profiles_match_whole_words():
+    _, engine = resolve_profile({'Rabbi': 'Rebbe', 'the Lord': 'Hashem'})
+    assert standardize_terminology('RABBI said the Lord; Rabbis and the Lords', engine) == \
+        'Rebbe said Hashem; Rabbis and the Lords'
+
+def test_engines_are_cached_by_content():
+    _, first = resolve_profile({'a': 'b', 'c': 'd'})
+    _, second = resolve_profile({'c': 'd', 'a': 'b'})
+    assert first is second
+    assert resolve_profile('traditional')[1] is resolve_profile('traditional')[1]
+    assert profile_hash('inline', {'a': 'b'}) != profile_hash('named', {'a': 'b'})
+
+@pytest.mark.parametrize('profile, message', [
+    ('modern', 'Unknown terminology profile: modern'),
+    (['Rabbi'], 'terminology must be a profile name'),
+    ({'Rabbi': 1}, 'must map strings to strings'),
+])
+def test_invalid_profiles(profile, message):
+    with pytest.raises(ValueError, match=message):
+        resolve_profile(profile)
+
+def test_inline_profile_size_limit(monkeypatch):
+    from utils import profiles
+
+    monkeypatch.setattr(profiles, 'MAX_INLINE_TERMS', 2)
+    with pytest.raises(ValueError, match='limited to 2 terms'):
+        resolve_profile({'a': 'x', 'b': 'y', 'c': 'z'})
+
+def test_engine_cache_evicts_least_recently_used():
+    cache = EngineCache(max_entries=2)
+    cache.get('a', lambda: 'A')
+    cache.get('b', lambda: 'B')
+    cache.get('a', lambda: 'not built')
+    cache.get('c', lambda: 'C')
+    assert cache.get('a', lambda: 'rebuilt') == 'A'
+    assert cache.get('b', lambda: 'rebuilt') == 'rebuilt'
+    assert cache.stats() == {'hits': 2, 'misses': 4, 'entries': 2, 'max_entries': 2}
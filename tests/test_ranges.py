@@ -0,0 +1,80 @@
+import pytest
+
+from utils.sefaria_api import (
+    SOURCE_FORMATTED_CACHE, SOURCE_RAW_CACHE, SOURCE_UPSTREAM, expand_range, fetch_range, iter_range_pages,
+    parse_range_ref, plan_range_chunks
+)
+from utils.tractates import InvalidReference
+
+@pytest.mark.parametrize('ref', ['Berakhot.2a-3a', 'Berakhot 2a-3a', 'Berakhot 2a - Berakhot 3a', 'Ber. 2a–3a'])
+def test_parse_range_ref(ref):
+    assert parse_range_ref(ref) == ('Berakhot.2a', 'Berakhot.3a')
+
+def test_parse_range_ref_rejects_single_pages_and_missing_pages():
+    assert parse_range_ref('Berakhot.2a') is None
+    with pytest.raises(InvalidReference):
+        parse_range_ref('Berakhot 2a-65a')
+
+def test_expand_range():
+    assert expand_range(*parse_range_ref('Berakhot 2a-3a')) == ['Berakhot.2a', 'Berakhot.2b', 'Berakhot.3a']
+    assert expand_range('Berakhot.2a', 'Berakhot.2a') == ['Berakhot.2a']
+
+def test_reversed_range():
+    with pytest.raises(ValueError, match='range end precedes start'):
+        expand_range(*parse_range_ref('Berakhot 3a-2a'))
+
+def test_overlong_range():
+    with pytest.raises(ValueError, match='longer than 4 pages'):
+        expand_range('Berakhot.2a', 'Berakhot.10a', limit=4)
+
+def test_single_page_is_flattened():
+    data = {'he': [['א', 'ב'], 'ג'], 'text': ['a', ['b', '']]}
+    assert list(iter_range_pages(data)) == [{'he': ['א', 'ב', 'ג'], 'text': ['a', 'b']}]
+
+def test_spanning_response_yields_one_page_each():
+    data = {
+        'isSpanning': True,
+        'he': [['א', 'ב'], [['ג']]],
+        'text': [['a', 'b'], ['c'], ['d']],
+    }
+    assert list(iter_range_pages(data)) == [
+        {'he': ['א', 'ב'], 'text': ['a', 'b']},
+        {'he': ['ג'], 'text': ['c']},
+        {'he': [], 'text': ['d']},
+    ]
+
+def test_missing_text():
+    assert list(iter_range_pages({})) == [{'he': [], 'text': []}]
+
+def test_plan_range_chunks():
+    refs = expand_range('Berakhot.2a', 'Berakhot.4b') + ['Berakhot.10a']
+    chunks, chunk_refs = plan_range_chunks(refs, chunk_size=3)
+    assert chunks == [['Berakhot.2a', 'Berakhot.2b', 'Berakhot.3a'], ['Berakhot.3b', 'Berakhot.4a', 'Berakhot.4b'],
+                      ['Berakhot.10a']]
+    assert chunk_refs == ['Berakhot.2a-3a', 'Berakhot.3b-4b', 'Berakhot.10a']
+
+def test_fetch_range_uses_one_call_per_chunk(sefaria):
+    refs = expand_range('Berakhot.2a', 'Berakhot.4b')
+    pages = fetch_range(refs, chunk_size=4)
+    assert sorted(sefaria.requested) == ['Berakhot.2a-3b', 'Berakhot.4a-4b']
+    assert [page['text'][0].split(':')[0] for page, _ in pages] == refs
+    assert {source for _, source in pages} == {SOURCE_UPSTREAM}
+
+def test_fetch_range_reuses_cached_pages(sefaria):
+    process = lambda data: [segment.upper() for segment in data['text']]
+    refs = expand_range('Berakhot.2a', 'Berakhot.3a')
+    fetch_range(refs, process=process, options=('upper',))
+    sefaria.requested.clear()
+
+    again = fetch_range(refs, process=process, options=('upper',))
+    assert [source for _, source in again] == [SOURCE_FORMATTED_CACHE] * 3
+    reformatted = fetch_range(refs, process=process, options=('other',))
+    assert [source for _, source in reformatted] == [SOURCE_RAW_CACHE] * 3
+    assert sefaria.requested == []
+    assert reformatted[0][0][0].startswith('BERAKHOT.2A: ')
+
+def test_fetch_range_skips_missing_pages(sefaria):
+    sefaria.missing.add('Berakhot.2b')
+    pages = fetch_range(expand_range('Berakhot.2a', 'Berakhot.3a'))
+    assert pages[1] == (None, None)
+    assert pages[0][0] and pages[2][0]
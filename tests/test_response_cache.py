@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+
+from utils import async_api, http_cache, sefaria_api
+from utils.corpus import CorpusStore
+from utils.page_cache import page_cache, raw_cache
+from utils.response_cache import ResponseCache, cache_key
+
+PAGE = {'he': ['א'], 'text': ['a']}
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(str(tmp_path / 'responses.db'))
+
+@pytest.fixture
+def online(monkeypatch, cache):
+    """Route _query_sefaria through `cache`; answer(status, ...) sets Sefaria's reply and returns its calls."""
+    calls = []
+    monkeypatch.setattr(sefaria_api, 'SEFARIA_MODE', 'online')
+    monkeypatch.setattr(sefaria_api, 'response_cache', cache)
+
+    def answer(status, data=None, new_etag=None):
+        def fetch_text(ref, language, etag=None, last_modified=None):
+            calls.append((ref, etag))
+            return status, data, new_etag, None
+        monkeypatch.setattr(sefaria_api, 'fetch_text', fetch_text)
+        return calls
+    return answer
+
+def test_round_trip(cache):
+    cache.put('all|berakhot.2a', PAGE, etag='"v1"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+    entry = cache.get('all|berakhot.2a')
+    assert entry == (PAGE, '"v1"', 'Mon, 01 Jan 2024 00:00:00 GMT', True)
+    assert cache.get('all|berakhot.2b') is None
+
+def test_cache_key_normalizes_refs():
+    assert cache_key('Berakhot 2a', 'en') == cache_key('berakhot_2a', 'en') == 'en|berakhot_2a'
+
+def test_fresh_entry_needs_no_request(online, cache):
+    calls = online(200, {'he': ['new'], 'text': ['new']})
+    cache.put(cache_key('Berakhot 2a', 'all'), PAGE)
+    assert sefaria_api._query_sefaria('Berakhot 2a', 'all') == (PAGE, 'response-cache')
+    assert calls == []
+
+def test_miss_is_stored(online, cache):
+    calls = online(200, PAGE, new_etag='"v1"')
+    assert sefaria_api._query_sefaria('Berakhot 2a', 'all') == (PAGE, 'upstream')
+    assert cache.get(cache_key('Berakhot 2a', 'all')).etag == '"v1"'
+    assert calls == [('Berakhot 2a', None)]
+
+def test_stale_entry_is_revalidated(online, cache):
+    cache.ttl = 0
+    calls = online(304)
+    key = cache_key('Berakhot 2a', 'all')
+    cache.put(key, PAGE, etag='"v1"')
+    assert sefaria_api._query_sefaria('Berakhot 2a', 'all') == (PAGE, 'response-cache')
+    assert calls == [('Berakhot 2a', '"v1"')]
+
+    cache.ttl = 60
+    assert cache.get(key).fresh
+
+@pytest.mark.parametrize('status', [429, 500, 503])
+def test_stale_entry_served_on_error_status(online, cache, status):
+    cache.ttl = 0
+    online(status)
+    cache.put(cache_key('Berakhot 2a', 'all'), PAGE, etag='"v1"')
+    assert sefaria_api._query_sefaria('Berakhot 2a', 'all') == (PAGE, 'response-cache')
+
+@pytest.fixture
+def empty_page_caches():
+    page_cache.clear()
+    raw_cache.clear()
+    yield
+    page_cache.clear()
+    raw_cache.clear()
+
+def test_response_cache_hit_is_reported_as_its_source(online, cache, empty_page_caches, monkeypatch):
+    calls = online(200, {'he': ['new'], 'text': ['new']})
+    cache.put(cache_key('Berakhot.2a', 'all'), PAGE)
+    monkeypatch.setattr(async_api, 'SEFARIA_MODE', 'online')
+    monkeypatch.setattr(async_api, 'response_cache', cache)
+
+    assert sefaria_api.fetch_raw('Berakhot.2a') == (PAGE, 'response-cache')
+    raw_cache.clear()
+    assert asyncio.run(async_api.fetch_raw_async('Berakhot.2a')) == (PAGE, 'response-cache')
+    raw_cache.clear()
+    _, headers, _ = http_cache.text_response('Berakhot 2a', {})
+    assert headers['X-Text-Source'] == 'response-cache'
+    assert calls == []
+
+def test_mirror_is_reported_as_its_source(tmp_path, empty_page_caches, monkeypatch):
+    store = CorpusStore(str(tmp_path))
+    store.write('Berakhot.2a', 'all', PAGE)
+    for module in (sefaria_api, async_api):
+        monkeypatch.setattr(module, 'SEFARIA_MODE', 'offline')
+        monkeypatch.setattr(module, 'corpus_store', store)
+
+    assert sefaria_api.fetch_raw('Berakhot.2a') == (PAGE, 'mirror')
+    raw_cache.clear()
+    assert asyncio.run(async_api.fetch_raw_async('Berakhot.2a')) == (PAGE, 'mirror')
+
+def test_hits_only_record_access_after_touch_interval(cache):
+    cache.touch_interval = 60
+    cache.put('all|berakhot.2a', PAGE)
+    conn = cache._connect()
+    conn.execute('UPDATE responses SET accessed_at = 100')
+    cache.get('all|berakhot.2a')
+    assert conn.execute('SELECT accessed_at FROM responses').fetchone()[0] > 100
+
+    accessed_at = conn.execute('SELECT accessed_at FROM responses').fetchone()[0]
+    cache.get('all|berakhot.2a')
+    assert conn.execute('SELECT accessed_at FROM responses').fetchone()[0] == accessed_at
+
+def test_least_recently_used_entries_are_evicted(cache):
+    cache.put('a', PAGE)
+    size = cache._connect().execute('SELECT size FROM responses').fetchone()[0]
+    cache.max_bytes = size * 2
+    cache._connect().execute('UPDATE responses SET accessed_at = 0')
+    cache.put('b', PAGE)
+    cache.put('c', PAGE)
+    assert cache.get('a') is None
+    assert cache.get('b') and cache.get('c')
+
+def stored_size(cache):
+    return cache._connect().execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+def test_total_size_tracks_puts_replacements_evictions_and_clear(cache):
+    cache.put('a', PAGE)
+    cache.put('b', {'he': ['א' * 200], 'text': ['a' * 200]})
+    cache.put('a', {'he': [], 'text': []})
+    assert cache._total_size(cache._connect()) == stored_size(cache) > 0
+
+    cache.max_bytes = stored_size(cache) - 1
+    cache.put('c', PAGE)
+    assert cache._total_size(cache._connect()) == stored_size(cache) <= cache.max_bytes
+
+    cache.clear()
+    assert cache._total_size(cache._connect()) == 0
+
+def test_put_does_not_sum_the_table(cache):
+    cache.put('a', PAGE)
+    statements = []
+    cache._connect().set_trace_callback(statements.append)
+    cache.put('b', PAGE)
+    assert not any('SUM(' in statement.upper() for statement in statements)
+
+def test_total_size_is_shared_by_every_connection(tmp_path):
+    path = str(tmp_path / 'responses.db')
+    first, second = ResponseCache(path), ResponseCache(path)
+    first.put('a', PAGE)
+    second.put('b', PAGE)
+    second.put('a', PAGE)
+    assert first._total_size(first._connect()) == second._total_size(second._connect()) == stored_size(first)
+
+def test_existing_database_is_summed_once(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / 'responses.db')
+    conn = sqlite3.connect(path)
+    conn.execute(
+        'CREATE TABLE responses (key TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, last_modified TEXT, '
+        'fetched_at REAL NOT NULL, accessed_at REAL NOT NULL, size INTEGER NOT NULL)'
+    )
+    conn.execute("INSERT INTO responses VALUES ('a', x'00', NULL, NULL, 0, 0, 123)")
+    conn.commit()
+    conn.close()
+
+    cache = ResponseCache(path)
+    assert cache._total_size(cache._connect()) == 123
+    cache.put('b', PAGE)
+    assert cache._total_size(cache._connect()) == stored_size(cache)
@@ -0,0 +1,62 @@
+import random
+import re
+
+import pytest
+
+from utils.formatter import split_by_punctuation
+from utils.sentences import iter_sentence_spans, iter_sentences
+
+def split_with_re_split(text):
+    """The splitter used before iter_sentence_spans: re.split, then recombine the pieces."""
+    if not text:
+        return []
+    splits = re.split(r'([.?:](?:\s|$))', text)
+    result = []
+    i = 0
+    while i < len(splits):
+        if i + 1 < len(splits) and any(splits[i + 1].startswith(p) for p in ['.', '?', ':']):
+            result.append((splits[i] + splits[i + 1]).strip())
+            i += 2
+        else:
+            if splits[i].strip():
+                result.append(splits[i].strip())
+            i += 1
+    return result
+
+def generated_strings(count, seed=15):
+    """Random text without abbreviations or sof pasuq, where both splitters must agree."""
+    rng = random.Random(seed)
+    pieces = ['word', 'Shema', 'א', 'אמר', '.', '?', ':', ';', ',', '!', ' ', ' ', '  ', '\n', '\t', '...', '3.5']
+    for _ in range(count):
+        yield ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+
+@pytest.mark.parametrize('language', ['en', 'he'])
+def test_matches_the_previous_splitter(language):
+    mismatches = []
+    for text in generated_strings(50000):
+        expected = split_with_re_split(text)
+        if split_by_punctuation(text, language) != expected:
+            mismatches.append((text, expected))
+    assert mismatches[:5] == []
+
+def test_spans_slice_the_sentences():
+    text = '  First one. Second?  Third: and the rest '
+    spans = list(iter_sentence_spans(text))
+    assert [text[start:end] for start, end in spans] == ['First one.', 'Second?', 'Third:', 'and the rest']
+
+def test_english_abbreviations_do_not_end_a_sentence():
+    text = 'R. Yehuda said, i.e. the Rabbis, cf. Shabbat. Then he left.'
+    assert list(iter_sentences(text)) == ['R. Yehuda said, i.e. the Rabbis, cf. Shabbat.', 'Then he left.']
+    # Only whole words count: "Mr." is not in the list and "DR." does not end in "R." on its own
+    assert list(iter_sentences('Ask DR. Cohen.')) == ['Ask DR.', 'Cohen.']
+
+def test_hebrew_ends_at_sof_pasuq():
+    assert list(iter_sentences('ויהי ערב׃ ויהי בקר׃', 'he')) == ['ויהי ערב׃', 'ויהי בקר׃']
+    assert list(iter_sentences('R. Meir.', 'he')) == ['R.', 'Meir.']
+
+def test_unknown_language_uses_english_rules():
+    assert list(iter_sentences('R. Meir said. Yes.', 'fr')) == ['R. Meir said.', 'Yes.']
+
+def test_lazy():
+    sentences = iter_sentences('One. ' * 1000)
+    assert next(sentences) == 'One.'
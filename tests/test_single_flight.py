@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.single_flight import AsyncSingleFlight, SingleFlight
+
+def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return {'page': 'Berakhot.2a'}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do('key', fetch)))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=lambda: results.append(flights.do('key', fetch))) for _ in range(4)]
+    for follower in followers:
+        follower.start()
+    # Give the followers time to find the call in flight
+    time.sleep(0.05)
+    assert flights.in_flight() == 1
+    release.set()
+    for thread in [leader] + followers:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 5 and all(result is results[0] for result in results)
+    assert flights.in_flight() == 0
+
+def test_sequential_calls_run_again():
+    flights = SingleFlight()
+    assert flights.do('key', lambda: 1) == 1
+    assert flights.do('key', lambda: 2) == 2
+
+def test_errors_reach_every_caller():
+    flights = SingleFlight()
+    with pytest.raises(ValueError):
+        flights.do('key', lambda: int('x'))
+    assert flights.in_flight() == 0
+
+def test_async_callers_share_one_task():
+    flights = AsyncSingleFlight()
+    calls = []
+
+    async def fetch(ref):
+        calls.append(ref)
+        await asyncio.sleep(0.01)
+        return ref.upper()
+
+    async def main():
+        results = await asyncio.gather(*(flights.do('key', fetch, 'a') for _ in range(5)))
+        return results, flights.in_flight()
+
+    results, in_flight = asyncio.run(main())
+    assert results == ['A'] * 5
+    assert calls == ['a']
+    assert in_flight == 0
+
+def test_cancelling_one_caller_keeps_the_shared_task():
+    flights = AsyncSingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return 'done'
+
+    async def main():
+        first = asyncio.ensure_future(flights.do('key', fetch))
+        second = asyncio.ensure_future(flights.do('key', fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == 'done'
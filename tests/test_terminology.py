@@ -0,0 +1,32 @@
+import re
+
+import pytest
+
+from utils.formatter import TERMINOLOGY_PREFERENCES, TerminologyEngine
+
+def apply_in_turn(preferences, text):
+    for pattern, replacement in preferences.items():
+        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+    return text
+
+SAMPLES = [
+    '',
+    'No terms here.',
+    'The Gemara asks: Rabbi Yehuda said that the Sages taught this.',
+    'The Sages taught: a Divine Voice emerged, and the Divine Presence rested on him.',
+    'He spoke with divine inspiration before THE LORD.',
+    'A leper with leprosy may not put on phylacteries.',
+    'A gentile, an ignoramus and two ignorami; an ignorant person.',
+    'The maidservant carried the barrel; barrels and Gemaras are not whole words.',
+]
+
+@pytest.mark.parametrize('text', SAMPLES)
+def test_single_scan_matches_applying_each_pattern(text):
+    assert TerminologyEngine(TERMINOLOGY_PREFERENCES).apply(text) == apply_in_turn(TERMINOLOGY_PREFERENCES, text)
+
+def test_custom_dictionary():
+    engine = TerminologyEngine({r'\bSages\b': 'Rabbis', r'\bbaraita\b': 'tannaitic source'})
+    assert engine.apply('The sages cite a Baraita') == 'The Rabbis cite a tannaitic source'
+
+def test_empty_dictionary():
+    assert TerminologyEngine({}).apply('Gemara') == 'Gemara'
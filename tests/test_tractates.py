@@ -0,0 +1,55 @@
+import pytest
+
+from utils.sefaria_api import get_adjacent_pages, get_adjacent_refs, query_sefaria
+from utils.tractates import (
+    TRACTATE_BOUNDS, InvalidReference, amud_index, amud_page, page_refs, parse_ref, resolve_ref, resolve_tractate
+)
+
+@pytest.mark.parametrize('ref, expected', [
+    ('Berakhot.2a', 'Berakhot.2a'),
+    ('Berakhot 2a', 'Berakhot.2a'),
+    ('Ber. 2A', 'Berakhot.2a'),
+    ('berachot 10b', 'Berakhot.10b'),
+    ('Bava_Metzia 10b', 'Bava Metzia.10b'),
+    ('BM 10b', 'Bava Metzia.10b'),
+    ('ברכות 2a', 'Berakhot.2a'),
+    ('Berakhot 2a:5', 'Berakhot.2a:5'),
+    ('Genesis 1', 'Genesis 1'),
+    ('Mishneh Torah 2a', 'Mishneh Torah 2a'),
+])
+def test_resolve_ref(ref, expected):
+    assert resolve_ref(ref) == expected
+
+@pytest.mark.parametrize('ref', ['Berakhot 1b', 'Berakhot 64b', 'Tamid 2a'])
+def test_pages_outside_the_tractate(ref):
+    with pytest.raises(InvalidReference, match='does not exist'):
+        resolve_ref(ref)
+
+def test_amud_index_round_trip():
+    assert amud_index('2a') == 4 and amud_index('10b') == 21
+    assert [amud_page(amud_index(page)) for page in ('2a', '2b', '176b')] == ['2a', '2b', '176b']
+
+def test_resolve_tractate():
+    assert resolve_tractate('Rosh HaShana') == 'Rosh Hashanah'
+    assert resolve_tractate('Mishneh Torah') is None
+
+def test_parse_ref():
+    assert parse_ref('Shabbat 31a') == ('Shabbat', amud_index('31a'), '')
+    assert parse_ref('Genesis 1:1') is None
+
+def test_page_refs_cover_the_tractate():
+    refs = page_refs('Tamid')
+    assert refs[0] == 'Tamid.25b' and refs[-1] == 'Tamid.33b'
+    first, last = TRACTATE_BOUNDS['Tamid']
+    assert len(refs) == last - first + 1
+
+def test_adjacent_pages_stay_in_the_tractate():
+    assert get_adjacent_pages('Berakhot 2a') == (None, 'Berakhot.2b')
+    assert get_adjacent_pages('Berakhot 64a') == ('Berakhot.63b', None)
+    assert get_adjacent_pages('Genesis 1') == (None, None)
+    assert get_adjacent_refs('Berakhot.2b', 3) == (['Berakhot.2a'], ['Berakhot.3a', 'Berakhot.3b', 'Berakhot.4a'])
+
+def test_missing_pages_are_rejected_without_a_request(sefaria):
+    assert query_sefaria('Berakhot 1a') is None
+    assert sefaria.requested == []
+    assert query_sefaria('Ber 2a')['ref'] == 'Berakhot.2a'
@@ -0,0 +1,183 @@
+import asyncio
+
+from .async_client import TRANSPORT_ERRORS, async_sefaria_client
+from .content import page_entry, plan_pages
+from .corpus import corpus_store
+from .page_cache import page_cache, raw_cache
+from .response_cache import cache_key, normalize_ref, response_cache
+from .sefaria_api import (
+    SEFARIA_MODE, SOURCE_FORMATTED_CACHE, SOURCE_MIRROR, SOURCE_RAW_CACHE, SOURCE_RESPONSE_CACHE, SOURCE_UPSTREAM,
+    cached_range_pages, iter_chunk_pages, plan_range_chunks, process_page, text_request, text_result
+)
+from .single_flight import AsyncSingleFlight
+from .tractates import InvalidReference, resolve_ref
+
+# Async counterparts of the fetch functions in sefaria_api and content, for
+# the ASGI entry point. They share the caches, the request building and the
+# page layout with the threaded versions; only the waiting is different.
+# Blocking work (the SQLite response cache, the gzip mirror files and the
+# formatting) runs in worker threads so it never stalls the event loop.
+
+_fetch_flights = AsyncSingleFlight()
+_format_flights = AsyncSingleFlight()
+
+async def fetch_text_async(ref, language="all", etag=None, last_modified=None):
+    """Async fetch_text: fetch a reference directly from Sefaria, bypassing every cache."""
+    path, params, headers = text_request(ref, language, etag, last_modified)
+    response = await async_sefaria_client.get(path, params=params, headers=headers)
+    return text_result(ref, language, response)
+
+async def query_sefaria_async(ref, language="all"):
+    """Async query_sefaria; concurrent calls for the same (ref, language) share one upstream request."""
+    return (await _query_with_source_async(ref, language))[0]
+
+async def _query_with_source_async(ref, language):
+    """Async _query_with_source: query_sefaria_async, returning (data, source)."""
+    try:
+        ref = resolve_ref(ref)
+    except InvalidReference:
+        return None, None
+    return await _fetch_flights.do(cache_key(ref, language), _query_sefaria_async, ref, language)
+
+async def _query_sefaria_async(ref, language):
+    """Fetch (data, source) for a reference from the local mirror, the response cache or Sefaria (see _query_sefaria)."""
+    if SEFARIA_MODE == 'offline':
+        return await asyncio.to_thread(corpus_store.load, ref, language), SOURCE_MIRROR
+
+    key = cache_key(ref, language)
+    entry = await asyncio.to_thread(response_cache.get, key) if response_cache else None
+    if entry and entry.fresh:
+        return entry.data, SOURCE_RESPONSE_CACHE
+
+    try:
+        status, data, etag, last_modified = await fetch_text_async(
+            ref, language,
+            etag=entry.etag if entry else None,
+            last_modified=entry.last_modified if entry else None
+        )
+    except TRANSPORT_ERRORS:
+        # Serve the stale copy rather than failing outright
+        if entry:
+            return entry.data, SOURCE_RESPONSE_CACHE
+        raise
+
+    if entry and status != 200:
+        # 304: the stored copy is still current. Anything else (429 or 5xx after
+        # the client's retries): serve the stale copy rather than "No data found"
+        if status == 304:
+            await asyncio.to_thread(response_cache.touch, key)
+        return entry.data, SOURCE_RESPONSE_CACHE
+
+    if data is not None and response_cache and 'error' not in data:
+        await asyncio.to_thread(response_cache.put, key, data, etag=etag, last_modified=last_modified)
+    return data, SOURCE_UPSTREAM
+
+async def fetch_raw_async(ref, language="all"):
+    """Async fetch_raw: return (data, source), using the in-memory raw payload cache."""
+    key = cache_key(ref, language)
+    data = raw_cache.get(key)
+    if data is not None:
+        return data, SOURCE_RAW_CACHE
+    data, source = await _query_with_source_async(ref, language)
+    if data and 'error' not in data:
+        raw_cache.put(key, data)
+    return data, source
+
+async def fetch_page_async(ref, language="all", process=None, options=None):
+    """Async fetch_page: return a (page, source) pair for one reference."""
+    if not process or options is None:
+        data, source = await fetch_raw_async(ref, language)
+        if not data:
+            return None, None
+        return (await asyncio.to_thread(process, data) if process else data), source
+
+    key = (normalize_ref(ref), language) + tuple(options)
+    cached = page_cache.get(key)
+    if cached is not None:
+        return cached, SOURCE_FORMATTED_CACHE
+    return await _format_flights.do(key, _fetch_and_process_async, ref, language, process, options)
+
+async def _fetch_and_process_async(ref, language, process, options):
+    data, source = await fetch_raw_async(ref, language)
+    if not data:
+        return None, None
+    return await asyncio.to_thread(process_page, ref, data, language, process, options), source
+
+async def fetch_range_async(refs, language="all", process=None, options=None):
+    """Async fetch_range: fetch a run of consecutive pages with as few upstream calls as possible."""
+    # Formats the pages whose raw payload is cached, so it runs in a thread too
+    results = await asyncio.to_thread(cached_range_pages, refs, language, process, options)
+    chunks, chunk_refs = plan_range_chunks([ref for ref in refs if ref not in results])
+    fetched = await asyncio.gather(*(fetch_raw_async(chunk_ref, language) for chunk_ref in chunk_refs))
+    pages = [(ref, page, source) for chunk, (data, source) in zip(chunks, fetched)
+             for ref, page in iter_chunk_pages(chunk, data, language)]
+    processed = await asyncio.gather(*(
+        asyncio.to_thread(process_page, ref, page, language, process, options) for ref, page, _ in pages
+    ))
+    for (ref, _, source), page in zip(pages, processed):
+        results[ref] = (page, source)
+    return [results.get(ref, (None, None)) for ref in refs]
+
+async def iter_pages_async(reference, language="all", process=None, options=None, adjacent_pages=0):
+    """Async iter_pages: yield content entries as they are ready, the requested page(s) first."""
+    page_range, slots = plan_pages(reference, adjacent_pages)
+    current = [position for position, slot in enumerate(slots) if slot.current]
+    adjacent = [position for position, slot in enumerate(slots) if not slot.current]
+
+    if page_range:
+        current_task = fetch_range_async([slots[position].ref for position in current], language, process, options)
+    else:
+        current_task = asyncio.gather(fetch_page_async(slots[current[0]].ref, language, process, options))
+    current_task = asyncio.ensure_future(current_task)
+    tasks = {
+        asyncio.ensure_future(fetch_page_async(slots[position].ref, language, process, options)): position
+        for position in adjacent
+    }
+
+    try:
+        current_pages = await current_task
+        if all(page is None for page, _ in current_pages):
+            return
+        for position, (page, source) in zip(current, current_pages):
+            if page is not None:
+                yield dict(page_entry(slots[position], page, source), position=position)
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=tasks.get):
+                page, source = task.result()
+                if page is not None:
+                    position = tasks[task]
+                    yield dict(page_entry(slots[position], page, source), position=position)
+    finally:
+        # Stop fetching pages nobody will read
+        for task in [current_task, *tasks]:
+            if not task.done():
+                task.cancel()
+
+async def collect_pages_async(reference, language="all", process=None, options=None, adjacent_pages=0):
+    """Async collect_pages: return the content list in display order, or None if nothing was found."""
+    entries = [entry async for entry in iter_pages_async(reference, language, process, options, adjacent_pages)]
+    if not entries:
+        return None
+    entries.sort(key=lambda entry: entry['position'])
+    for entry in entries:
+        del entry['position']
+    return entries
+
+async def iter_page_events_async(reference, language="all", process=None, options=None, adjacent_pages=0):
+    """Async iter_page_events: yield the events of a streamed response, as dicts."""
+    count = 0
+    try:
+        async for entry in iter_pages_async(reference, language, process, options, adjacent_pages):
+            count += 1
+            yield {'event': 'page', 'page': entry}
+    except Exception as e:
+        yield {'event': 'error', 'message': f"Error: {str(e)}"}
+        return
+
+    if not count:
+        yield {'event': 'error', 'message': f"No data found for reference: {reference}"}
+    else:
+        yield {'event': 'done', 'pages': count}
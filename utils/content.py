@@ -0,0 +1,143 @@
+import os
+from collections import namedtuple
+from concurrent.futures import as_completed
+
+from .encoding import dumps
+from .sefaria_api import (
+    expand_range, fetch_executor, fetch_page, fetch_range, get_adjacent_refs, parse_range_ref
+)
+from .tractates import resolve_ref
+
+# Content type of streamed responses: one JSON event per line
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Adjacent pages served on each side of the requested page(s); larger
+# adjacent_pages values are clamped (the web UI offers up to 5), so one
+# request cannot queue hundreds of fetches on the shared fetch_executor
+MAX_ADJACENT_PAGES = int(os.environ.get('MAX_ADJACENT_PAGES', 5))
+
+# One page of a response, in display order. `reference` is the value of the
+# entry's 'reference' field (None for a single requested page, which has none).
+Slot = namedtuple('Slot', ['title', 'ref', 'reference', 'current'])
+
+def plan_pages(reference, adjacent_pages):
+    """Return (page_range, slots) for a request, with slots in display order (prev -> current -> next).
+
+    At most MAX_ADJACENT_PAGES adjacent pages are planned on each side, and
+    none past either end of the tractate.
+    """
+    adjacent_pages = min(adjacent_pages, MAX_ADJACENT_PAGES)
+    page_range = parse_range_ref(reference)
+    if not page_range:
+        reference = resolve_ref(reference)
+    current_refs = expand_range(*page_range) if page_range else [reference]
+
+    prev_refs, next_refs = [], []
+    if adjacent_pages > 0:
+        prev_refs, _ = get_adjacent_refs(current_refs[0], adjacent_pages)
+        _, next_refs = get_adjacent_refs(current_refs[-1], adjacent_pages)
+        prev_refs.reverse()
+
+    slots = [Slot(f"Previous Page ({ref})", ref, ref, False) for ref in prev_refs]
+    if page_range:
+        slots += [Slot(f"Current Page ({ref})", ref, ref, True) for ref in current_refs]
+    else:
+        slots.append(Slot(f"Current Page ({reference})", reference, None, True))
+    slots += [Slot(f"Next Page ({ref})", ref, ref, False) for ref in next_refs]
+    return page_range, slots
+
+def page_entry(slot, page, source):
+    """Return the content entry for a slot's processed page."""
+    entry = {'title': slot.title, 'sections': page}
+    if slot.reference:
+        entry['reference'] = slot.reference
+    entry['source'] = source
+    return entry
+
+def iter_pages(reference, language="all", process=None, options=None, adjacent_pages=0):
+    """Fetch and process the requested page(s) and any adjacent pages, yielding each as soon as it is ready.
+
+    All pages are fetched concurrently, but the requested page(s) are always
+    yielded first; adjacent pages follow in the order they finish. Each entry
+    has a `position`, its index in display order (prev -> current -> next),
+    which may skip pages that could not be retrieved. Yields nothing if
+    nothing was found for the requested reference.
+    """
+    page_range, slots = plan_pages(reference, adjacent_pages)
+    current = [position for position, slot in enumerate(slots) if slot.current]
+    adjacent = [position for position, slot in enumerate(slots) if not slot.current]
+
+    # Adjacent pages are fetched on the shared pool while this thread fetches
+    # the requested page(s), which fetch_range may itself spread over the pool
+    futures = {
+        fetch_executor.submit(fetch_page, slots[position].ref, language, process, options): position
+        for position in adjacent
+    }
+    try:
+        if page_range:
+            current_pages = fetch_range([slots[position].ref for position in current], language, process, options)
+        else:
+            current_pages = [fetch_page(slots[current[0]].ref, language, process, options)]
+
+        if all(page is None for page, _ in current_pages):
+            return
+        for position, (page, source) in zip(current, current_pages):
+            if page is not None:
+                yield dict(page_entry(slots[position], page, source), position=position)
+
+        for future in as_completed(futures):
+            page, source = future.result()
+            if page is not None:
+                position = futures[future]
+                yield dict(page_entry(slots[position], page, source), position=position)
+    finally:
+        # Stop fetching adjacent pages nobody will read
+        for future in futures:
+            future.cancel()
+
+def collect_pages(reference, language="all", process=None, options=None, adjacent_pages=0):
+    """Fetch and process the requested page(s) and any adjacent pages.
+
+    `reference` may be a single page or a page range such as Berakhot.2a-5b;
+    a range is fetched with as few upstream calls as possible and returned as
+    one entry per page. All pages are fetched concurrently. Returns the content
+    list in display order (prev -> current -> next), or None if nothing was
+    found for the requested reference. Each entry's `source` says whether it
+    was served from the formatted cache, formatted from a cached raw payload,
+    or fetched upstream. Raises InvalidReference for pages that
+    do not exist in their tractate.
+    """
+    entries = sorted(iter_pages(reference, language, process, options, adjacent_pages),
+                     key=lambda entry: entry['position'])
+    if not entries:
+        return None
+    for entry in entries:
+        del entry['position']
+    return entries
+
+def iter_page_events(reference, language="all", process=None, options=None, adjacent_pages=0):
+    """Yield the events of a streamed response, as dicts.
+
+    A 'page' event carries each content entry as soon as it is ready (see
+    iter_pages), and a final 'done' event the number of pages sent. If
+    nothing is found, or fetching fails, the stream ends with an 'error'
+    event and its message instead.
+    """
+    count = 0
+    try:
+        for entry in iter_pages(reference, language, process, options, adjacent_pages):
+            count += 1
+            yield {'event': 'page', 'page': entry}
+    except Exception as e:
+        yield {'event': 'error', 'message': f"Error: {str(e)}"}
+        return
+
+    if not count:
+        yield {'event': 'error', 'message': f"No data found for reference: {reference}"}
+    else:
+        yield {'event': 'done', 'pages': count}
+
+def ndjson_lines(events):
+    """Encode events as newline-delimited JSON, one line of UTF-8 bytes each."""
+    for event in events:
+        yield dumps(event) + b'\n'
@@ -0,0 +1,75 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+from .response_cache import normalize_ref
+
+# Location of the local tractate mirror (override with SEFARIA_MIRROR_PATH)
+MIRROR_PATH = os.environ.get('SEFARIA_MIRROR_PATH', 'corpus')
+
+def content_hash(data):
+    """Return a stable hash of a Sefaria response body."""
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+class CorpusStore:
+    """Local compressed store of Sefaria text responses.
+
+    Each page is kept as `<root>/<tractate>/<page>.<language>.json.gz`, holding
+    the response body together with the upstream validators (ETag,
+    Last-Modified, version titles and a content hash) used for incremental
+    refreshes. Paths are lower-cased so lookups are case-insensitive.
+    """
+
+    def __init__(self, root=MIRROR_PATH):
+        self.root = root
+
+    def path(self, ref, language="all"):
+        """Return the file used to store ref in the given language."""
+        formatted_ref = normalize_ref(ref).lower()
+        separator = '.' if '.' in formatted_ref else '_'
+        tractate, _, page = formatted_ref.rpartition(separator)
+        return os.path.join(self.root, tractate or '_', f"{page}.{language}.json.gz")
+
+    def has(self, ref, language="all"):
+        """Return True if ref is already mirrored."""
+        return os.path.exists(self.path(ref, language))
+
+    def read(self, ref, language="all"):
+        """Return the stored record for ref, or None."""
+        try:
+            with gzip.open(self.path(ref, language), 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def load(self, ref, language="all"):
+        """Return the response body for ref, falling back to the bilingual copy."""
+        record = self.read(ref, language)
+        if record is None and language != "all":
+            record = self.read(ref, "all")
+        return record['data'] if record else None
+
+    def write(self, ref, language, data, etag=None, last_modified=None):
+        """Atomically store a response body and its validators."""
+        path = self.path(ref, language)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        record = {
+            'ref': ref,
+            'language': language,
+            'etag': etag,
+            'last_modified': last_modified,
+            'version': data.get('versionTitle'),
+            'he_version': data.get('heVersionTitle'),
+            'hash': content_hash(data),
+            'data': data,
+        }
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+# Shared store used by query_sefaria in offline mode
+corpus_store = CorpusStore()
@@ -0,0 +1,159 @@
+import base64
+import gzip
+import json
+import os
+import zlib
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # Only gzip is offered
+    brotli = None
+
+# Response compression settings (override with environment variables)
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', 4))
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', 5))
+
+# Response schema selected by the request's "format" field
+FORMAT_COMPACT = 'compact'
+
+def dumps(data):
+    """Serialize data to compact UTF-8 JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def compact_page(page):
+    """Return a content entry with its sections as columns instead of one object per section.
+
+    {'sections': [{'number': 1, 'hebrew': [...], 'english': [...]}, ...]}
+    becomes {'sections': {'number': [1, ...], 'hebrew': [[...], ...], 'english': [[...], ...]}},
+    so the section keys appear once per page. Columns missing from every
+    section (e.g. 'english' for a Hebrew-only request) are left out.
+    """
+    sections = page['sections']
+    fields = [field for field in ('number', 'hebrew', 'english') if any(field in section for section in sections)]
+    columns = {field: [section.get(field) for section in sections] for field in fields}
+    return dict(page, sections=columns)
+
+def compact_event(event):
+    """Apply compact_page to the page of a streamed 'page' event."""
+    if event.get('event') == 'page':
+        return dict(event, page=compact_page(event['page']))
+    return event
+
+def compact_events(events):
+    """Apply compact_event to a stream of events."""
+    for event in events:
+        yield compact_event(event)
+
+def format_result(result, response_format=None):
+    """Return a /api/get_text result in the requested schema ('compact' or the default)."""
+    if response_format == FORMAT_COMPACT and result.get('content'):
+        return dict(result, format=FORMAT_COMPACT, content=[compact_page(page) for page in result['content']])
+    return result
+
+def negotiate_encoding(accept_encoding, offers=None):
+    """Pick the first of `offers` the client accepts, or None, for an Accept-Encoding header value.
+
+    `offers` defaults to 'br' (when brotli is installed), then 'gzip'.
+    """
+    if not accept_encoding:
+        return None
+    if offers is None:
+        offers = ('br', 'gzip') if brotli is not None else ('gzip',)
+    accepted = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    def acceptable(name):
+        return accepted.get(name, accepted.get('*', 0.0)) > 0
+
+    for name in offers:
+        if acceptable(name):
+            return name
+    return None
+
+def compress(body, encoding):
+    """Compress body with a negotiated encoding ('br' or 'gzip')."""
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+def encode_response(data, accept_encoding=None, content_type='application/json'):
+    """Serialize a response body and compress it if the client accepts it.
+
+    Returns (body bytes, headers). Bodies under COMPRESS_MIN_BYTES are sent
+    as they are.
+    """
+    return encode_body(dumps(data), accept_encoding, content_type)
+
+def encode_body(body, accept_encoding=None, content_type='application/json'):
+    """encode_response for a body that is already serialized."""
+    headers = {'Content-Type': content_type, 'Vary': 'Accept-Encoding'}
+    encoding = negotiate_encoding(accept_encoding) if len(body) >= COMPRESS_MIN_BYTES else None
+    if encoding:
+        body = compress(body, encoding)
+        headers['Content-Encoding'] = encoding
+    return body, headers
+
+class LineCompressor:
+    """gzip a stream line by line, flushing after each line.
+
+    Every compress() call returns data the client can decode at once, so a
+    compressed stream still delivers each line as soon as it is sent.
+    """
+
+    def __init__(self):
+        # wbits 31: a gzip header and trailer around the deflate stream
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, line):
+        return self._compressor.compress(line) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+def stream_headers(accept_encoding=None, content_type='application/x-ndjson'):
+    """Return the headers of a streamed response, with gzip if the client accepts it."""
+    headers = {'Content-Type': content_type, 'Vary': 'Accept-Encoding'}
+    if negotiate_encoding(accept_encoding, offers=('gzip',)):
+        headers['Content-Encoding'] = 'gzip'
+    return headers
+
+def encode_lines(lines, headers):
+    """Yield the chunks of a stream of byte lines, compressed if headers say so."""
+    if 'Content-Encoding' not in headers:
+        yield from lines
+        return
+    compressor = LineCompressor()
+    for line in lines:
+        yield compressor.compress(line)
+    yield compressor.finish()
+
+async def encode_lines_async(lines, headers):
+    """encode_lines for an async iterator of lines."""
+    compressor = LineCompressor() if 'Content-Encoding' in headers else None
+    async for line in lines:
+        yield compressor.compress(line) if compressor else line
+    if compressor:
+        yield compressor.finish()
+
+def lambda_body(body, headers):
+    """Return the API Gateway fields for an encoded body: compressed bodies must be base64."""
+    if 'Content-Encoding' in headers:
+        return {'body': base64.b64encode(body).decode('ascii'), 'isBase64Encoded': True}
+    return {'body': body.decode('utf-8'), 'isBase64Encoded': False}
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+
+from .content import collect_pages
+from .encoding import dumps, encode_body, encode_response
+from .pipeline import process_sefaria_data
+from .profiles import resolve_profile
+from .tractates import InvalidReference
+
+# Cache lifetimes for GET /api/text/<ref> (override with environment variables).
+# Formatted text only changes when Sefaria's does, so browsers keep it for a
+# day and shared caches (Vercel's edge, CloudFront) for a week.
+TEXT_CACHE_CONTROL = os.environ.get(
+    'TEXT_CACHE_CONTROL', 'public, max-age=86400, s-maxage=604800, stale-while-revalidate=86400'
+)
+NOT_FOUND_CACHE_CONTROL = os.environ.get('TEXT_NOT_FOUND_CACHE_CONTROL', 'public, max-age=300')
+ERROR_CACHE_CONTROL = 'no-store'
+
+LANGUAGES = ('all', 'en', 'he')
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+FALSE_VALUES = ('0', 'false', 'no', 'off')
+
+def _flag(args, name, default):
+    """Read a boolean query parameter; raises ValueError for anything but 1/0, true/false, yes/no, on/off."""
+    value = args.get(name)
+    if value is None or value == '':
+        return default
+    value = value.lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(f"Invalid value for {name}: {value}")
+
+def text_query_options(args):
+    """Return the formatting options of a GET /api/text/<ref> query string.
+
+    `lang` is all (default), en or he. `nikud=1` keeps the nikud, which is
+    removed by default. `split=0` keeps sections whole. `terms=0` leaves the
+    terminology as it is; `terms` may also name a terminology profile.
+    Raises ValueError for invalid values.
+    """
+    language = args.get('lang') or 'all'
+    if language not in LANGUAGES:
+        raise ValueError(f"Invalid value for lang: {language} (expected one of {', '.join(LANGUAGES)})")
+
+    terms = args.get('terms')
+    terminology = None
+    if terms and terms.lower() not in TRUE_VALUES + FALSE_VALUES:
+        standardize_terms, terminology = True, terms
+    else:
+        standardize_terms = _flag(args, 'terms', True)
+
+    return {
+        'language': language,
+        'remove_nikud_marks': not _flag(args, 'nikud', False),
+        'standardize_terms': standardize_terms,
+        'split_sentences': _flag(args, 'split', True),
+        'terminology': terminology,
+    }
+
+def text_etag(body, options, content_encoding=None):
+    """Strong ETag for a response body, the formatting options it was produced with and its content encoding.
+
+    Each encoding of the same body is a different representation, so it gets
+    its own tag (e.g. "<sha1>-gzip").
+    """
+    digest = hashlib.sha1(json.dumps(options).encode('utf-8'))
+    digest.update(body)
+    if content_encoding:
+        return f'"{digest.hexdigest()}-{content_encoding}"'
+    return f'"{digest.hexdigest()}"'
+
+def etag_matches(if_none_match, etag):
+    """Whether an If-None-Match header value matches etag."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
+
+def text_response(ref, args, if_none_match=None, accept_encoding=None):
+    """Build the response to GET /api/text/<ref> as (status, headers, body bytes).
+
+    The body has the same shape as POST /api/get_text without adjacent pages,
+    compressed as encode_response would for the client's Accept-Encoding.
+    Where each page came from is reported in the X-Text-Source header rather
+    than the body, so that the body, and with it the ETag, depends only on
+    the text, the options and the content encoding. A request whose
+    If-None-Match matches gets an empty 304.
+    """
+    result = {'success': False, 'message': '', 'content': []}
+    try:
+        options = text_query_options(args)
+        profile_key, profile_engine = resolve_profile(options.pop('terminology'))
+        flags = (options['remove_nikud_marks'], options['standardize_terms'], options['split_sentences'], profile_key)
+        content = collect_pages(
+            ref, options['language'],
+            process=lambda data: process_sefaria_data(data, terminology=profile_engine, **options),
+            options=flags
+        )
+    except InvalidReference as e:
+        # A page that does not exist in its tractate never will
+        result['message'] = f"Error: {str(e)}"
+        return _reply(404, NOT_FOUND_CACHE_CONTROL, result, accept_encoding)
+    except ValueError as e:
+        # Unknown profiles, bad query parameters and overlong ranges
+        result['message'] = f"Error: {str(e)}"
+        return _reply(400, ERROR_CACHE_CONTROL, result, accept_encoding)
+    except Exception as e:
+        result['message'] = f"Error: {str(e)}"
+        return _reply(502, ERROR_CACHE_CONTROL, result, accept_encoding)
+
+    if content is None:
+        result['message'] = f"No data found for reference: {ref}"
+        return _reply(404, NOT_FOUND_CACHE_CONTROL, result, accept_encoding)
+
+    sources = [page.pop('source') for page in content]
+    result['content'] = content
+    result['success'] = True
+    body = dumps(result)
+    encoded, headers = encode_body(body, accept_encoding)
+
+    etag = text_etag(body, (options['language'],) + flags, headers.get('Content-Encoding'))
+    headers = _headers(TEXT_CACHE_CONTROL, headers, ETag=etag)
+    headers['X-Text-Source'] = ', '.join(sources)
+    if etag_matches(if_none_match, etag):
+        return 304, headers, b''
+    return 200, headers, encoded
+
+def _reply(status, cache_control, result, accept_encoding):
+    body, headers = encode_response(result, accept_encoding)
+    return status, _headers(cache_control, headers), body
+
+def _headers(cache_control, encoding_headers, **extra):
+    headers = dict(encoding_headers)
+    headers.update({'Cache-Control': cache_control, 'Access-Control-Allow-Origin': '*'}, **extra)
+    return headers
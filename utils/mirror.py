@@ -0,0 +1,130 @@
+"""Mirror Talmud tractates from Sefaria into the local corpus store.
+
+Usage:
+    python -m utils.mirror download Berakhot Shabbat
+    python -m utils.mirror download --all --workers 8 --rate 5
+    python -m utils.mirror refresh --all
+
+`download` skips pages that are already mirrored, so an interrupted run can
+simply be restarted. `refresh` revisits mirrored pages and only rewrites the
+ones whose upstream version changed. Pages that still fail after the client's
+retries are counted as failed and fetched again on the next run. Run the app with SEFARIA_MODE=offline
+to serve every request from the mirror.
+"""
+import argparse
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .corpus import CorpusStore, MIRROR_PATH, content_hash
+from .sefaria_api import fetch_text
+from .tractates import BAVLI_TRACTATES, page_refs, resolve_tractate
+
+logger = logging.getLogger(__name__)
+
+class RateLimiter:
+    """Token bucket shared by all download threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until another request may be sent."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+def mirror_page(ref, store, language="all", limiter=None, refresh=False):
+    """Mirror a single page and return what happened to it.
+
+    Returns one of 'fetched', 'updated', 'unchanged', 'skipped', 'missing' or
+    'failed'. A failed page is left as it was, so the next run retries it.
+    """
+    record = store.read(ref, language)
+    if record and not refresh:
+        return 'skipped'
+
+    if limiter:
+        limiter.wait()
+    try:
+        status, data, etag, last_modified = fetch_text(
+            ref, language,
+            etag=record['etag'] if record else None,
+            last_modified=record['last_modified'] if record else None
+        )
+    except requests.RequestException as e:
+        logger.warning("Failed to mirror page", extra={'ref': ref, 'language': language, 'error': repr(e)})
+        return 'failed'
+    if status == 304 and record:
+        return 'unchanged'
+    if not data or 'error' in data or not (data.get('text') or data.get('he')):
+        return 'missing'
+    if record and record['hash'] == content_hash(data):
+        return 'unchanged'
+
+    store.write(ref, language, data, etag=etag, last_modified=last_modified)
+    return 'updated' if record else 'fetched'
+
+def mirror_tractate(tractate, store, language="all", workers=4, limiter=None, refresh=False):
+    """Mirror every page of a tractate, using the local tractate index for its bounds.
+
+    Pages are fetched in parallel. Returns a dict counting the outcome of each
+    page (see mirror_page).
+    """
+    counts = {'fetched': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'missing': 0, 'failed': 0}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        outcomes = executor.map(
+            lambda page_ref: mirror_page(page_ref, store, language, limiter, refresh), page_refs(tractate)
+        )
+        for outcome in outcomes:
+            counts[outcome] += 1
+    return counts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mirror Talmud tractates from Sefaria for offline use.")
+    parser.add_argument('command', choices=['download', 'refresh'],
+                        help="download missing pages, or refresh pages that changed upstream")
+    parser.add_argument('tractates', nargs='*', help="tractates to mirror, e.g. Berakhot 'Bava Metzia'")
+    parser.add_argument('--all', action='store_true', help="mirror every tractate of the Bavli")
+    parser.add_argument('--root', default=MIRROR_PATH, help="corpus directory (default: %(default)s)")
+    parser.add_argument('--language', default='all', help="language to mirror (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=4, help="parallel downloads (default: %(default)s)")
+    parser.add_argument('--rate', type=float, default=5,
+                        help="maximum requests per second, 0 for no limit (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if args.all:
+        tractates = [name for name, _, _, _ in BAVLI_TRACTATES]
+    elif args.tractates:
+        tractates = []
+        for name in args.tractates:
+            tractate = resolve_tractate(name)
+            if not tractate:
+                parser.error(f"unknown tractate: {name}")
+            tractates.append(tractate)
+    else:
+        parser.error("name at least one tractate or pass --all")
+
+    store = CorpusStore(args.root)
+    limiter = RateLimiter(args.rate)
+    for tractate in tractates:
+        start = time.monotonic()
+        counts = mirror_tractate(
+            tractate, store, args.language, args.workers, limiter, refresh=args.command == 'refresh'
+        )
+        elapsed = time.monotonic() - start
+        summary = ', '.join(f"{count} {outcome}" for outcome, count in counts.items())
+        print(f"{tractate}: {summary} ({elapsed:.1f}s)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+import re
+from functools import lru_cache
+
+# Token classes understood by the number parser
+A, AND, SMALL, UNIT, TEEN, TENS, HUNDRED, SCALE = 'a', 'and', 'small', 'unit', 'teen', 'tens', 'hundred', 'scale'
+ORD_UNIT, ORD_TEEN, ORD_TENS, ORD_HUNDRED, ORD_SCALE = 'ord_unit', 'ord_teen', 'ord_tens', 'ord_hundred', 'ord_scale'
+
+# Number words: word -> (token class, value). "one", "two" and "three" are SMALL:
+# they count inside a larger number ("twenty-three", "three hundred") but are
+# left alone on their own ("one of them").
+NUMBER_WORDS = {
+    'a': (A, 1), 'and': (AND, 0),
+    'one': (SMALL, 1), 'two': (SMALL, 2), 'three': (SMALL, 3),
+    'four': (UNIT, 4), 'five': (UNIT, 5), 'six': (UNIT, 6),
+    'seven': (UNIT, 7), 'eight': (UNIT, 8), 'nine': (UNIT, 9),
+    'ten': (TEEN, 10), 'eleven': (TEEN, 11), 'twelve': (TEEN, 12), 'thirteen': (TEEN, 13),
+    'fourteen': (TEEN, 14), 'fifteen': (TEEN, 15), 'sixteen': (TEEN, 16),
+    'seventeen': (TEEN, 17), 'eighteen': (TEEN, 18), 'nineteen': (TEEN, 19),
+    'twenty': (TENS, 20), 'thirty': (TENS, 30), 'forty': (TENS, 40), 'fifty': (TENS, 50),
+    'sixty': (TENS, 60), 'seventy': (TENS, 70), 'eighty': (TENS, 80), 'ninety': (TENS, 90),
+    'hundred': (HUNDRED, 100),
+    'thousand': (SCALE, 10 ** 3), 'million': (SCALE, 10 ** 6),
+    'billion': (SCALE, 10 ** 9), 'trillion': (SCALE, 10 ** 12),
+
+    'first': (ORD_UNIT, 1), 'second': (ORD_UNIT, 2), 'third': (ORD_UNIT, 3),
+    'fourth': (ORD_UNIT, 4), 'fifth': (ORD_UNIT, 5), 'sixth': (ORD_UNIT, 6),
+    'seventh': (ORD_UNIT, 7), 'eighth': (ORD_UNIT, 8), 'ninth': (ORD_UNIT, 9),
+    'tenth': (ORD_TEEN, 10), 'eleventh': (ORD_TEEN, 11), 'twelfth': (ORD_TEEN, 12),
+    'thirteenth': (ORD_TEEN, 13), 'fourteenth': (ORD_TEEN, 14), 'fifteenth': (ORD_TEEN, 15),
+    'sixteenth': (ORD_TEEN, 16), 'seventeenth': (ORD_TEEN, 17), 'eighteenth': (ORD_TEEN, 18),
+    'nineteenth': (ORD_TEEN, 19),
+    'twentieth': (ORD_TENS, 20), 'thirtieth': (ORD_TENS, 30), 'fortieth': (ORD_TENS, 40),
+    'fiftieth': (ORD_TENS, 50), 'sixtieth': (ORD_TENS, 60), 'seventieth': (ORD_TENS, 70),
+    'eightieth': (ORD_TENS, 80), 'ninetieth': (ORD_TENS, 90),
+    'hundredth': (ORD_HUNDRED, 100),
+    'thousandth': (ORD_SCALE, 10 ** 3), 'millionth': (ORD_SCALE, 10 ** 6),
+    'billionth': (ORD_SCALE, 10 ** 9), 'trillionth': (ORD_SCALE, 10 ** 12),
+}
+
+# Parser transitions: state -> {token class: next state}. A missing entry ends
+# the number. States name what was read last: 'group_*' states follow a
+# "hundred" or a scale word, where another "hundred" may not come next.
+_ORDINALS = {ORD_UNIT: 'ordinal', ORD_TEEN: 'ordinal', ORD_TENS: 'ordinal'}
+TRANSITIONS = {
+    'start': {A: 'a', SMALL: 'small', UNIT: 'unit', TEEN: 'unit', TENS: 'tens',
+              HUNDRED: 'hundred', SCALE: 'scale', ORD_HUNDRED: 'ordinal', ORD_SCALE: 'ordinal', **_ORDINALS},
+    'a': {HUNDRED: 'hundred', SCALE: 'scale', ORD_HUNDRED: 'ordinal', ORD_SCALE: 'ordinal'},
+    'small': {HUNDRED: 'hundred', SCALE: 'scale', ORD_HUNDRED: 'ordinal', ORD_SCALE: 'ordinal'},
+    'unit': {HUNDRED: 'hundred', SCALE: 'scale', ORD_HUNDRED: 'ordinal', ORD_SCALE: 'ordinal'},
+    'tens': {SMALL: 'tens_unit', UNIT: 'tens_unit', SCALE: 'scale', ORD_SCALE: 'ordinal', ORD_UNIT: 'ordinal'},
+    'tens_unit': {SCALE: 'scale', ORD_SCALE: 'ordinal'},
+    'hundred': {AND: 'hundred_and', SMALL: 'group_unit', UNIT: 'group_unit', TEEN: 'group_unit',
+                TENS: 'group_tens', SCALE: 'scale', ORD_SCALE: 'ordinal', **_ORDINALS},
+    'hundred_and': {SMALL: 'group_unit', UNIT: 'group_unit', TEEN: 'group_unit', TENS: 'group_tens', **_ORDINALS},
+    'group_tens': {SMALL: 'group_unit', UNIT: 'group_unit', SCALE: 'scale', ORD_SCALE: 'ordinal', ORD_UNIT: 'ordinal'},
+    'group_unit': {SCALE: 'scale', ORD_SCALE: 'ordinal'},
+    'scale': {AND: 'scale_and', SMALL: 'unit', UNIT: 'unit', TEEN: 'unit', TENS: 'tens', **_ORDINALS},
+    'scale_and': {SMALL: 'group_unit', UNIT: 'group_unit', TEEN: 'group_unit', TENS: 'group_tens', **_ORDINALS},
+    'ordinal': {},
+}
+# States in which the words read so far form a complete number
+ACCEPTING = {'unit', 'tens', 'tens_unit', 'hundred', 'group_tens', 'group_unit', 'scale', 'ordinal'}
+
+# Hyphenated words are read as one token ("twenty-five"), and only if every part is a number word
+_WORD_PATTERN = re.compile(r'[^\s-]+(?:-[^\s-]+)*')
+
+def _word_alternation(words):
+    """Build a regex matching any of words, factored into a prefix tree.
+
+    "seven|seventeen|seventh" becomes "seven(?:teen|th)?", which the regex
+    engine rejects at the first wrong letter instead of trying every word.
+    """
+    tree = {}
+    for word in words:
+        node = tree
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if '' in node:
+            # The word may also end here
+            pattern = f"(?:{pattern})?"
+        return pattern
+
+    return build(tree)
+
+# A spelled-out number phrase: number words (hyphenated or separated by whitespace)
+_PHRASE_WORDS = [word for word, (kind, _) in NUMBER_WORDS.items() if kind != AND]
+_PHRASE_PATTERN = (
+    rf'\b{_word_alternation(_PHRASE_WORDS)}(?:-[a-zA-Z]+)?'
+    rf'(?:\s+{_word_alternation(_PHRASE_WORDS + ["and"])}(?:-[a-zA-Z]+)?)*\b'
+)
+
+# One pass over the text: a spelled-out number phrase or a run of digits, with
+# the (case-sensitive) "the N day" and "N century" contexts that take an ordinal
+NUMBER_PATTERN = re.compile(
+    rf'(?P<the>(?-i:the ))?(?:(?P<words>{_PHRASE_PATTERN})|(?P<digits>\d+))(?P<context>(?-i: day| century))?',
+    flags=re.IGNORECASE
+)
+
+_TRAILING_DIGITS = re.compile(r'\d+$')
+
+def ordinal_suffix(n):
+    """Return the appropriate English ordinal suffix for the integer n."""
+    if 11 <= (n % 100) <= 13:
+        return "th"
+    return {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
+
+def _step(state, value, current, words):
+    """Feed the parts of one word to the parser; returns the new (state, value, current) or None."""
+    for word in words:
+        token = NUMBER_WORDS.get(word)
+        state = TRANSITIONS[state].get(token[0]) if token else None
+        if state is None:
+            return None
+        kind, number = token
+        if kind in (HUNDRED, ORD_HUNDRED):
+            current = (current or 1) * number
+        elif kind in (SCALE, ORD_SCALE):
+            value += (current or 1) * number
+            current = 0
+        elif kind not in (A, AND):
+            current += number
+    return state, value, current
+
+@lru_cache(maxsize=4096)
+def parse_number_phrase(phrase):
+    """Convert the spelled-out numbers in a phrase to digits.
+
+    Reads the words left to right with the TRANSITIONS table and replaces
+    each longest run of words forming a number, e.g. "a hundred and twenty"
+    -> "120" and "twenty-first" -> "21st". Words that do not form a number
+    (a lone "a" or "one", "first-born") are kept as they are.
+    """
+    spans = [(m.start(), m.end(), m.group().lower().split('-')) for m in _WORD_PATTERN.finditer(phrase)]
+    parts = []
+    position = 0
+    i = 0
+    while i < len(spans):
+        state, value, current = 'start', 0, 0
+        accepted = None
+        j = i
+        while j < len(spans):
+            step = _step(state, value, current, spans[j][2])
+            if step is None:
+                break
+            state, value, current = step
+            j += 1
+            if state in ACCEPTING:
+                accepted = (j, value + current, state == 'ordinal')
+
+        if accepted is None:
+            i += 1
+            continue
+        j, number, ordinal = accepted
+        parts.append(phrase[position:spans[i][0]])
+        parts.append(f"{number}{ordinal_suffix(number)}" if ordinal else str(number))
+        position = spans[j - 1][1]
+        i = j
+
+    parts.append(phrase[position:])
+    return ''.join(parts)
+
+def _convert(match):
+    the, words, digits, context = match.group('the', 'words', 'digits', 'context')
+    if words is None:
+        number = digits
+    elif words == 'a' or words == 'A':
+        # By far the most common match, and never a number on its own
+        number = words
+    else:
+        number = parse_number_phrase(words)
+
+    if context == ' century':
+        # Only the number right before "century" takes the ordinal
+        trailing = _TRAILING_DIGITS.search(number)
+        if trailing:
+            number += ordinal_suffix(int(trailing.group()))
+    elif context and the and number.isdigit():
+        number += ordinal_suffix(int(number))
+    return f"{the or ''}{number}{context or ''}"
+
+def convert_number_words(text):
+    """Replace spelled-out numbers with digits, e.g. "twenty-five" -> "25" and "the seventh day" -> "the 7th day".
+
+    Numbers followed by "day" (after "the") or "century" become ordinals.
+    """
+    if not text:
+        return text
+    return NUMBER_PATTERN.sub(_convert, text)
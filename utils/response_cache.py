@@ -0,0 +1,168 @@
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# Cache settings (override with environment variables)
+CACHE_ENABLED = os.environ.get('SEFARIA_CACHE', '1') != '0'
+CACHE_PATH = os.environ.get(
+    'SEFARIA_CACHE_PATH',
+    os.path.join(tempfile.gettempdir(), 'chavrutai', 'sefaria_cache.sqlite3')
+)
+CACHE_TTL = int(os.environ.get('SEFARIA_CACHE_TTL', 7 * 24 * 60 * 60))
+CACHE_MAX_BYTES = int(os.environ.get('SEFARIA_CACHE_MAX_BYTES', 100 * 1024 * 1024))
+# A hit only records its access time if the stored one is older than this, so
+# most reads do not take SQLite's write lock
+CACHE_TOUCH_INTERVAL = int(os.environ.get('SEFARIA_CACHE_TOUCH_INTERVAL', 60))
+
+CacheEntry = namedtuple('CacheEntry', ['data', 'etag', 'last_modified', 'fresh'])
+
+def normalize_ref(ref):
+    """Normalize a text reference the way it is sent to the Sefaria API."""
+    return '_'.join(ref.split())
+
+def cache_key(ref, language):
+    """Build the cache key for a reference and language."""
+    return f"{language}|{normalize_ref(ref).lower()}"
+
+class ResponseCache:
+    """Persistent SQLite store of Sefaria API responses.
+
+    Entries younger than `ttl` seconds are served as-is; older entries are kept
+    so they can be revalidated upstream with their ETag / Last-Modified headers.
+    When the stored bodies exceed `max_bytes` the least recently used entries
+    are evicted. The total size is kept in the database by triggers, so it
+    stays right when several processes share the file and a put never has to
+    sum the whole table. Access times are only rewritten every
+    `touch_interval` seconds, so recency is that coarse.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES,
+                 touch_interval=CACHE_TOUCH_INTERVAL):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+
+    def _connect(self):
+        """Return this thread's connection, creating the database if needed."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # INSERT OR REPLACE only fires the delete trigger with this set
+            conn.execute('PRAGMA recursive_triggers=ON')
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._create_schema(conn)
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            self._local.conn = conn
+        return conn
+
+    def _create_schema(self, conn):
+        """Create the tables and the triggers that keep the total size up to date."""
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, last_modified TEXT, '
+            'fetched_at REAL NOT NULL, accessed_at REAL NOT NULL, size INTEGER NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+        conn.execute('CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+        conn.execute(
+            'CREATE TRIGGER IF NOT EXISTS responses_size_insert AFTER INSERT ON responses BEGIN '
+            "UPDATE cache_meta SET value = value + NEW.size WHERE name = 'total_size'; END"
+        )
+        conn.execute(
+            'CREATE TRIGGER IF NOT EXISTS responses_size_delete AFTER DELETE ON responses BEGIN '
+            "UPDATE cache_meta SET value = value - OLD.size WHERE name = 'total_size'; END"
+        )
+        # Summed once, when a database from before the triggers is first opened
+        conn.execute(
+            "INSERT OR IGNORE INTO cache_meta (name, value) "
+            "SELECT 'total_size', COALESCE(SUM(size), 0) FROM responses"
+        )
+
+    def _total_size(self, conn):
+        """Return the total size of the stored bodies, in bytes."""
+        return conn.execute("SELECT value FROM cache_meta WHERE name = 'total_size'").fetchone()[0]
+
+    def get(self, key):
+        """Return the CacheEntry stored under key, or None."""
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT body, etag, last_modified, fetched_at, accessed_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            body, etag, last_modified, fetched_at, accessed_at = row
+            now = time.time()
+            if now - accessed_at >= self.touch_interval:
+                conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+            data = json.loads(zlib.decompress(body))
+            return CacheEntry(data, etag, last_modified, now - fetched_at < self.ttl)
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            logger.warning("Response cache error", extra={'error': repr(e)})
+            return None
+
+    def put(self, key, data, etag=None, last_modified=None):
+        """Store a response body along with its validators."""
+        body = zlib.compress(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO responses '
+                '(key, body, etag, last_modified, fetched_at, accessed_at, size) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, body, etag, last_modified, now, now, len(body))
+            )
+            self._evict(conn)
+        except sqlite3.Error as e:
+            logger.warning("Response cache error", extra={'error': repr(e)})
+
+    def touch(self, key):
+        """Mark an entry as fresh again after a successful revalidation."""
+        try:
+            now = time.time()
+            self._connect().execute(
+                'UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE key = ?', (now, now, key)
+            )
+        except sqlite3.Error as e:
+            logger.warning("Response cache error", extra={'error': repr(e)})
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        try:
+            self._connect().execute('DELETE FROM responses')
+        except sqlite3.Error as e:
+            logger.warning("Response cache error", extra={'error': repr(e)})
+
+    def _evict(self, conn):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        total = self._total_size(conn)
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute('SELECT key, size FROM responses ORDER BY accessed_at').fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+
+# Shared cache used by query_sefaria
+response_cache = ResponseCache() if CACHE_ENABLED else None
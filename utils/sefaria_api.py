@@ -1,13 +1,127 @@
-import requests
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from .corpus import corpus_store
+from .page_cache import page_cache, raw_cache
+from .response_cache import response_cache, cache_key, normalize_ref
+from .sefaria_client import sefaria_client
+from .single_flight import SingleFlight
+from .tractates import TRACTATE_BOUNDS, InvalidReference, format_ref, parse_ref, resolve_ref
+
+logger = logging.getLogger(__name__)
+
+# "online" fetches from Sefaria; "offline" serves every request from the local mirror
+SEFARIA_MODE = os.environ.get('SEFARIA_MODE', 'online')
+
+# Upper bound on simultaneous page fetches across the whole process (the
+# default matches the client's keep-alive pool)
+MAX_CONCURRENT_REQUESTS = int(os.environ.get('SEFARIA_MAX_CONCURRENT_REQUESTS', 16))
+
+# Range references (e.g. Berakhot.2a-5b) are fetched this many pages per upstream call
+RANGE_CHUNK_PAGES = int(os.environ.get('SEFARIA_RANGE_CHUNK_PAGES', 10))
+MAX_RANGE_PAGES = 60
+
+RANGE_REF_PATTERN = re.compile(
+    r'^(?P<tractate>.+?)[ ._](?P<start>\d+[ab])\s*[-\u2013]\s*(?:(?P=tractate)[ ._])?(?P<end>\d+[ab])$'
+)
+
+# Where a page returned by fetch_pages / fetch_range came from
+SOURCE_FORMATTED_CACHE = 'formatted-cache'  # formatted sections reused as they are
+SOURCE_RAW_CACHE = 'raw-cache'              # formatted locally from a cached raw payload
+SOURCE_RESPONSE_CACHE = 'response-cache'    # stored copy from the persistent response cache
+SOURCE_MIRROR = 'mirror'                    # read from the local mirror (offline mode)
+SOURCE_UPSTREAM = 'upstream'                # downloaded from Sefaria for this request
+
+# Coalesce identical in-flight lookups (raw fetches and formatted pages)
+# Shared by every request, so worker threads (and the response cache's
+# per-thread SQLite connections) are reused. Threads start on first use.
+# Tasks run here must not wait on other tasks of the pool.
+fetch_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS, thread_name_prefix='sefaria-fetch')
+
+_fetch_flights = SingleFlight()
+_format_flights = SingleFlight()
 
 def query_sefaria(ref, language="all"):
-    """Query the Sefaria API for a specific text reference."""
-    # Format the reference for the API
-    formatted_ref = ref.replace(" ", "_")
+    """Query the Sefaria API for a specific text reference.
+
+    Talmud references are normalized first, and pages that do not exist are
+    rejected locally without an upstream call. Concurrent calls for the same
+    (ref, language) share a single upstream request and JSON parse, so the
+    returned data must not be mutated.
+    """
+    return _query_with_source(ref, language)[0]
+
+def _query_with_source(ref, language):
+    """query_sefaria, returning (data, source) where source says which store answered."""
+    try:
+        ref = resolve_ref(ref)
+    except InvalidReference:
+        return None, None
+    return _fetch_flights.do(cache_key(ref, language), _query_sefaria, ref, language)
+
+def _query_sefaria(ref, language):
+    """Fetch a reference from the local mirror, the response cache or Sefaria.
+
+    In offline mode only the local mirror is consulted. Otherwise responses
+    are kept in the persistent response cache: fresh entries are served
+    without a network call and stale ones are revalidated upstream using
+    their ETag / Last-Modified headers. Returns (data, source): source is
+    SOURCE_RESPONSE_CACHE whenever the stored copy is returned, including
+    after a 304 or a failed revalidation.
+    """
+    if SEFARIA_MODE == 'offline':
+        return corpus_store.load(ref, language), SOURCE_MIRROR
 
-    # Construct the API URL
-    base_url = "https://www.sefaria.org/api/texts/"
-    url = f"{base_url}{formatted_ref}"
+    # Look the reference up in the response cache first
+    key = cache_key(ref, language)
+    entry = response_cache.get(key) if response_cache else None
+    if entry and entry.fresh:
+        return entry.data, SOURCE_RESPONSE_CACHE
+
+    # Imported here rather than at the top: offline and cached requests never need it
+    import requests
+
+    # Revalidate a stale cache entry instead of downloading it again
+    try:
+        status, data, etag, last_modified = fetch_text(
+            ref, language,
+            etag=entry.etag if entry else None,
+            last_modified=entry.last_modified if entry else None
+        )
+    except requests.RequestException:
+        # Serve the stale copy rather than failing outright
+        if entry:
+            return entry.data, SOURCE_RESPONSE_CACHE
+        raise
+
+    if entry and status != 200:
+        # 304: the stored copy is still current. Anything else (429 or 5xx after
+        # the client's retries): serve the stale copy rather than "No data found"
+        if status == 304:
+            response_cache.touch(key)
+        return entry.data, SOURCE_RESPONSE_CACHE
+
+    if data is not None and response_cache and 'error' not in data:
+        response_cache.put(key, data, etag=etag, last_modified=last_modified)
+    return data, SOURCE_UPSTREAM
+
+def fetch_text(ref, language="all", etag=None, last_modified=None):
+    """Fetch a reference directly from Sefaria, bypassing every cache.
+
+    If validators are given the request is conditional. Returns a tuple of
+    (status_code, data, etag, last_modified); data is None unless the status
+    is 200.
+    """
+    path, params, headers = text_request(ref, language, etag, last_modified)
+    response = sefaria_client.get(path, params=params, headers=headers)
+    return text_result(ref, language, response)
+
+def text_request(ref, language="all", etag=None, last_modified=None):
+    """Return the (path, params, headers) of a Sefaria texts API request."""
+    # Format the reference for the API
+    formatted_ref = normalize_ref(ref)
 
     # Add parameters for language
     params = {
@@ -15,47 +129,266 @@ def query_sefaria(ref, language="all"):
         "language": language,
     }
 
-    # Make the request
-    response = requests.get(url, params=params)
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    return f"/api/texts/{formatted_ref}", params, headers
 
+def text_result(ref, language, response):
+    """Return the fetch_text tuple for a Sefaria texts API response."""
     # Check if the request was successful
+    data = None
     if response.status_code == 200:
-        return response.json()
-    else:
-        print(f"Error: {response.status_code}")
-        print(response.text)
-        return None
+        data = response.json()
+    elif response.status_code != 304:
+        logger.error(
+            "Sefaria returned an error",
+            extra={'ref': ref, 'language': language, 'status': response.status_code,
+                   'body': response.text[:500]}
+        )
+    return (
+        response.status_code, data,
+        response.headers.get('ETag'), response.headers.get('Last-Modified')
+    )
 
 def get_adjacent_pages(ref):
-    """Determine the previous and next pages for a given Talmud reference."""
-    # Parse the reference to extract tractate and page
-    if '.' not in ref:
+    """Determine the previous and next pages for a given Talmud reference.
+
+    Uses the local tractate index, so no page outside the tractate is ever
+    returned; either side is None at the start or end of a tractate, and both
+    are None if ref is not a page of a known tractate.
+    """
+    try:
+        parsed = parse_ref(ref)
+    except InvalidReference:
         return None, None
+    if not parsed:
+        return None, None
+
+    tractate, amud, _ = parsed
+    first, last = TRACTATE_BOUNDS[tractate]
+    prev_page = format_ref(tractate, amud - 1) if amud > first else None
+    next_page = format_ref(tractate, amud + 1) if amud < last else None
+    return prev_page, next_page
+
+def get_adjacent_refs(ref, count):
+    """Return up to `count` previous and next references for ref, nearest first."""
+    prev_refs = []
+    next_refs = []
+
+    current_ref = ref
+    for _ in range(count):
+        prev_ref, _ = get_adjacent_pages(current_ref)
+        if not prev_ref:
+            break
+        prev_refs.append(prev_ref)
+        current_ref = prev_ref
+
+    current_ref = ref
+    for _ in range(count):
+        _, next_ref = get_adjacent_pages(current_ref)
+        if not next_ref:
+            break
+        next_refs.append(next_ref)
+        current_ref = next_ref
+
+    return prev_refs, next_refs
+
+def fetch_raw(ref, language="all"):
+    """Return (data, source) for a reference, using the in-memory raw payload cache.
+
+    Raw payloads are kept apart from the formatted page cache, so a page seen
+    recently can be formatted with different options without any network I/O.
+    """
+    key = cache_key(ref, language)
+    data = raw_cache.get(key)
+    if data is not None:
+        return data, SOURCE_RAW_CACHE
+    data, source = _query_with_source(ref, language)
+    if data and 'error' not in data:
+        raw_cache.put(key, data)
+    return data, source
+
+def fetch_page(ref, language="all", process=None, options=None):
+    """Return a (page, source) pair for one reference.
+
+    source is SOURCE_FORMATTED_CACHE, SOURCE_RAW_CACHE, SOURCE_RESPONSE_CACHE,
+    SOURCE_MIRROR or SOURCE_UPSTREAM.
+    If `process` is given it is applied to the page. When `options` (the
+    formatting flags `process` depends on) are also given, processed pages
+    are kept in the formatted page cache and repeat requests skip both the
+    fetch and the processing; concurrent requests for the same page and
+    options are formatted only once. A page that could not be retrieved is
+    returned as (None, None).
+    """
+    if not process or options is None:
+        data, source = fetch_raw(ref, language)
+        if not data:
+            return None, None
+        return (process(data) if process else data), source
+
+    key = (normalize_ref(ref), language) + tuple(options)
+    cached = page_cache.get(key)
+    if cached is not None:
+        return cached, SOURCE_FORMATTED_CACHE
+    return _format_flights.do(key, _fetch_and_process, ref, language, process, key)
+
+def _fetch_and_process(ref, language, process, key):
+    data, source = fetch_raw(ref, language)
+    if not data:
+        return None, None
+    processed = process(data)
+    page_cache.put(key, processed)
+    return processed, source
+
+def fetch_pages(refs, language="all", process=None, options=None):
+    """Query Sefaria for several references in parallel, on fetch_executor.
+
+    Returns the fetch_page (page, source) pair of each reference, in the same
+    order as refs. Each page is processed in its worker thread as soon as it
+    arrives.
+    """
+    return list(fetch_executor.map(lambda ref: fetch_page(ref, language, process, options), refs))
+
+def parse_range_ref(ref):
+    """Split a page range such as "Berakhot.2a-5b" into its first and last pages.
+
+    Returns None if ref is not a range of whole pages; raises InvalidReference
+    if either end lies outside its tractate.
+    """
+    match = RANGE_REF_PATTERN.match(ref.strip())
+    if not match:
+        return None
+    tractate = match.group('tractate').strip()
+    return (
+        resolve_ref(f"{tractate} {match.group('start')}"),
+        resolve_ref(f"{tractate} {match.group('end')}")
+    )
+
+def expand_range(start_ref, end_ref, limit=MAX_RANGE_PAGES):
+    """Return every page reference from start_ref to end_ref inclusive."""
+    start, end = parse_ref(start_ref), parse_ref(end_ref)
+    if start and end and start[0] == end[0] and start[1] > end[1]:
+        raise ValueError(f"Invalid range: {start_ref}-{end_ref} (range end precedes start)")
+    refs = [start_ref]
+    while refs[-1] != end_ref:
+        if len(refs) >= limit:
+            raise ValueError(f"Range {start_ref}-{end_ref} is longer than {limit} pages")
+        _, next_ref = get_adjacent_pages(refs[-1])
+        if not next_ref:
+            raise ValueError(f"Invalid range: {start_ref}-{end_ref}")
+        refs.append(next_ref)
+    return refs
+
+def iter_segments(value):
+    """Yield the text segments of a possibly nested Sefaria text array."""
+    if isinstance(value, list):
+        for item in value:
+            yield from iter_segments(item)
+    elif value:
+        yield value
+
+def iter_range_pages(data):
+    """Yield one {'he', 'text'} payload per page of a Sefaria response.
+
+    Responses spanning several pages carry one nested array per page; each is
+    flattened into a flat list of segments.
+    """
+    he = data.get('he') or []
+    text = data.get('text') or []
+    if not data.get('isSpanning'):
+        yield {'he': list(iter_segments(he)), 'text': list(iter_segments(text))}
+        return
+
+    for index in range(max(len(he), len(text))):
+        yield {
+            'he': list(iter_segments(he[index] if index < len(he) else [])),
+            'text': list(iter_segments(text[index] if index < len(text) else [])),
+        }
+
+def fetch_range(refs, language="all", process=None, options=None, chunk_size=RANGE_CHUNK_PAGES):
+    """Fetch a run of consecutive pages with as few upstream calls as possible.
+
+    Pages already in the formatted page cache are reused, and pages whose raw
+    payload is cached are formatted locally; the rest are grouped into
+    contiguous chunks of up to chunk_size pages, each requested as one range
+    reference, and the chunks are fetched concurrently. Returns a list of
+    (page, source) pairs aligned with refs, as fetch_pages does, holding each
+    page's processed sections (or raw payload if no `process` is given).
+    """
+    results = cached_range_pages(refs, language, process, options)
+    chunks, chunk_refs = plan_range_chunks([ref for ref in refs if ref not in results], chunk_size)
+    for chunk, (data, source) in zip(chunks, fetch_pages(chunk_refs, language)):
+        for ref, page in iter_chunk_pages(chunk, data, language):
+            results[ref] = (process_page(ref, page, language, process, options), source)
+
+    return [results.get(ref, (None, None)) for ref in refs]
+
+def process_page(ref, page, language="all", process=None, options=None):
+    """Apply `process` to a raw page, keeping the result in the formatted page cache if options are given."""
+    if not process:
+        return page
+    page = process(page)
+    if options is not None:
+        page_cache.put((normalize_ref(ref), language) + tuple(options), page)
+    return page
+
+def cached_range_pages(refs, language="all", process=None, options=None):
+    """Return {ref: (page, source)} for the pages of a range that need no fetch.
+
+    Formatted pages are taken from the page cache, and pages whose raw
+    payload is cached are formatted locally.
+    """
+    results = {}
+    for ref in refs:
+        if process is not None and options is not None:
+            cached = page_cache.get((normalize_ref(ref), language) + tuple(options))
+            if cached is not None:
+                results[ref] = (cached, SOURCE_FORMATTED_CACHE)
+                continue
+        data = raw_cache.get(cache_key(ref, language))
+        if data is not None:
+            results[ref] = (process_page(ref, next(iter_range_pages(data)), language, process, options),
+                            SOURCE_RAW_CACHE)
+    return results
+
+def plan_range_chunks(refs, chunk_size=RANGE_CHUNK_PAGES):
+    """Group consecutive pages into chunks of up to chunk_size, each fetched as one range reference.
+
+    Returns (chunks, chunk_refs): the pages of each chunk, and the reference
+    requested for it.
+    """
+    # The offline mirror stores single pages only
+    if SEFARIA_MODE == 'offline':
+        chunk_size = 1
+
+    chunks = []
+    for ref in refs:
+        last = chunks[-1] if chunks else None
+        if last and len(last) < chunk_size and get_adjacent_pages(last[-1])[1] == ref:
+            last.append(ref)
+        else:
+            chunks.append([ref])
+
+    chunk_refs = [
+        chunk[0] if len(chunk) == 1 else f"{chunk[0]}-{chunk[-1].rpartition('.')[2]}"
+        for chunk in chunks
+    ]
+    return chunks, chunk_refs
+
+def iter_chunk_pages(chunk, data, language="all"):
+    """Yield (ref, payload) for each non-empty page of a fetched chunk.
 
-    parts = ref.split('.')
-    tractate = parts[0]
-    page_info = parts[1]
-
-    # Handle different page formats (e.g., "2a", "10b")
-    page_number = ''.join(filter(str.isdigit, page_info))
-    page_side = 'a' if page_info[-1] == 'a' else 'b'
-
-    # Calculate previous page
-    prev_page = None
-    if page_side == 'b':
-        # If current is "Xb", previous is "Xa"
-        prev_page = f"{tractate}.{page_number}a"
-    elif int(page_number) > 2:  # Talmud typically starts at 2a
-        # If current is "Xa", previous is "(X-1)b"
-        prev_page = f"{tractate}.{int(page_number)-1}b"
-
-    # Calculate next page
-    next_page = None
-    if page_side == 'a':
-        # If current is "Xa", next is "Xb"
-        next_page = f"{tractate}.{page_number}b"
-    else:
-        # If current is "Xb", next is "(X+1)a"
-        next_page = f"{tractate}.{int(page_number)+1}a"
-
-    return prev_page, next_page
\ No newline at end of file
+    Pages of a multi-page chunk are also kept in the raw cache on their own,
+    so each can be reformatted alone.
+    """
+    if not data:
+        return
+    for ref, page in zip(chunk, iter_range_pages(data)):
+        if not (page['he'] or page['text']):
+            continue
+        if len(chunk) > 1:
+            raw_cache.put(cache_key(ref, language), page)
+        yield ref, page
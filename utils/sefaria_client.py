@@ -0,0 +1,116 @@
+import logging
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Client settings (override with environment variables)
+SEFARIA_BASE_URL = os.environ.get('SEFARIA_BASE_URL', 'https://www.sefaria.org').rstrip('/')
+CONNECT_TIMEOUT = float(os.environ.get('SEFARIA_CONNECT_TIMEOUT', 3.05))
+READ_TIMEOUT = float(os.environ.get('SEFARIA_READ_TIMEOUT', 8))
+MAX_RETRIES = int(os.environ.get('SEFARIA_MAX_RETRIES', 2))
+BACKOFF_FACTOR = float(os.environ.get('SEFARIA_BACKOFF_FACTOR', 0.5))
+BACKOFF_MAX = float(os.environ.get('SEFARIA_BACKOFF_MAX', 4))
+POOL_SIZE = int(os.environ.get('SEFARIA_POOL_SIZE', 16))
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def backoff_delay(attempt, backoff_factor=BACKOFF_FACTOR, backoff_max=BACKOFF_MAX, response=None):
+    """Return how long to sleep before the given retry attempt.
+
+    Honours a numeric Retry-After header on the response; otherwise uses
+    exponential backoff with full jitter.
+    """
+    if response is not None:
+        retry_after = response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), backoff_max)
+    return random.uniform(0, min(backoff_max, backoff_factor * (2 ** attempt)))
+
+class SefariaClient:
+    """Shared HTTP client for the Sefaria API.
+
+    Wraps a pooled requests.Session so connections are kept alive across
+    requests (and across warm Lambda invocations, since the client lives at
+    module level). Every request has connect/read timeouts, and 429/5xx
+    responses or connection failures are retried with exponential backoff
+    and full jitter. The session is safe to share between the worker threads
+    used by fetch_pages. requests is imported, and the session opened, by
+    the first request, so importing this module stays cheap on a cold start.
+    """
+
+    def __init__(self, base_url=SEFARIA_BASE_URL, connect_timeout=CONNECT_TIMEOUT,
+                 read_timeout=READ_TIMEOUT, max_retries=MAX_RETRIES,
+                 backoff_factor=BACKOFF_FACTOR, backoff_max=BACKOFF_MAX, pool_size=POOL_SIZE):
+        self.base_url = base_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The pooled requests.Session, created on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+        return self._session
+
+    def _backoff(self, attempt, response=None):
+        """Return how long to sleep before the given retry attempt."""
+        return backoff_delay(attempt, self.backoff_factor, self.backoff_max, response)
+
+    def get(self, path, params=None, headers=None):
+        """GET base_url + path (e.g. "/api/texts/Berakhot.2a"), retrying transient failures.
+
+        Returns the final response, which may still carry an error status.
+        Raises requests.RequestException if the request never succeeded.
+        """
+        import requests
+
+        url = f"{self.base_url}{path}"
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    logger.error(
+                        "Sefaria request failed",
+                        extra={'url': url, 'attempts': attempt + 1, 'error': repr(e)}
+                    )
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(
+                    "Retrying Sefaria request",
+                    extra={'url': url, 'attempt': attempt + 1, 'error': repr(e), 'delay': delay}
+                )
+                time.sleep(delay)
+                continue
+
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                return response
+
+            delay = self._backoff(attempt, response)
+            logger.warning(
+                "Retrying Sefaria request",
+                extra={'url': url, 'attempt': attempt + 1, 'status': response.status_code, 'delay': delay}
+            )
+            response.close()
+            time.sleep(delay)
+
+# Shared client used by query_sefaria
+sefaria_client = SefariaClient()
@@ -0,0 +1,78 @@
+import threading
+
+class _Call:
+    """An in-flight call that other threads can wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Collapse concurrent calls that share a key into a single execution.
+
+    The first thread to ask for a key runs the function; threads asking for
+    the same key while it is running wait and receive the same result (or
+    exception). Results are shared, so callers must not mutate them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) once for all concurrent callers of key."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    def in_flight(self):
+        """Return the number of keys currently being computed."""
+        with self._lock:
+            return len(self._calls)
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutines running on one event loop.
+
+    The first caller for a key starts the coroutine as a task; callers asking
+    for the same key while it runs await that task. Cancelling one caller
+    does not cancel the shared task.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+
+    async def do(self, key, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) once for all concurrent callers of key."""
+        # Not imported at the top: the threaded entry points never load asyncio
+        import asyncio
+
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(fn(*args, **kwargs))
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+    def in_flight(self):
+        """Return the number of keys currently being computed."""
+        return len(self._tasks)
@@ -0,0 +1,117 @@
+import re
+
+# Tractates of the Babylonian Talmud: (Sefaria name, first amud, last amud, aliases)
+BAVLI_TRACTATES = [
+    ('Berakhot', '2a', '64a', ['Berachot', 'Brachot', 'Brakhot', 'Ber', 'ברכות']),
+    ('Shabbat', '2a', '157b', ['Shabbos', 'Shab', 'Shabb', 'שבת']),
+    ('Eruvin', '2a', '105a', ['Eiruvin', 'Eruv', 'עירובין']),
+    ('Pesachim', '2a', '121b', ['Pesahim', 'Psachim', 'Pes', 'פסחים']),
+    ('Shekalim', '2a', '22b', ['Sheqalim', 'Shek', 'שקלים']),
+    ('Yoma', '2a', '88a', ['יומא']),
+    ('Sukkah', '2a', '56b', ['Sukka', 'Succah', 'Suk', 'סוכה']),
+    ('Beitzah', '2a', '40b', ['Beitza', 'Betzah', 'Betza', 'Beitsah', 'Beitz', 'ביצה']),
+    ('Rosh Hashanah', '2a', '35a', ['Rosh HaShana', 'Rosh Hashana', 'RH', 'ראש השנה']),
+    ('Taanit', '2a', '31a', ["Ta'anit", 'Taanis', "Ta'anis", 'Taan', 'תענית']),
+    ('Megillah', '2a', '32a', ['Megilla', 'Meg', 'מגילה']),
+    ('Moed Katan', '2a', '29a', ["Mo'ed Katan", 'Moed Qatan', 'MK', 'מועד קטן']),
+    ('Chagigah', '2a', '27a', ['Hagigah', 'Chagiga', 'Hag', 'Chag', 'חגיגה']),
+    ('Yevamot', '2a', '122b', ['Yevamos', 'Yebamot', 'Yev', 'יבמות']),
+    ('Ketubot', '2a', '112b', ['Ketubbot', 'Kesubos', 'Ketuvot', 'Ket', 'כתובות']),
+    ('Nedarim', '2a', '91b', ['Ned', 'נדרים']),
+    ('Nazir', '2a', '66b', ['Naz', 'נזיר']),
+    ('Sotah', '2a', '49b', ['Sota', 'Sot', 'סוטה']),
+    ('Gittin', '2a', '90b', ['Git', 'גיטין']),
+    ('Kiddushin', '2a', '82b', ['Qiddushin', 'Kid', 'קידושין']),
+    ('Bava Kamma', '2a', '119b', ['Bava Kama', 'Baba Kamma', 'Baba Kama', 'BK', 'בבא קמא']),
+    ('Bava Metzia', '2a', '119a', ['Baba Metzia', 'Bava Metsia', 'BM', 'בבא מציעא']),
+    ('Bava Batra', '2a', '176b', ['Baba Batra', 'Bava Basra', 'BB', 'בבא בתרא']),
+    ('Sanhedrin', '2a', '113b', ['Sanh', 'סנהדרין']),
+    ('Makkot', '2a', '24b', ['Makot', 'Makkos', 'Mak', 'מכות']),
+    ('Shevuot', '2a', '49b', ['Shevuos', "Shevu'ot", 'Shev', 'שבועות']),
+    ('Avodah Zarah', '2a', '76b', ['Avoda Zara', 'Avodah Zara', 'AZ', 'עבודה זרה']),
+    ('Horayot', '2a', '14a', ['Horayos', 'Hor', 'הוריות']),
+    ('Zevachim', '2a', '120b', ['Zevahim', 'Zev', 'זבחים']),
+    ('Menachot', '2a', '110a', ['Menahot', 'Menachos', 'Men', 'מנחות']),
+    ('Chullin', '2a', '142a', ['Hullin', 'Chulin', 'Hul', 'Chul', 'חולין']),
+    ('Bekhorot', '2a', '61a', ['Bechorot', 'Bechoros', 'Bekh', 'Bech', 'בכורות']),
+    ('Arakhin', '2a', '34a', ['Arachin', 'Arakh', 'Arach', 'ערכין']),
+    ('Temurah', '2a', '34a', ['Temura', 'Tem', 'תמורה']),
+    ('Keritot', '2a', '28b', ['Kerithot', 'Kerisos', 'Ker', 'כריתות']),
+    ('Meilah', '2a', '22a', ["Me'ilah", 'Meila', 'מעילה']),
+    ('Tamid', '25b', '33b', ['Tam', 'תמיד']),
+    ('Niddah', '2a', '73a', ['Nidah', 'Nidda', 'Nid', 'נדה']),
+]
+
+# Page references such as "Berakhot.2a", "Ber. 2a", "Bava_Metzia 10b" or "Berakhot 2a:5"
+PAGE_REF_PATTERN = re.compile(
+    r'^\s*(?P<name>.*?\D)[\s._]*(?P<daf>\d+)(?P<side>[abAB])(?P<rest>[.:]\d+(?:-\d+)?)?\s*$'
+)
+
+class InvalidReference(ValueError):
+    """Raised for references to a known tractate that name no existing page."""
+
+def _alias_key(name):
+    """Reduce a tractate name to lower-case letters and digits for lookup."""
+    return ''.join(ch for ch in name.lower() if ch.isalnum())
+
+def amud_index(page):
+    """Convert a page such as "2a" or "10b" into a sortable integer."""
+    return int(page[:-1]) * 2 + (page[-1].lower() == 'b')
+
+def amud_page(index):
+    """Convert an integer from amud_index back into a page such as "2a"."""
+    return f"{index // 2}{'b' if index % 2 else 'a'}"
+
+# Lookup tables built once at import
+TRACTATE_BOUNDS = {
+    name: (amud_index(first), amud_index(last)) for name, first, last, _ in BAVLI_TRACTATES
+}
+TRACTATE_ALIASES = {}
+for _name, _, _, _aliases in BAVLI_TRACTATES:
+    for _alias in [_name] + _aliases:
+        TRACTATE_ALIASES[_alias_key(_alias)] = _name
+
+def resolve_tractate(name):
+    """Return the Sefaria name of a tractate given any accepted alias, or None."""
+    return TRACTATE_ALIASES.get(_alias_key(name))
+
+def parse_ref(ref):
+    """Parse a Talmud page reference.
+
+    Returns (tractate, amud, rest), where amud is an amud_index and rest any
+    segment suffix such as ":5". Returns None if ref does not name a page of a
+    known tractate; raises InvalidReference if the page is outside the tractate.
+    """
+    match = PAGE_REF_PATTERN.match(ref)
+    if not match:
+        return None
+    tractate = resolve_tractate(match.group('name'))
+    if not tractate:
+        return None
+
+    amud = int(match.group('daf')) * 2 + (match.group('side').lower() == 'b')
+    first, last = TRACTATE_BOUNDS[tractate]
+    if not first <= amud <= last:
+        raise InvalidReference(
+            f"{tractate} {amud_page(amud)} does not exist "
+            f"({tractate} runs from {amud_page(first)} to {amud_page(last)})"
+        )
+    return tractate, amud, match.group('rest') or ''
+
+def format_ref(tractate, amud, rest=''):
+    """Build the canonical reference for a page, e.g. "Bava Metzia.10b"."""
+    return f"{tractate}.{amud_page(amud)}{rest}"
+
+def resolve_ref(ref):
+    """Return the canonical form of a Talmud page reference.
+
+    References that are not Talmud pages are returned unchanged; pages outside
+    their tractate raise InvalidReference.
+    """
+    parsed = parse_ref(ref)
+    return format_ref(*parsed) if parsed else ref
+
+def page_refs(tractate):
+    """Return the canonical reference of every page of a tractate, in order."""
+    first, last = TRACTATE_BOUNDS[tractate]
+    return [format_ref(tractate, amud) for amud in range(first, last + 1)]